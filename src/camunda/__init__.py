@@ -2,7 +2,42 @@
 Camunda REST API client package
 """
 
-from .client import CamundaClient
-from .models import Task, ProcessInstance, Comment
+import importlib
+from typing import Any
 
-__all__ = ["CamundaClient", "Task", "ProcessInstance", "Comment"]
+__all__ = [
+    "CamundaClient",
+    "Task",
+    "ProcessInstance",
+    "Comment",
+    "BpmnActivity",
+    "BpmnModelIndex",
+    "CamundaBusyError",
+    "ExternalTask",
+    "ExternalTaskWorker",
+    "ExternalTaskBpmnError",
+    "DeadlineExceeded",
+]
+
+# Submodules are imported on first attribute access, so that importing a
+# lightweight module like ``camunda.bpmn`` does not pull in ``requests``.
+_EXPORTS = {
+    "CamundaClient": ".client",
+    "Task": ".models",
+    "ProcessInstance": ".models",
+    "Comment": ".models",
+    "BpmnActivity": ".bpmn",
+    "BpmnModelIndex": ".bpmn",
+    "CamundaBusyError": ".ratelimit",
+    "ExternalTask": ".models",
+    "ExternalTaskWorker": ".external_task",
+    "ExternalTaskBpmnError": ".external_task",
+    "DeadlineExceeded": ".deadline",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_EXPORTS[name], __name__)
+    return getattr(module, name)
@@ -0,0 +1,230 @@
+"""
+Process analytics
+
+Streaming aggregation of historic activity and task instances into duration
+statistics with bounded memory.
+"""
+
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+# Relative width of a histogram bucket; quantiles are accurate to about 5 %
+HISTOGRAM_GROWTH = 1.1
+# Covers durations from 1 ms up to roughly three years
+HISTOGRAM_BUCKETS = 270
+
+_LOG_GROWTH = math.log(HISTOGRAM_GROWTH)
+
+
+class DurationHistogram:
+    """Log-bucketed histogram of durations in milliseconds.
+
+    Memory is fixed at ``HISTOGRAM_BUCKETS`` counters regardless of how many
+    values are added, which keeps aggregation over millions of rows bounded.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = array("q", bytes(8 * HISTOGRAM_BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration_ms: float) -> None:
+        """Record a single duration."""
+        self.counts[_bucket_index(duration_ms)] += 1
+        self.count += 1
+        self.total += duration_ms
+        if duration_ms > self.max:
+            self.max = duration_ms
+
+    @property
+    def mean(self) -> float:
+        """Arithmetic mean of all recorded durations."""
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (0..1) of the recorded durations."""
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(_bucket_upper_bound(index), self.max)
+        return self.max
+
+    def cdf(self, duration_ms: float) -> float:
+        """Estimate the fraction of recorded durations up to ``duration_ms``."""
+        if not self.count or duration_ms <= 0:
+            return 0.0
+        if duration_ms >= self.max:
+            return 1.0
+
+        index = _bucket_index(duration_ms)
+        below = sum(self.counts[:index])
+        # Assume durations are spread evenly within a bucket
+        lower = 0.0 if index == 0 else _bucket_upper_bound(index - 1)
+        upper = _bucket_upper_bound(index)
+        fraction = min(1.0, max(0.0, (duration_ms - lower) / (upper - lower)))
+        return min(1.0, (below + self.counts[index] * fraction) / self.count)
+
+
+def _bucket_index(duration_ms: float) -> int:
+    """Map a duration to its histogram bucket."""
+    if duration_ms < 1:
+        return 0
+    index = 1 + int(math.log(duration_ms) / _LOG_GROWTH)
+    return min(index, HISTOGRAM_BUCKETS - 1)
+
+
+def _bucket_upper_bound(index: int) -> float:
+    """Largest duration that falls into a histogram bucket."""
+    if index == 0:
+        return 1.0
+    return float(HISTOGRAM_GROWTH**index)
+
+
+@dataclass
+class ActivityStatistics:
+    """Aggregated duration statistics for a single activity."""
+
+    activity_id: str
+    activity_name: Optional[str] = None
+    activity_type: Optional[str] = None
+    waiting: int = 0
+    durations: DurationHistogram = field(default_factory=DurationHistogram)
+
+    @property
+    def label(self) -> str:
+        """Human readable label, e.g. ``Approve Invoice (userTask)``."""
+        name = self.activity_name or self.activity_id
+        return f"{name} ({self.activity_type})" if self.activity_type else name
+
+
+class BottleneckAnalyzer:
+    """Aggregates historic activity instances into a bottleneck ranking.
+
+    Rows are consumed one at a time, so the input can be a generator that
+    pages through the history API without holding the full result set.
+    """
+
+    RANKINGS = ("total", "p90", "waiting")
+
+    def __init__(self) -> None:
+        self.activities: Dict[str, ActivityStatistics] = {}
+        self.rows = 0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """Consume a single ``/history/activity-instance`` row."""
+        activity_id = row.get("activityId")
+        if not activity_id:
+            return
+
+        self.rows += 1
+        stats = self.activities.get(activity_id)
+        if stats is None:
+            stats = ActivityStatistics(
+                activity_id=activity_id,
+                activity_name=row.get("activityName"),
+                activity_type=row.get("activityType"),
+            )
+            self.activities[activity_id] = stats
+
+        if row.get("endTime") is None:
+            stats.waiting += 1
+        elif row.get("durationInMillis") is not None:
+            stats.durations.add(float(row["durationInMillis"]))
+
+    def consume(self, rows: Iterable[Dict[str, Any]]) -> "BottleneckAnalyzer":
+        """Consume all rows of an iterable."""
+        for row in rows:
+            self.add(row)
+        return self
+
+    def ranking(self, rank_by: str = "total") -> List[ActivityStatistics]:
+        """Return activities ordered from worst to best bottleneck."""
+        if rank_by not in self.RANKINGS:
+            raise ValueError(
+                f"Unknown ranking '{rank_by}', use one of: {', '.join(self.RANKINGS)}"
+            )
+
+        def sort_key(stats: ActivityStatistics) -> Any:
+            if rank_by == "p90":
+                return (stats.durations.quantile(0.9), stats.waiting)
+            if rank_by == "waiting":
+                return (stats.waiting, stats.durations.total)
+            return (stats.durations.total, stats.waiting)
+
+        return sorted(self.activities.values(), key=sort_key, reverse=True)
+
+
+class TaskDurationSketches:
+    """Duration histograms of completed tasks per task definition key.
+
+    Built from ``/history/task`` rows, one row at a time. The histograms
+    answer how likely an open task is to take longer than its due date.
+    """
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, DurationHistogram] = {}
+        self.rows = 0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """Consume a single ``/history/task`` row."""
+        key = row.get("taskDefinitionKey")
+        if not key or row.get("durationInMillis") is None:
+            return
+
+        self.rows += 1
+        histogram = self.durations.get(key)
+        if histogram is None:
+            histogram = self.durations[key] = DurationHistogram()
+        histogram.add(float(row["durationInMillis"]))
+
+    def consume(self, rows: Iterable[Dict[str, Any]]) -> "TaskDurationSketches":
+        """Consume all rows of an iterable."""
+        for row in rows:
+            self.add(row)
+        return self
+
+    def breach_probability(
+        self, task_definition_key: str, elapsed_ms: float, allowed_ms: float
+    ) -> Optional[float]:
+        """Probability that a task open for ``elapsed_ms`` exceeds ``allowed_ms``.
+
+        Conditioned on the task still being open: only historic durations
+        longer than the elapsed time are considered. Returns None if there
+        is no history for the task definition.
+        """
+        histogram = self.durations.get(task_definition_key)
+        if histogram is None or not histogram.count:
+            return None
+        if elapsed_ms >= allowed_ms:
+            return 1.0
+
+        still_open = 1.0 - histogram.cdf(elapsed_ms)
+        if still_open <= 0:
+            # Open longer than any task before, nothing suggests it ends soon
+            return 1.0
+        exceeding = 1.0 - histogram.cdf(allowed_ms)
+        return min(1.0, exceeding / still_open)
+
+
+def format_duration(duration_ms: float) -> str:
+    """Format milliseconds as a short human readable duration."""
+    seconds = duration_ms / 1000
+    if seconds < 1:
+        return f"{duration_ms:.0f}ms"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}m"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
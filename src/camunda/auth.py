@@ -0,0 +1,167 @@
+"""
+OAuth2 authentication
+
+Client-credentials authentication for engines behind an OAuth2 provider. The
+access token is cached and refreshed in the background shortly before it
+expires, so requests on the hot path never wait for the token endpoint. Only
+one refresh runs at a time, however many requests need a token.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.auth import AuthBase
+
+logger = logging.getLogger(__name__)
+
+# Lifetime assumed when the token response has no expires_in
+DEFAULT_TOKEN_LIFETIME = 300.0
+
+
+class TokenError(requests.RequestException):
+    """The token endpoint answered without a usable access token."""
+
+
+class OAuth2ClientCredentials(AuthBase):
+    """Bearer token auth using the OAuth2 client credentials grant.
+
+    A request rejected with 401 is retried once with a new token, in case
+    the cached token was revoked before it expired.
+    """
+
+    def __init__(
+        self,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        scope: Optional[str] = None,
+        refresh_margin: float = 60.0,
+        timeout: float = 10.0,
+    ):
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        # Held while fetching a token, so concurrent callers share one fetch
+        self._fetch_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.fetches = 0
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        request.headers["Authorization"] = f"Bearer {self.token()}"
+        request.register_hook("response", self._handle_401)
+        return request
+
+    def token(self) -> str:
+        """Return a valid access token, fetching one only if there is none."""
+        now = time.monotonic()
+        with self._lock:
+            token = self._token if now < self._expires_at else None
+            refresh = (
+                token is not None and now >= self._refresh_at and not self._refreshing
+            )
+            if refresh:
+                self._refreshing = True
+
+        if token is None:
+            return self._fetch_if_stale(None)
+        if refresh:
+            threading.Thread(
+                target=self._refresh_in_background,
+                name="oauth-token-refresh",
+                daemon=True,
+            ).start()
+        return token
+
+    def _fetch_if_stale(self, rejected: Optional[str]) -> str:
+        """Fetch a token unless another thread has just fetched one.
+
+        ``rejected`` is a token the engine refused; it counts as stale even
+        though it has not expired.
+        """
+        with self._fetch_lock:
+            with self._lock:
+                token = self._token
+                if (
+                    token is not None
+                    and token != rejected
+                    and time.monotonic() < self._expires_at
+                ):
+                    return token
+            return self._fetch()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            with self._fetch_lock:
+                self._fetch()
+        except Exception as e:
+            # The current token is still valid, the next request tries again
+            logger.warning("Background refresh of OAuth token failed: %s", e)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _fetch(self) -> str:
+        """Request a new token from the token endpoint and cache it."""
+        data: Dict[str, Any] = {"grant_type": "client_credentials"}
+        if self.scope:
+            data["scope"] = self.scope
+
+        started = time.monotonic()
+        response = self.session.post(
+            self.token_url,
+            data=data,
+            auth=(self.client_id, self.client_secret),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        payload = response.json()
+
+        if not isinstance(payload, dict) or not payload.get("access_token"):
+            raise TokenError(
+                f"Token response from {self.token_url} has no access_token",
+                response=response,
+            )
+        token = str(payload["access_token"])
+        lifetime = float(payload.get("expires_in") or DEFAULT_TOKEN_LIFETIME)
+        with self._lock:
+            self._token = token
+            self._expires_at = started + lifetime
+            # Short-lived tokens are refreshed halfway through their lifetime
+            self._refresh_at = self._expires_at - min(self.refresh_margin, lifetime / 2)
+            self.fetches += 1
+        logger.debug("Fetched OAuth token valid for %gs", lifetime)
+        return token
+
+    def _handle_401(
+        self, response: requests.Response, **kwargs: Any
+    ) -> requests.Response:
+        """Retry a request rejected with 401 once with a new token."""
+        if response.status_code != 401:
+            return response
+
+        rejected = response.request.headers.get("Authorization", "")
+        token = self._fetch_if_stale(rejected[len("Bearer ") :])
+
+        # Release the connection before sending the retry on it
+        response.content
+        response.close()
+
+        retry = response.request.copy()
+        retry.deregister_hook("response", self._handle_401)
+        retry.headers["Authorization"] = f"Bearer {token}"
+        retried = response.connection.send(retry, **kwargs)
+        retried.history.append(response)
+        retried.request = retry
+        return retried
@@ -0,0 +1,166 @@
+"""
+BPMN model index
+
+Parses BPMN 2.0 XML into a compact lookup structure for activity names,
+types, outgoing flows and lanes.
+"""
+
+import io
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+# BPMN elements that represent flow nodes (activities, events and gateways)
+FLOW_NODE_TYPES: Set[str] = {
+    "task",
+    "userTask",
+    "serviceTask",
+    "scriptTask",
+    "sendTask",
+    "receiveTask",
+    "manualTask",
+    "businessRuleTask",
+    "callActivity",
+    "subProcess",
+    "adHocSubProcess",
+    "transaction",
+    "startEvent",
+    "endEvent",
+    "intermediateCatchEvent",
+    "intermediateThrowEvent",
+    "boundaryEvent",
+    "exclusiveGateway",
+    "parallelGateway",
+    "inclusiveGateway",
+    "eventBasedGateway",
+    "complexGateway",
+}
+
+
+class BpmnActivity(NamedTuple):
+    """A single flow node of a BPMN model."""
+
+    id: str
+    name: Optional[str]
+    type: str
+    outgoing: Tuple[str, ...] = ()
+    lane: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        """Human readable label, e.g. ``Approve Invoice (userTask)``."""
+        return f"{self.name or self.id} ({self.type})"
+
+
+class BpmnModelIndex:
+    """Compact, read-only index over the flow nodes of a BPMN model."""
+
+    __slots__ = ("definition_id", "process_names", "activities")
+
+    def __init__(
+        self,
+        definition_id: str,
+        process_names: Dict[str, Optional[str]],
+        activities: Dict[str, BpmnActivity],
+    ):
+        self.definition_id = definition_id
+        self.process_names = process_names
+        self.activities = activities
+
+    def __len__(self) -> int:
+        return len(self.activities)
+
+    def __contains__(self, activity_id: object) -> bool:
+        return activity_id in self.activities
+
+    @property
+    def process_name(self) -> Optional[str]:
+        """Name of the first (executable) process in the model."""
+        for name in self.process_names.values():
+            if name:
+                return name
+        return None
+
+    def get(self, activity_id: Optional[str]) -> Optional[BpmnActivity]:
+        """Look up an activity by id."""
+        if not activity_id:
+            return None
+        return self.activities.get(activity_id)
+
+    def label(self, activity_id: str) -> str:
+        """Return a readable label for an activity, falling back to its id."""
+        activity = self.activities.get(activity_id)
+        return activity.label if activity else activity_id
+
+    def next_activities(self, activity_id: str) -> List[BpmnActivity]:
+        """Return the activities reachable via outgoing sequence flows."""
+        activity = self.activities.get(activity_id)
+        if activity is None:
+            return []
+        return [
+            self.activities[target]
+            for target in activity.outgoing
+            if target in self.activities
+        ]
+
+    @classmethod
+    def from_xml(cls, definition_id: str, xml: Union[str, bytes]) -> "BpmnModelIndex":
+        """Build an index from BPMN 2.0 XML using a streaming parser."""
+        if isinstance(xml, str):
+            xml = xml.encode("utf-8")
+
+        process_names: Dict[str, Optional[str]] = {}
+        nodes: Dict[str, Tuple[Optional[str], str]] = {}
+        outgoing: Dict[str, List[str]] = {}
+        lanes: Dict[str, str] = {}
+        lane_stack: List[str] = []
+
+        for event, elem in _iterparse(xml):
+            tag = _local_name(elem.tag)
+
+            if event == "start":
+                if tag == "lane":
+                    lane_stack.append(elem.get("name") or elem.get("id") or "")
+                continue
+
+            if tag in FLOW_NODE_TYPES:
+                node_id = elem.get("id")
+                if node_id:
+                    nodes[node_id] = (elem.get("name"), tag)
+            elif tag == "sequenceFlow":
+                source, target = elem.get("sourceRef"), elem.get("targetRef")
+                if source and target:
+                    outgoing.setdefault(source, []).append(target)
+            elif tag == "flowNodeRef":
+                if lane_stack and elem.text:
+                    lanes[elem.text.strip()] = lane_stack[-1]
+            elif tag == "lane":
+                lane_stack.pop()
+            elif tag == "process":
+                process_id = elem.get("id")
+                if process_id:
+                    process_names[process_id] = elem.get("name")
+
+            # Everything needed has been extracted, drop the subtree
+            elem.clear()
+
+        activities = {
+            node_id: BpmnActivity(
+                id=node_id,
+                name=name,
+                type=node_type,
+                outgoing=tuple(outgoing.get(node_id, ())),
+                lane=lanes.get(node_id),
+            )
+            for node_id, (name, node_type) in nodes.items()
+        }
+        return cls(definition_id, process_names, activities)
+
+
+def _iterparse(xml: bytes) -> Iterator[Tuple[str, ET.Element]]:
+    """Stream start/end events without building the full document tree."""
+    return ET.iterparse(io.BytesIO(xml), events=("start", "end"))
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from an element tag."""
+    return tag.rsplit("}", 1)[-1]
@@ -0,0 +1,95 @@
+"""
+Tool result cache
+
+Short-lived cache for results of read-only tools. Assistants often repeat the
+same query within one turn; a cached result saves the round trip to Camunda.
+Write operations invalidate the whole cache, as any of them may change what
+the read-only tools return.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class ResultCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Entries are (expiry, result, prefetched and not yet read)
+        self._entries: "OrderedDict[Hashable, Tuple[float, str, bool]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation, so results computed before a write
+        # finished are not stored after it
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.prefetch_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def key(name: str, arguments: Dict[str, Any]) -> Hashable:
+        """Build a key from a tool name and its arguments, in any order."""
+        return name, json.dumps(arguments, sort_keys=True, default=str)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return a cached result, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if entry[2]:
+                self.prefetch_hits += 1
+                self._entries[key] = (entry[0], entry[1], False)
+            return entry[1]
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def put(
+        self, key: Hashable, result: str, generation: int, prefetched: bool = False
+    ) -> None:
+        """Store a result computed while ``generation`` was current."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, result, prefetched)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit and invalidation counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "ttl_seconds": self.ttl,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "invalidations": self.invalidations,
+                "prefetch_hits": self.prefetch_hits,
+            }
@@ -0,0 +1,226 @@
+"""
+Record and replay of Camunda traffic
+
+Cassettes are JSON lines files of request/response pairs. In record mode the
+client captures every exchange with a real engine; in replay mode it serves
+responses from the cassette without a network, optionally with the recorded
+latency. This lets parsing and formatting be benchmarked offline against
+production-shaped data.
+
+Credentials never reach a cassette: request headers are not recorded and
+values of secret-looking fields are replaced in bodies and query strings.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+SCRUBBED = "***"
+# Field names whose values are replaced before anything is written
+_SECRET_FIELD = re.compile(r"pass|secret|token|credential|authorization", re.I)
+
+Interaction = Dict[str, Any]
+_Key = Tuple[str, str, Optional[str]]
+
+
+class CassetteMiss(requests.ConnectionError):
+    """A replayed request has no recorded response."""
+
+
+def scrub(value: Any) -> Any:
+    """Replace values of secret-looking fields in decoded JSON."""
+    if isinstance(value, dict):
+        return {
+            key: SCRUBBED if _SECRET_FIELD.search(key) else scrub(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [scrub(item) for item in value]
+    return value
+
+
+def _scrub_text(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return text
+    try:
+        return json.dumps(scrub(json.loads(text)), separators=(",", ":"))
+    except ValueError:
+        if "=" in text and " " not in text:
+            return _scrub_query(text)
+        return text
+
+
+def _scrub_query(query: str) -> str:
+    pairs = parse_qsl(query, keep_blank_values=True)
+    return urlencode(
+        sorted(
+            (key, SCRUBBED if _SECRET_FIELD.search(key) else value)
+            for key, value in pairs
+        )
+    )
+
+
+def _request_key(method: str, url: str, body: Optional[str]) -> _Key:
+    """Identify a request independently of host and query parameter order."""
+    parts = urlsplit(url)
+    path = parts.path
+    if parts.query:
+        path += "?" + _scrub_query(parts.query)
+    return method.upper(), path, _scrub_text(body)
+
+
+def _body_text(body: Union[bytes, str, None]) -> Optional[str]:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    return body
+
+
+class Cassette:
+    """Interactions of one cassette file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, interaction: Interaction) -> None:
+        """Write one interaction to the end of the file."""
+        line = json.dumps(interaction, separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def load(self) -> List[Interaction]:
+        """Read all recorded interactions."""
+        with open(self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that records every exchange to a cassette."""
+
+    def __init__(self, cassette: Cassette, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Any = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> requests.Response:
+        started = time.monotonic()
+        response = super().send(request, stream, timeout, verify, cert, proxies)
+        # Reading the body here is part of the latency the engine caused
+        content = response.content
+        elapsed = time.monotonic() - started
+
+        method, path, body = _request_key(
+            request.method or "GET", request.url or "", _body_text(request.body)
+        )
+        self.cassette.append(
+            {
+                "method": method,
+                "path": path,
+                "body": body,
+                "status": response.status_code,
+                "reason": response.reason,
+                "content_type": response.headers.get("Content-Type"),
+                "response": _scrub_text(content.decode("utf-8", errors="replace")),
+                "elapsed": round(elapsed, 6),
+            }
+        )
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter that answers requests from a cassette.
+
+    Requests are matched by method, path, query and body. Repeated requests
+    get the recorded responses in order and start over when they run out,
+    so a short recording can drive a long benchmark. Latency is replayed
+    multiplied by ``latency_scale``; 0 answers immediately.
+    """
+
+    def __init__(self, cassette: Cassette, latency_scale: float = 1.0):
+        super().__init__()
+        self.latency_scale = latency_scale
+        self._recorded: Dict[_Key, List[Interaction]] = {}
+        for interaction in cassette.load():
+            key = (interaction["method"], interaction["path"], interaction["body"])
+            self._recorded.setdefault(key, []).append(interaction)
+        self._pending: Dict[_Key, Deque[Interaction]] = {}
+        self._lock = threading.Lock()
+        logger.info(
+            "Replaying %s recorded request(s) from %s",
+            sum(len(recorded) for recorded in self._recorded.values()),
+            cassette.path,
+        )
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Any = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> requests.Response:
+        key = _request_key(
+            request.method or "GET", request.url or "", _body_text(request.body)
+        )
+        with self._lock:
+            recorded = self._recorded.get(key)
+            if not recorded:
+                raise CassetteMiss(
+                    f"No recorded response for {key[0]} {key[1]}", request=request
+                )
+            pending = self._pending.get(key)
+            if not pending:
+                pending = self._pending[key] = deque(recorded)
+            interaction = pending.popleft()
+
+        delay = interaction.get("elapsed", 0.0) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+        return self._build_response(request, interaction)
+
+    def _build_response(
+        self, request: requests.PreparedRequest, interaction: Interaction
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction.get("reason") or ""
+        headers: Mapping[str, str] = (
+            {"Content-Type": interaction["content_type"]}
+            if interaction.get("content_type")
+            else {}
+        )
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = (interaction.get("response") or "").encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url or ""
+        response.request = request
+        response.elapsed = timedelta(seconds=interaction.get("elapsed", 0.0))
+        # Only used to send follow-up requests; any adapter with send() works
+        response.connection = self  # type: ignore[assignment]
+        return response
+
+    def close(self) -> None:
+        pass
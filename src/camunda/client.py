@@ -4,27 +4,86 @@ Camunda REST API Client
 Provides a Python client for interacting with Camunda 7.18 REST API.
 """
 
+import contextvars
+import copy
 import os
 import logging
-from typing import Dict, List, Optional, Any, cast
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Any, cast
+from dataclasses import dataclass, field
 import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
-from .models import Task, ProcessInstance, Comment
+from .auth import OAuth2ClientCredentials
+from .bpmn import BpmnModelIndex
+from .cassette import Cassette, RecordingAdapter, ReplayAdapter
+from .deadline import DeadlineExceeded, current_deadline
+from .models import (
+    Comment,
+    EntityStream,
+    ExternalTask,
+    ProcessInstance,
+    Task,
+    format_camunda_date,
+    typed_variable,
+)
+from .nodes import EngineNode, NodePool
+from .ratelimit import ENDPOINT_CLASSES, EndpointLimit, RequestAdmission
 
 logger = logging.getLogger(__name__)
 
+# Saved filters change rarely, their definitions are reused for this long
+FILTER_CACHE_SECONDS = 300.0
+# A BPMN model that could not be loaded is not requested again for this long
+BPMN_FAILURE_SECONDS = 60.0
+# Unique sort key of each history resource, to page in a stable order
+HISTORY_ID_SORT = {
+    "process-instance": "instanceId",
+    "task": "taskId",
+    "activity-instance": "activityInstanceId",
+}
+# Locks serializing BPMN model loads, shared by definition ids hashing alike
+BPMN_LOCK_STRIPES = 16
+
 
 @dataclass
 class CamundaConfig:
     """Configuration for Camunda connection."""
 
-    url: str
+    url: str  # one or more comma-separated engine node URLs
     username: Optional[str] = None
     password: Optional[str] = None
     auth_type: str = "basic"  # basic, oauth, none
+    # OAuth2 client credentials, used when auth_type is "oauth"
+    client_id: Optional[str] = None
+    client_secret: Optional[str] = None
+    token_url: Optional[str] = None
+    token_scope: Optional[str] = None
     timeout: int = 30
+    pool_size: int = 10
+    # Rate and in-flight limits per endpoint class (query, write, history)
+    endpoint_limits: Dict[str, EndpointLimit] = field(default_factory=dict)
+    # Longest a request may queue for admission before it is rejected as busy
+    max_queue_wait: float = 10.0
+    # Send reads to a second node when the first is slower than the p95 latency
+    hedge_reads: bool = False
+    # Consecutive failures after which a node is ejected, and for how long
+    node_eject_after: int = 3
+    node_eject_seconds: float = 30.0
+    # Record traffic to, or replay it from, a cassette file (record, replay)
+    cassette_path: Optional[str] = None
+    cassette_mode: str = "record"
+    # Replayed latency relative to the recorded one; 0 answers immediately
+    replay_latency_scale: float = 1.0
+
+    @property
+    def urls(self) -> List[str]:
+        """Engine node URLs without trailing slashes."""
+        return [url.strip().rstrip("/") for url in self.url.split(",") if url.strip()]
 
     @classmethod
     def from_environment(cls) -> "CamundaConfig":
@@ -34,7 +93,22 @@ class CamundaConfig:
             username=os.getenv("CAMUNDA_USERNAME"),
             password=os.getenv("CAMUNDA_PASSWORD"),
             auth_type=os.getenv("CAMUNDA_AUTH_TYPE", "basic"),
+            client_id=os.getenv("CAMUNDA_CLIENT_ID"),
+            client_secret=os.getenv("CAMUNDA_CLIENT_SECRET"),
+            token_url=os.getenv("CAMUNDA_TOKEN_URL"),
+            token_scope=os.getenv("CAMUNDA_TOKEN_SCOPE"),
             timeout=int(os.getenv("CAMUNDA_TIMEOUT", "30")),
+            pool_size=int(os.getenv("CAMUNDA_POOL_SIZE", "10")),
+            endpoint_limits={
+                name: EndpointLimit.from_environment(name) for name in ENDPOINT_CLASSES
+            },
+            max_queue_wait=float(os.getenv("CAMUNDA_MAX_QUEUE_WAIT", "10")),
+            hedge_reads=os.getenv("CAMUNDA_HEDGE_READS", "false").lower() == "true",
+            node_eject_after=int(os.getenv("CAMUNDA_NODE_EJECT_AFTER", "3")),
+            node_eject_seconds=float(os.getenv("CAMUNDA_NODE_EJECT_SECONDS", "30")),
+            cassette_path=os.getenv("CAMUNDA_CASSETTE"),
+            cassette_mode=os.getenv("CAMUNDA_CASSETTE_MODE", "record"),
+            replay_latency_scale=float(os.getenv("CAMUNDA_REPLAY_LATENCY_SCALE", "1")),
         )
 
 
@@ -46,23 +120,112 @@ class CamundaClient:
         self.config = config or CamundaConfig.from_environment()
         self.session = requests.Session()
 
-        # Set up authentication
+        # Size the connection pool for concurrent tool calls sharing this client
+        adapter: BaseAdapter = HTTPAdapter(
+            pool_connections=self.config.pool_size,
+            pool_maxsize=self.config.pool_size,
+        )
+        replaying = False
+        if self.config.cassette_path:
+            adapter, replaying = self._cassette_adapter(self.config.cassette_path)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.admission = RequestAdmission(self.config.endpoint_limits)
+        self.nodes = NodePool(
+            self.config.urls,
+            eject_after=self.config.node_eject_after,
+            eject_seconds=self.config.node_eject_seconds,
+        )
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
+
+        # Process definitions are immutable, so their parsed models never expire
+        self._bpmn_indexes: Dict[str, BpmnModelIndex] = {}
+        self._bpmn_failures: Dict[str, Tuple[float, Exception]] = {}
+        self._bpmn_failures_lock = threading.Lock()
+        # A fixed set of locks, so unrelated models mostly load in parallel
+        self._bpmn_locks = [threading.Lock() for _ in range(BPMN_LOCK_STRIPES)]
+
+        self._filters: Optional[List[Dict[str, Any]]] = None
+        self._filters_expire = 0.0
+        self._filters_lock = threading.Lock()
+
+        # Replayed responses need no authentication
+        if not replaying:
+            self._set_up_authentication()
+
+        logger.info("Camunda client initialized for %s", self.config.url)
+
+    def _set_up_authentication(self) -> None:
         if self.config.auth_type == "basic" and self.config.username:
             self.session.auth = HTTPBasicAuth(
                 self.config.username, self.config.password or ""
             )
+        elif self.config.auth_type == "oauth":
+            if not (self.config.token_url and self.config.client_id):
+                raise ValueError(
+                    "OAuth requires CAMUNDA_TOKEN_URL and CAMUNDA_CLIENT_ID"
+                )
+            self.session.auth = OAuth2ClientCredentials(
+                self.config.token_url,
+                self.config.client_id,
+                self.config.client_secret or "",
+                scope=self.config.token_scope,
+            )
 
-        logger.info(f"Camunda client initialized for {self.config.url}")
+    def _cassette_adapter(self, path: str) -> Tuple[BaseAdapter, bool]:
+        """Create the transport for recording to or replaying from a cassette."""
+        cassette = Cassette(path)
+        if self.config.cassette_mode == "replay":
+            return ReplayAdapter(cassette, self.config.replay_latency_scale), True
+        if self.config.cassette_mode == "record":
+            logger.info("Recording Camunda traffic to %s", path)
+            adapter = RecordingAdapter(
+                cassette,
+                pool_connections=self.config.pool_size,
+                pool_maxsize=self.config.pool_size,
+            )
+            return adapter, False
+        raise ValueError(
+            f"Unknown cassette mode {self.config.cassette_mode}, "
+            "use record or replay"
+        )
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        if isinstance(self.session.auth, OAuth2ClientCredentials):
+            self.session.auth.session.close()
+        self.session.close()
 
     def _make_request(self, method: str, endpoint: str, **kwargs: Any) -> Any:
-        """Make HTTP request to Camunda REST API."""
-        url = f"{self.config.url.rstrip('/')}/{endpoint.lstrip('/')}"
+        """Make HTTP request to Camunda REST API.
+
+        Returns the decoded JSON body, or the body as text with ``as_text``.
+        """
+        timeout = kwargs.pop("timeout", self.config.timeout)
+        as_text = kwargs.pop("as_text", False)
+        max_wait = self.config.max_queue_wait
+
+        # Within a tool deadline, only the remaining budget may be spent
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check()
+            timeout = min(timeout, deadline.remaining())
+            max_wait = min(max_wait, deadline.remaining())
 
         try:
-            response = self.session.request(
-                method, url, timeout=self.config.timeout, **kwargs
-            )
-            response.raise_for_status()
+            with self.admission.admit(method, endpoint, max_wait):
+                # Time spent queueing for admission is taken from the budget
+                if deadline is not None:
+                    deadline.check()
+                    timeout = min(timeout, deadline.remaining())
+                response = self._dispatch(method, endpoint, timeout, **kwargs)
+
+            if as_text:
+                return response.text
 
             # Handle empty responses
             if response.status_code == 204 or not response.content:
@@ -70,10 +233,175 @@ class CamundaClient:
 
             return response.json()
 
+        except requests.Timeout as e:
+            if deadline is not None and deadline.expired:
+                logger.warning("Camunda API request cut off by deadline: %s", e)
+                raise DeadlineExceeded(
+                    f"{deadline.name} exceeded its deadline of {deadline.seconds:g}s"
+                ) from e
+            logger.error("Camunda API request failed: %s", e)
+            raise
+
         except requests.RequestException as e:
-            logger.error(f"Camunda API request failed: {e}")
+            logger.error("Camunda API request failed: %s", e)
             raise
 
+    def _dispatch(
+        self, method: str, endpoint: str, timeout: float, **kwargs: Any
+    ) -> requests.Response:
+        """Send a request to a node, hedging and failing over idempotent reads."""
+        node = cast(EngineNode, self.nodes.select())
+        if method.upper() != "GET":
+            return self._send(node, method, endpoint, timeout, **kwargs)
+
+        try:
+            if self.config.hedge_reads:
+                return self._send_hedged(node, method, endpoint, timeout, **kwargs)
+            return self._send(node, method, endpoint, timeout, **kwargs)
+        except requests.ConnectionError:
+            fallback = self.nodes.select(exclude=node)
+            if fallback is None:
+                raise
+            logger.warning(
+                "Camunda node %s unreachable, using %s", node.url, fallback.url
+            )
+            return self._send(fallback, method, endpoint, timeout, **kwargs)
+
+    def _send(
+        self,
+        node: EngineNode,
+        method: str,
+        endpoint: str,
+        timeout: float,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a request to one node and record the outcome for its health."""
+        url = f"{node.url}/{endpoint.lstrip('/')}"
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            # Client errors say nothing about the health of the node
+            status = e.response.status_code if e.response is not None else 0
+            if status >= 500:
+                self.nodes.record_failure(node)
+            else:
+                self.nodes.record_success(node, time.monotonic() - started)
+            raise
+        except requests.Timeout:
+            # A timeout shortened by a tool deadline says nothing about the node
+            deadline = current_deadline()
+            if deadline is None or not deadline.expired:
+                self.nodes.record_failure(node)
+            raise
+        except requests.ConnectionError:
+            self.nodes.record_failure(node)
+            raise
+
+        elapsed = time.monotonic() - started
+        self.nodes.record_success(node, elapsed)
+        logger.debug(
+            "Camunda %s %s answered by %s in %.1f ms",
+            method,
+            endpoint,
+            node.url,
+            elapsed * 1000,
+        )
+        return response
+
+    def _send_hedged(
+        self,
+        node: EngineNode,
+        method: str,
+        endpoint: str,
+        timeout: float,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a read, and again to another node if the first is slow.
+
+        The second request goes out once the first has taken longer than the
+        recent p95 latency; whichever answers first successfully wins. The
+        slower request cannot be aborted and runs to completion in the
+        background.
+        """
+        delay = self.nodes.hedge_delay()
+        if delay is None or delay >= timeout or len(self.nodes.nodes) < 2:
+            return self._send(node, method, endpoint, timeout, **kwargs)
+
+        executor = self._get_hedge_executor()
+
+        def submit(target: EngineNode, budget: float) -> "Future[requests.Response]":
+            # Hedge threads see the caller's deadline through a copy of its context
+            context = contextvars.copy_context()
+
+            def send() -> requests.Response:
+                return context.run(
+                    self._send, target, method, endpoint, budget, **kwargs
+                )
+
+            return executor.submit(send)
+
+        first = submit(node, timeout)
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+
+        second_node = self.nodes.select(exclude=node)
+        if second_node is None or not second_node.available:
+            return first.result()
+
+        second = submit(second_node, timeout - delay)
+        pending: Set["Future[requests.Response]"] = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    self.nodes.record_hedge(won=future is second)
+                    return future.result()
+
+        self.nodes.record_hedge(won=False)
+        raise cast(BaseException, error)
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """Threads for hedged reads, created on first use."""
+        if self._hedge_executor is None:
+            with self._hedge_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(
+                        max_workers=self.config.pool_size,
+                        thread_name_prefix="camunda-hedge",
+                    )
+        return self._hedge_executor
+
+    def _iter_pages(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        page_size: int = 500,
+        body: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over all rows of a list endpoint, one page at a time.
+
+        With ``body`` the query is POSTed, which can sort by several keys.
+        """
+        method, kwargs = ("GET", {}) if body is None else ("POST", {"json": body})
+        first_result = 0
+        while True:
+            page = self._make_request(
+                method,
+                endpoint,
+                params={**params, "firstResult": first_result, "maxResults": page_size},
+                **kwargs,
+            )
+            yield from page
+            if len(page) < page_size:
+                return
+            first_result += page_size
+
     # Task Management Methods
 
     def get_tasks(
@@ -83,6 +411,15 @@ class CamundaClient:
         **filters: Any,
     ) -> List[Task]:
         """Get list of tasks with optional filtering."""
+        return list(self.stream_tasks(assignee, process_definition_key, **filters))
+
+    def stream_tasks(
+        self,
+        assignee: Optional[str] = None,
+        process_definition_key: Optional[str] = None,
+        **filters: Any,
+    ) -> EntityStream[Task]:
+        """Get tasks with optional filtering, built into models on iteration."""
 
         params = {}
         if assignee:
@@ -92,7 +429,7 @@ class CamundaClient:
         params.update(filters)
 
         data = self._make_request("GET", "/task", params=params)
-        return [Task.from_dict(task_data) for task_data in data]
+        return EntityStream(data, Task.from_dict)
 
     def get_task(self, task_id: str) -> Task:
         """Get detailed information for a specific task."""
@@ -111,7 +448,7 @@ class CamundaClient:
             }
 
         self._make_request("POST", f"/task/{task_id}/complete", json=payload)
-        logger.info(f"Task {task_id} completed successfully")
+        logger.info("Task %s completed successfully", task_id)
 
     def create_task(self, task_data: Dict[str, Any]) -> Task:
         """Create a new task."""
@@ -137,6 +474,12 @@ class CamundaClient:
         self, process_definition_key: Optional[str] = None, **filters: Any
     ) -> List[ProcessInstance]:
         """Get list of process instances."""
+        return list(self.stream_process_instances(process_definition_key, **filters))
+
+    def stream_process_instances(
+        self, process_definition_key: Optional[str] = None, **filters: Any
+    ) -> EntityStream[ProcessInstance]:
+        """Get process instances, built into models on iteration."""
 
         params = {}
         if process_definition_key:
@@ -144,13 +487,134 @@ class CamundaClient:
         params.update(filters)
 
         data = self._make_request("GET", "/process-instance", params=params)
-        return [ProcessInstance.from_dict(pi_data) for pi_data in data]
+        return EntityStream(data, ProcessInstance.from_dict)
 
-    def get_process_definitions(self) -> List[Dict[str, Any]]:
+    def get_process_definitions(self, **filters: Any) -> List[Dict[str, Any]]:
         """Get list of process definitions."""
-        data = self._make_request("GET", "/process-definition")
+        data = self._make_request("GET", "/process-definition", params=filters)
+        return cast(List[Dict[str, Any]], data)
+
+    def get_process_definition_statistics(
+        self, failed_jobs: bool = True, incidents: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Get running instance, failed job and incident counts per definition."""
+        params = _statistics_params(failed_jobs, incidents)
+        data = self._make_request(
+            "GET", "/process-definition/statistics", params=params
+        )
+        return cast(List[Dict[str, Any]], data)
+
+    def get_activity_statistics(
+        self, definition_id: str, failed_jobs: bool = True, incidents: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Get running instance, failed job and incident counts per activity."""
+        params = _statistics_params(failed_jobs, incidents)
+        data = self._make_request(
+            "GET", f"/process-definition/{definition_id}/statistics", params=params
+        )
         return cast(List[Dict[str, Any]], data)
 
+    # Incident Methods
+
+    def iter_incidents(
+        self, page_size: int = 500, **filters: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream open incidents, oldest first."""
+        params: Dict[str, Any] = {"sortBy": "incidentTimestamp", "sortOrder": "asc"}
+        params.update(filters)
+        return self._iter_pages("/incident", params, page_size)
+
+    def iter_history_incidents(
+        self, page_size: int = 500, **filters: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream historic incidents, oldest first."""
+        params: Dict[str, Any] = {"sortBy": "createTime", "sortOrder": "asc"}
+        params.update(filters)
+        return self._iter_pages("/history/incident", params, page_size)
+
+    def get_job_stacktrace(self, job_id: str) -> str:
+        """Get the stack trace of the last failure of a job."""
+        return cast(
+            str, self._make_request("GET", f"/job/{job_id}/stacktrace", as_text=True)
+        )
+
+    def get_external_task_error_details(self, external_task_id: str) -> str:
+        """Get the error details reported with the last failure of an external task."""
+        return cast(
+            str,
+            self._make_request(
+                "GET", f"/external-task/{external_task_id}/errorDetails", as_text=True
+            ),
+        )
+
+    def get_process_definition_xml(self, definition_id: str) -> str:
+        """Get the BPMN 2.0 XML of a process definition."""
+        data = self._make_request("GET", f"/process-definition/{definition_id}/xml")
+        return cast(str, data.get("bpmn20Xml", ""))
+
+    def get_bpmn_index(self, definition_id: str) -> BpmnModelIndex:
+        """Get the parsed BPMN model index for a process definition.
+
+        The XML is fetched and parsed once per definition id; definitions are
+        immutable in Camunda, so the index is cached for the client lifetime.
+        A failure is raised again without a request for
+        ``BPMN_FAILURE_SECONDS``, so listing many instances of a definition
+        whose model is unavailable costs one request, not one per instance.
+        """
+        index = self._bpmn_indexes.get(definition_id)
+        if index is not None:
+            return index
+
+        with self._bpmn_locks[hash(definition_id) % BPMN_LOCK_STRIPES]:
+            index = self._bpmn_indexes.get(definition_id)
+            if index is not None:
+                return index
+
+            with self._bpmn_failures_lock:
+                failure = self._bpmn_failures.get(definition_id)
+            if failure is not None and time.monotonic() < failure[0]:
+                # A copy per caller, raising the cached exception in several
+                # threads would mix up their tracebacks
+                raise copy.copy(failure[1]) from failure[1]
+
+            try:
+                xml = self.get_process_definition_xml(definition_id)
+                index = BpmnModelIndex.from_xml(definition_id, xml)
+            except DeadlineExceeded:
+                # Says nothing about the model, the next call may succeed
+                raise
+            except Exception as e:
+                logger.warning("BPMN model %s not available: %s", definition_id, e)
+                now = time.monotonic()
+                with self._bpmn_failures_lock:
+                    # Expired failures are dropped, they would be retried anyway
+                    for expired in [
+                        key
+                        for key, (until, _) in self._bpmn_failures.items()
+                        if until <= now
+                    ]:
+                        del self._bpmn_failures[expired]
+                    self._bpmn_failures[definition_id] = (
+                        now + BPMN_FAILURE_SECONDS,
+                        e,
+                    )
+                raise
+
+            self._bpmn_indexes[definition_id] = index
+            with self._bpmn_failures_lock:
+                self._bpmn_failures.pop(definition_id, None)
+            logger.info(
+                "Indexed BPMN model %s (%s activities)", definition_id, len(index)
+            )
+        return index
+
+    def get_activity_instance_tree(self, process_instance_id: str) -> Dict[str, Any]:
+        """Get the activity instance tree of a running process instance."""
+        data = self._make_request(
+            "GET", f"/process-instance/{process_instance_id}/activity-instances"
+        )
+        return cast(Dict[str, Any], data)
+
     def start_process(
         self,
         process_definition_key: str,
@@ -173,14 +637,360 @@ class CamundaClient:
             f"/process-definition/key/{process_definition_key}/start",
             json=payload,
         )
-        logger.info(f"Process instance started: {data.get('id')}")
+        logger.info("Process instance started: %s", data.get("id"))
         return ProcessInstance.from_dict(data)
 
+    # Filter Methods
+
+    def get_filters(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Get the saved task filters.
+
+        Definitions are cached for ``FILTER_CACHE_SECONDS``; ``refresh``
+        fetches them again.
+        """
+        with self._filters_lock:
+            if (
+                refresh
+                or self._filters is None
+                or time.monotonic() >= self._filters_expire
+            ):
+                data = self._make_request(
+                    "GET", "/filter", params={"resourceType": "Task"}
+                )
+                self._filters = cast(List[Dict[str, Any]], data)
+                self._filters_expire = time.monotonic() + FILTER_CACHE_SECONDS
+            return self._filters
+
+    def stream_filter_tasks(
+        self, filter_id: str, first_result: int = 0, max_results: int = 50
+    ) -> EntityStream[Task]:
+        """Get one page of the tasks matched by a saved filter."""
+        data = self._make_request(
+            "GET",
+            f"/filter/{filter_id}/list",
+            params={"firstResult": first_result, "maxResults": max_results},
+        )
+        return EntityStream(data, Task.from_dict)
+
+    def get_filter_count(self, filter_id: str) -> int:
+        """Count the tasks matched by a saved filter."""
+        data = self._make_request("GET", f"/filter/{filter_id}/count")
+        return int(data.get("count", 0))
+
+    # Message and Signal Methods
+
+    def correlate_message(
+        self,
+        message_name: str,
+        business_key: Optional[str] = None,
+        process_instance_id: Optional[str] = None,
+        correlation_keys: Optional[Dict[str, Any]] = None,
+        variables: Optional[Dict[str, Any]] = None,
+        correlate_all: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Correlate a message to waiting executions or message start events.
+
+        With ``correlate_all`` every matching execution receives the message,
+        otherwise exactly one must match. Returns one result per correlation.
+        """
+        payload: Dict[str, Any] = {
+            "messageName": message_name,
+            "all": correlate_all,
+            "resultEnabled": True,
+        }
+        if business_key:
+            payload["businessKey"] = business_key
+        if process_instance_id:
+            payload["processInstanceId"] = process_instance_id
+        if correlation_keys:
+            payload["correlationKeys"] = {
+                name: typed_variable(value) for name, value in correlation_keys.items()
+            }
+        if variables:
+            payload["processVariables"] = {
+                name: typed_variable(value) for name, value in variables.items()
+            }
+
+        data = self._make_request("POST", "/message", json=payload)
+        logger.info("Message %s correlated %s time(s)", message_name, len(data))
+        return cast(List[Dict[str, Any]], data)
+
+    def send_signal(
+        self, signal_name: str, variables: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Broadcast a signal to all waiting executions and signal start events."""
+        payload: Dict[str, Any] = {"name": signal_name}
+        if variables:
+            payload["variables"] = {
+                name: typed_variable(value) for name, value in variables.items()
+            }
+        self._make_request("POST", "/signal", json=payload)
+        logger.info("Signal %s sent", signal_name)
+
+    # Decision Methods
+
+    def get_decision_definitions(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Get list of DMN decision definitions."""
+        data = self._make_request("GET", "/decision-definition", params=filters)
+        return cast(List[Dict[str, Any]], data)
+
+    def evaluate_decision(
+        self, decision_definition_key: str, variables: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Evaluate the latest version of a decision with the given inputs.
+
+        Returns one entry per matched rule, mapping output names to values.
+        """
+        payload = {
+            "variables": {
+                name: typed_variable(value) for name, value in variables.items()
+            }
+        }
+        data = self._make_request(
+            "POST",
+            f"/decision-definition/key/{decision_definition_key}/evaluate",
+            json=payload,
+        )
+        return [
+            {name: output.get("value") for name, output in result.items()}
+            for result in data
+        ]
+
+    # Batch Operation Methods
+
+    def delete_process_instances_async(
+        self,
+        process_instance_query: Dict[str, Any],
+        delete_reason: Optional[str] = None,
+        skip_custom_listeners: bool = False,
+        skip_subprocesses: bool = False,
+    ) -> Dict[str, Any]:
+        """Delete all matching process instances in an engine-side batch."""
+        payload: Dict[str, Any] = {
+            "processInstanceQuery": process_instance_query,
+            "skipCustomListeners": skip_custom_listeners,
+            "skipSubprocesses": skip_subprocesses,
+        }
+        if delete_reason:
+            payload["deleteReason"] = delete_reason
+
+        data = self._make_request("POST", "/process-instance/delete", json=payload)
+        logger.info("Delete batch started: %s", data.get("id"))
+        return cast(Dict[str, Any], data)
+
+    def suspend_process_instances_async(
+        self, process_instance_query: Dict[str, Any], suspended: bool = True
+    ) -> Dict[str, Any]:
+        """Suspend or activate all matching process instances in a batch."""
+        payload = {
+            "processInstanceQuery": process_instance_query,
+            "suspended": suspended,
+        }
+        data = self._make_request(
+            "POST", "/process-instance/suspended-async", json=payload
+        )
+        logger.info("Suspension batch started: %s", data.get("id"))
+        return cast(Dict[str, Any], data)
+
+    def set_job_retries_async(
+        self, job_query: Dict[str, Any], retries: int
+    ) -> Dict[str, Any]:
+        """Set the retries of all matching jobs in a batch."""
+        payload = {"jobQuery": job_query, "retries": retries}
+        data = self._make_request("POST", "/job/retries", json=payload)
+        logger.info("Job retries batch started: %s", data.get("id"))
+        return cast(Dict[str, Any], data)
+
+    def set_process_variables_async(
+        self, process_instance_query: Dict[str, Any], variables: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Set variables on all matching process instances in a batch."""
+        payload = {
+            "processInstanceQuery": process_instance_query,
+            "variables": {key: {"value": value} for key, value in variables.items()},
+        }
+        data = self._make_request(
+            "POST", "/process-instance/variables-async", json=payload
+        )
+        logger.info("Variables batch started: %s", data.get("id"))
+        return cast(Dict[str, Any], data)
+
+    def get_batch_statistics(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Get progress of a running batch, or None once it has finished."""
+        data = self._make_request(
+            "GET", "/batch/statistics", params={"batchId": batch_id}
+        )
+        return cast(Dict[str, Any], data[0]) if data else None
+
+    def get_historic_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Get the history entry of a batch, including its end time."""
+        data = self._make_request("GET", f"/history/batch/{batch_id}")
+        return cast(Dict[str, Any], data)
+
+    # External Task Methods
+
+    def fetch_and_lock(
+        self,
+        worker_id: str,
+        topics: List[Dict[str, Any]],
+        max_tasks: int = 10,
+        async_response_timeout: Optional[int] = None,
+        use_priority: bool = True,
+    ) -> List[ExternalTask]:
+        """Fetch and lock external tasks, optionally long-polling.
+
+        ``async_response_timeout`` (milliseconds) lets the engine hold the
+        request open until tasks become available.
+        """
+        payload: Dict[str, Any] = {
+            "workerId": worker_id,
+            "maxTasks": max_tasks,
+            "usePriority": use_priority,
+            "topics": topics,
+        }
+        timeout: float = self.config.timeout
+        if async_response_timeout:
+            payload["asyncResponseTimeout"] = async_response_timeout
+            timeout += async_response_timeout / 1000
+
+        data = self._make_request(
+            "POST", "/external-task/fetchAndLock", json=payload, timeout=timeout
+        )
+        return [ExternalTask.from_dict(task_data) for task_data in data]
+
+    def complete_external_task(
+        self,
+        task_id: str,
+        worker_id: str,
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Complete a locked external task with optional variables."""
+        payload: Dict[str, Any] = {"workerId": worker_id}
+        if variables:
+            payload["variables"] = {
+                key: {"value": value} for key, value in variables.items()
+            }
+        self._make_request("POST", f"/external-task/{task_id}/complete", json=payload)
+
+    def handle_external_task_failure(
+        self,
+        task_id: str,
+        worker_id: str,
+        error_message: str,
+        error_details: Optional[str] = None,
+        retries: int = 0,
+        retry_timeout: int = 0,
+    ) -> None:
+        """Report a failure; an incident is created when retries reach 0."""
+        payload: Dict[str, Any] = {
+            "workerId": worker_id,
+            "errorMessage": error_message,
+            "retries": retries,
+            "retryTimeout": retry_timeout,
+        }
+        if error_details:
+            payload["errorDetails"] = error_details
+        self._make_request("POST", f"/external-task/{task_id}/failure", json=payload)
+
+    def handle_external_task_bpmn_error(
+        self,
+        task_id: str,
+        worker_id: str,
+        error_code: str,
+        error_message: Optional[str] = None,
+    ) -> None:
+        """Report a business error that is handled in the process model."""
+        payload: Dict[str, Any] = {"workerId": worker_id, "errorCode": error_code}
+        if error_message:
+            payload["errorMessage"] = error_message
+        self._make_request("POST", f"/external-task/{task_id}/bpmnError", json=payload)
+
+    def extend_external_task_lock(
+        self, task_id: str, worker_id: str, new_duration: int
+    ) -> None:
+        """Extend the lock of an external task by ``new_duration`` ms from now."""
+        payload = {"workerId": worker_id, "newDuration": new_duration}
+        self._make_request("POST", f"/external-task/{task_id}/extendLock", json=payload)
+
+    def unlock_external_task(self, task_id: str) -> None:
+        """Release the lock of an external task so other workers can fetch it."""
+        self._make_request("POST", f"/external-task/{task_id}/unlock")
+
+    def get_external_task_topic_names(self) -> List[str]:
+        """Get the names of all topics that have external tasks."""
+        data = self._make_request("GET", "/external-task/topic-names")
+        return cast(List[str], data)
+
+    def get_external_task_count(self, **filters: Any) -> int:
+        """Count external tasks matching the given query parameters."""
+        data = self._make_request("GET", "/external-task/count", params=filters)
+        return int(data.get("count", 0))
+
+    # History Methods
+
+    def iter_history_activity_instances(
+        self,
+        process_definition_id: str,
+        started_after: Optional[str] = None,
+        started_before: Optional[str] = None,
+        page_size: int = 500,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream historic activity instances of a process definition."""
+        params: Dict[str, Any] = {
+            "processDefinitionId": process_definition_id,
+            "sortBy": "startTime",
+            "sortOrder": "asc",
+        }
+        if started_after:
+            params["startedAfter"] = format_camunda_date(started_after)
+        if started_before:
+            params["startedBefore"] = format_camunda_date(started_before)
+
+        return self._iter_pages("/history/activity-instance", params, page_size)
+
+    def iter_history(
+        self,
+        resource: str,
+        started_after: Optional[str] = None,
+        page_size: int = 500,
+        **filters: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream rows of a history resource (e.g. ``task``) by start time.
+
+        Rows starting in the same millisecond are ordered by id, so paging
+        neither skips nor repeats rows at page boundaries.
+        """
+        sorting = [{"sortBy": "startTime", "sortOrder": "asc"}]
+        if resource in HISTORY_ID_SORT:
+            sorting.append({"sortBy": HISTORY_ID_SORT[resource], "sortOrder": "asc"})
+        body: Dict[str, Any] = {"sorting": sorting}
+        if started_after:
+            body["startedAfter"] = format_camunda_date(started_after)
+        body.update(filters)
+
+        return self._iter_pages(f"/history/{resource}", {}, page_size, body=body)
+
     def health_check(self) -> bool:
-        """Check if Camunda server is accessible."""
-        try:
-            self._make_request("GET", "/engine")
-            return True
-        except Exception as e:
-            logger.error(f"Health check failed: {e}")
-            return False
+        """Check if Camunda server is accessible.
+
+        Every engine node is probed, which also reinstates recovered nodes.
+        Returns True if at least one node is healthy.
+        """
+        healthy = False
+        for node in self.nodes.nodes:
+            try:
+                self._send(node, "GET", "/engine", self.config.timeout)
+                healthy = True
+            except Exception as e:
+                logger.error("Health check failed for %s: %s", node.url, e)
+        return healthy
+
+
+def _statistics_params(failed_jobs: bool, incidents: bool) -> Dict[str, str]:
+    """Build query parameters for the statistics endpoints."""
+    params = {}
+    if failed_jobs:
+        params["failedJobs"] = "true"
+    if incidents:
+        params["incidents"] = "true"
+    return params
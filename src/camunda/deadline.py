@@ -0,0 +1,121 @@
+"""
+Request deadlines
+
+A deadline bounds the total time of a tool invocation. Every Camunda request
+made while a deadline is active uses the remaining budget as its timeout and
+is refused once the budget is spent.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, TypeVar, Union
+
+_current_deadline: "ContextVar[Optional[Deadline]]" = ContextVar(
+    "camunda_deadline", default=None
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_exceeded: Dict[str, int] = {}
+_exceeded_lock = threading.Lock()
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request is attempted after the deadline has passed."""
+
+
+class Deadline:
+    """Point in time by which an operation has to finish."""
+
+    __slots__ = ("name", "seconds", "expires_at")
+
+    def __init__(self, seconds: float, name: str = "operation"):
+        self.name = name
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """Raise DeadlineExceeded if the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceeded(
+                f"{self.name} exceeded its deadline of {self.seconds:g}s"
+            )
+
+
+@contextmanager
+def deadline(seconds: float, name: str = "operation") -> Iterator[Deadline]:
+    """Run the enclosed block under a new deadline of ``seconds``."""
+    with activate_deadline(Deadline(seconds, name)) as active:
+        yield active
+
+
+@contextmanager
+def activate_deadline(new: Deadline) -> Iterator[Deadline]:
+    """Run the enclosed block under an existing deadline.
+
+    Nested deadlines never extend an outer one: the earlier expiry wins.
+    """
+    outer = _current_deadline.get()
+    if outer is not None and outer.expires_at < new.expires_at:
+        new.expires_at = outer.expires_at
+
+    token = _current_deadline.set(new)
+    try:
+        yield new
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Return the deadline of the current context, if any."""
+    return _current_deadline.get()
+
+
+def map_in_context(
+    fn: Callable[[T], R], items: Sequence[T], max_workers: int
+) -> List[Union[R, Exception]]:
+    """Apply ``fn`` to all items in a thread pool, in order.
+
+    Workers run in a copy of the caller's context, so its deadline applies to
+    their requests. A failing call yields its exception in place of the
+    result, so results finished in time are kept when others fail or run out
+    of time.
+    """
+    if not items:
+        return []
+    context = copy_context()
+
+    def call(item: T) -> Union[R, Exception]:
+        try:
+            return context.copy().run(fn, item)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(items)))
+    ) as executor:
+        return list(executor.map(call, items))
+
+
+def record_exceeded(name: str) -> None:
+    """Count an operation that ran out of time."""
+    with _exceeded_lock:
+        _exceeded[name] = _exceeded.get(name, 0) + 1
+
+
+def deadline_statistics() -> Dict[str, int]:
+    """Return the number of exceeded deadlines per operation name."""
+    with _exceeded_lock:
+        return dict(_exceeded)
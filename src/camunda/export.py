@@ -0,0 +1,358 @@
+"""
+History export
+
+Streams Camunda history page by page into gzip-compressed JSONL files with
+constant memory. Rows are exported in start time order and written to part
+files of at most ``rows_per_file`` rows. After each completed part a
+checkpoint with the last exported start time is saved, so an interrupted
+export resumes where it stopped instead of starting over.
+
+Only one export per resource and directory runs at a time, across threads
+and processes: a run holds a lock file next to the checkpoint.
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import IO, TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence
+
+from .deadline import DeadlineExceeded
+
+if TYPE_CHECKING:
+    from .client import CamundaClient
+
+logger = logging.getLogger(__name__)
+
+HISTORY_RESOURCES = ("process-instance", "task", "activity-instance")
+
+CAMUNDA_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+# Exports running in this process, by lock file path
+_running: Dict[str, threading.Lock] = {}
+_running_lock = threading.Lock()
+
+
+class ExportInProgress(RuntimeError):
+    """Another export of the same resource into the same directory is running."""
+
+
+@dataclass
+class ExportResult:
+    """Outcome of one export run."""
+
+    resource: str
+    rows: int
+    files: List[str]
+    seconds: float
+    complete: bool
+    total_rows: int
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+class Checkpoint:
+    """Export progress of one resource, stored as JSON next to the files."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.last_start: Optional[str] = None
+        # Rows with the last start time, skipped when the export resumes
+        self.last_ids: List[str] = []
+        self.rows = 0
+        self.parts = 0
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            self.last_start = data.get("last_start")
+            self.last_ids = data.get("last_ids", [])
+            self.rows = data.get("rows", 0)
+            self.parts = data.get("parts", 0)
+
+    def save(self) -> None:
+        """Write the checkpoint atomically."""
+        data = {
+            "last_start": self.last_start,
+            "last_ids": self.last_ids,
+            "rows": self.rows,
+            "parts": self.parts,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+class HistoryExporter:
+    """Exports one history resource into a directory."""
+
+    def __init__(
+        self,
+        client: "CamundaClient",
+        resource: str,
+        directory: str,
+        page_size: int = 500,
+        rows_per_file: int = 100_000,
+    ):
+        if resource not in HISTORY_RESOURCES:
+            raise ValueError(
+                f"Unknown history resource {resource}, "
+                f"expected one of {', '.join(HISTORY_RESOURCES)}"
+            )
+        self.client = client
+        self.resource = resource
+        self.directory = directory
+        self.page_size = page_size
+        self.rows_per_file = rows_per_file
+        self.checkpoint_path = os.path.join(directory, f"{resource}.checkpoint.json")
+        self.lock_path = os.path.join(directory, f"{resource}.lock")
+        self.checkpoint = Checkpoint(self.checkpoint_path)
+
+    def run(self, max_rows: Optional[int] = None) -> ExportResult:
+        """Export rows started since the checkpoint.
+
+        Stops after ``max_rows`` rows if given, or when the deadline of the
+        calling tool is reached. If the process is killed, the unfinished part
+        file is discarded and its rows are exported again on the next run.
+        Raises ExportInProgress if the resource is being exported already.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with self._exclusive():
+            # Another run may have moved the checkpoint since it was read
+            self.checkpoint = Checkpoint(self.checkpoint_path)
+            return self._export(max_rows)
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Hold the export lock of this resource, in this and other processes."""
+        key = os.path.abspath(self.lock_path)
+        with _running_lock:
+            lock = _running.setdefault(key, threading.Lock())
+        if not lock.acquire(blocking=False):
+            raise ExportInProgress(f"{self.resource} is being exported already")
+        try:
+            self._create_lock_file()
+            try:
+                yield
+            finally:
+                os.remove(self.lock_path)
+        finally:
+            lock.release()
+
+    def _create_lock_file(self) -> None:
+        for _ in range(2):
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._remove_stale_lock():
+                    raise ExportInProgress(
+                        f"{self.resource} is being exported by another process, "
+                        f"or {self.lock_path} was left behind and can be deleted"
+                    )
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return
+        raise ExportInProgress(f"{self.resource} is being exported already")
+
+    def _remove_stale_lock(self) -> bool:
+        """Remove a lock file whose process no longer exists."""
+        try:
+            with open(self.lock_path) as f:
+                pid = int(f.read().strip())
+        except (OSError, ValueError):
+            return False
+        if pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            logger.warning("Removing stale export lock %s", self.lock_path)
+            try:
+                os.remove(self.lock_path)
+            except FileNotFoundError:
+                pass
+            return True
+        except OSError:
+            pass
+        return False
+
+    def _export(self, max_rows: Optional[int]) -> ExportResult:
+        checkpoint = self.checkpoint
+        started = time.monotonic()
+        files: List[str] = []
+        exported = 0
+        complete = False
+
+        # Query from just before the last start time, whether the engine
+        # filters inclusively or not, and skip the rows exported already
+        started_after = None
+        if checkpoint.last_start:
+            started_after = (
+                _parse_date(checkpoint.last_start) - timedelta(milliseconds=1)
+            ).isoformat()
+        skip_before = (
+            _parse_date(checkpoint.last_start) if checkpoint.last_start else None
+        )
+        skip_ids = set(checkpoint.last_ids)
+
+        part: Optional[IO[str]] = None
+        part_rows = 0
+        last_start = checkpoint.last_start
+        last_ids = list(checkpoint.last_ids)
+        try:
+            for row in self.client.iter_history(
+                self.resource, started_after, self.page_size
+            ):
+                row_id = row.get("id")
+                if row_id is None:
+                    # Could not be told apart from a duplicate when resuming
+                    logger.warning("Skipping %s row without id", self.resource)
+                    continue
+                row_id = str(row_id)
+
+                row_start = row.get("startTime")
+                if skip_before is not None and row_start:
+                    row_time = _parse_date(row_start)
+                    if row_time < skip_before or (
+                        row_time == skip_before and row_id in skip_ids
+                    ):
+                        continue
+
+                if part is None:
+                    part = self._open_part()
+                part.write(json.dumps(row, separators=(",", ":")))
+                part.write("\n")
+                part_rows += 1
+                exported += 1
+
+                if row_start != last_start:
+                    last_start, last_ids = row_start, []
+                last_ids.append(row_id)
+
+                if part_rows >= self.rows_per_file:
+                    files.append(
+                        self._close_part(part, part_rows, last_start, last_ids)
+                    )
+                    part, part_rows = None, 0
+                if max_rows is not None and exported >= max_rows:
+                    break
+            else:
+                complete = True
+        except DeadlineExceeded:
+            logger.warning("Export of %s stopped by deadline", self.resource)
+        finally:
+            if part is not None:
+                # Keep the rows written so far, the checkpoint moves with them
+                files.append(self._close_part(part, part_rows, last_start, last_ids))
+
+        seconds = time.monotonic() - started
+        result = ExportResult(
+            resource=self.resource,
+            rows=exported,
+            files=files,
+            seconds=seconds,
+            complete=complete,
+            total_rows=checkpoint.rows,
+        )
+        logger.info(
+            "Exported %s %s row(s) in %.1fs (%.0f rows/s)",
+            exported,
+            self.resource,
+            seconds,
+            result.rows_per_second,
+        )
+        return result
+
+    def _part_path(self, number: int) -> str:
+        return os.path.join(
+            self.directory, f"{self.resource}.part-{number:05d}.jsonl.gz"
+        )
+
+    def _open_part(self) -> IO[str]:
+        # Written under a temporary name until the checkpoint covers it
+        path = f"{self._part_path(self.checkpoint.parts + 1)}.tmp"
+        return gzip.open(path, "wt", encoding="utf-8")
+
+    def _close_part(
+        self,
+        part: IO[str],
+        rows: int,
+        last_start: Optional[str],
+        last_ids: List[str],
+    ) -> str:
+        part.close()
+        checkpoint = self.checkpoint
+        checkpoint.parts += 1
+        path = self._part_path(checkpoint.parts)
+        os.replace(f"{path}.tmp", path)
+
+        checkpoint.rows += rows
+        checkpoint.last_start = last_start
+        checkpoint.last_ids = list(last_ids)
+        checkpoint.save()
+        return path
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, CAMUNDA_DATE_FORMAT)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Export Camunda history to compressed JSONL files."""
+    parser = argparse.ArgumentParser(
+        prog="camunda-history-export", description=main.__doc__
+    )
+    parser.add_argument(
+        "resources",
+        nargs="*",
+        choices=HISTORY_RESOURCES,
+        default=list(HISTORY_RESOURCES),
+        metavar="resource",
+        help=f"history to export ({', '.join(HISTORY_RESOURCES)}; default: all)",
+    )
+    parser.add_argument(
+        "--output",
+        default=os.getenv("MCP_EXPORT_DIR", "exports"),
+        help="output directory (env: MCP_EXPORT_DIR, default: exports)",
+    )
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--rows-per-file", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    from ..logging_config import configure_logging
+    from .client import CamundaClient
+
+    configure_logging()
+    client = CamundaClient()
+    try:
+        for resource in args.resources:
+            result = HistoryExporter(
+                client, resource, args.output, args.page_size, args.rows_per_file
+            ).run()
+            print(
+                f"{resource}: {result.rows} row(s) in {result.seconds:.1f}s "
+                f"({result.rows_per_second:.0f} rows/s), "
+                f"{result.total_rows} exported in total"
+            )
+    except ExportInProgress as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("Interrupted; run again to resume from the last checkpoint")
+        sys.exit(130)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+"""
+External task worker
+
+Long-polling worker pool for Camunda external tasks with per-topic handlers,
+lock extension and batched result reporting.
+"""
+
+import logging
+import queue
+import threading
+import time
+import traceback
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .client import CamundaClient
+from .models import ExternalTask
+
+logger = logging.getLogger(__name__)
+
+# A handler returns the variables to complete the task with (or None)
+ExternalTaskHandler = Callable[[ExternalTask], Optional[Dict[str, Any]]]
+
+
+class ExternalTaskBpmnError(Exception):
+    """Raised by a handler to throw a BPMN error instead of failing the task."""
+
+    def __init__(self, error_code: str, message: Optional[str] = None):
+        super().__init__(message or error_code)
+        self.error_code = error_code
+        self.message = message
+
+
+@dataclass
+class TopicSubscription:
+    """Handler registration for one topic."""
+
+    topic_name: str
+    handler: ExternalTaskHandler
+    lock_duration: int
+    variables: Optional[List[str]] = None
+    retries: int = 3
+    retry_timeout: int = 10000
+
+    def to_fetch_topic(self) -> Dict[str, Any]:
+        """Topic entry of a fetchAndLock request."""
+        topic: Dict[str, Any] = {
+            "topicName": self.topic_name,
+            "lockDuration": self.lock_duration,
+        }
+        if self.variables is not None:
+            topic["variables"] = self.variables
+        return topic
+
+
+@dataclass
+class _Report:
+    """Outcome of a handler execution waiting to be sent to the engine."""
+
+    task: ExternalTask
+    subscription: TopicSubscription
+    variables: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+    error_details: Optional[str] = None
+
+
+@dataclass
+class _LockedTask:
+    """In-flight task with the monotonic time its lock expires."""
+
+    task: ExternalTask
+    lock_duration: int
+    expires_at: float
+
+
+@dataclass
+class WorkerStatistics:
+    """Counters of an external task worker."""
+
+    started_at: float = field(default_factory=time.monotonic)
+    fetched: int = 0
+    completed: int = 0
+    failed: int = 0
+    bpmn_errors: int = 0
+    report_errors: int = 0
+    lock_extensions: int = 0
+    per_topic: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Finished tasks per minute since the worker started."""
+        elapsed = time.monotonic() - self.started_at
+        finished = self.completed + self.failed + self.bpmn_errors
+        return finished / elapsed * 60 if elapsed > 0 else 0.0
+
+
+class ExternalTaskWorker:
+    """Fetches, executes and reports Camunda external tasks.
+
+    One thread long-polls ``fetchAndLock`` for all subscribed topics and hands
+    tasks to a thread pool; fetching pauses while the pool is saturated. A
+    second thread extends locks of long running tasks, and a third one sends
+    results in batches so reporting does not hold up handler threads.
+
+    Example:
+        worker = ExternalTaskWorker(CamundaClient())
+
+        @worker.subscribe("charge-card")
+        def charge_card(task):
+            return {"charged": True}
+
+        worker.start()
+    """
+
+    _running: "weakref.WeakSet[ExternalTaskWorker]" = weakref.WeakSet()
+
+    def __init__(
+        self,
+        client: CamundaClient,
+        worker_id: Optional[str] = None,
+        max_tasks: int = 10,
+        max_workers: int = 4,
+        async_response_timeout: int = 20000,
+        lock_duration: int = 60000,
+        report_batch_size: int = 50,
+        use_priority: bool = True,
+    ):
+        self.client = client
+        self.worker_id = worker_id or f"camunda-mcp-{uuid.uuid4().hex[:8]}"
+        self.max_tasks = max_tasks
+        self.max_workers = max_workers
+        self.async_response_timeout = async_response_timeout
+        self.lock_duration = lock_duration
+        self.report_batch_size = report_batch_size
+        self.use_priority = use_priority
+
+        self.subscriptions: Dict[str, TopicSubscription] = {}
+        self.stats = WorkerStatistics()
+
+        self._locked: Dict[str, _LockedTask] = {}
+        self._lock = threading.Lock()
+        self._capacity = threading.Condition(self._lock)
+        self._reports: "queue.Queue[_Report]" = queue.Queue()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._reporter: Optional[ThreadPoolExecutor] = None
+
+    def subscribe(
+        self,
+        topic_name: str,
+        handler: Optional[ExternalTaskHandler] = None,
+        lock_duration: Optional[int] = None,
+        variables: Optional[List[str]] = None,
+        retries: int = 3,
+        retry_timeout: int = 10000,
+    ) -> Any:
+        """Register a handler for a topic; usable directly or as a decorator."""
+
+        def register(fn: ExternalTaskHandler) -> ExternalTaskHandler:
+            self.subscriptions[topic_name] = TopicSubscription(
+                topic_name=topic_name,
+                handler=fn,
+                lock_duration=lock_duration or self.lock_duration,
+                variables=variables,
+                retries=retries,
+                retry_timeout=retry_timeout,
+            )
+            return fn
+
+        if handler is not None:
+            return register(handler)
+        return register
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads) and not self._stopping.is_set()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._locked)
+
+    def start(self) -> None:
+        """Start fetching and executing tasks in background threads."""
+        if not self.subscriptions:
+            raise ValueError("No topic subscriptions registered")
+        if self.running:
+            return
+
+        self._stopping.clear()
+        self.stats = WorkerStatistics()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="external-task"
+        )
+        self._reporter = ThreadPoolExecutor(
+            max_workers=max(2, self.max_workers // 2),
+            thread_name_prefix="external-task-report",
+        )
+        self._threads = [
+            threading.Thread(target=target, name=name, daemon=True)
+            for target, name in (
+                (self._poll_loop, "external-task-poll"),
+                (self._report_loop, "external-task-reporter"),
+                (self._lock_extension_loop, "external-task-locks"),
+            )
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        ExternalTaskWorker._running.add(self)
+        logger.info(
+            "External task worker %s started for topics %s",
+            self.worker_id,
+            ", ".join(self.subscriptions),
+        )
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Stop fetching, finish running handlers and flush pending reports."""
+        if not self._threads:
+            return
+
+        self._stopping.set()
+        with self._capacity:
+            self._capacity.notify_all()
+
+        # A pending long poll can outlast the timeout by asyncResponseTimeout;
+        # tasks it still returns are unlocked instead of executed
+        poller, *others = self._threads
+        poller.join(timeout + self.async_response_timeout / 1000)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for thread in others:
+            thread.join(timeout)
+        if self._reporter is not None:
+            self._reporter.shutdown(wait=True)
+
+        self._threads = []
+        ExternalTaskWorker._running.discard(self)
+        logger.info("External task worker %s stopped", self.worker_id)
+
+    @classmethod
+    def running_workers(cls) -> List["ExternalTaskWorker"]:
+        """Return all workers started in this process."""
+        return list(cls._running)
+
+    # Fetching
+
+    def _poll_loop(self) -> None:
+        topics = [s.to_fetch_topic() for s in self.subscriptions.values()]
+        # Allow one batch to queue up in the pool while another is executing
+        capacity = self.max_workers * 2
+
+        while not self._stopping.is_set():
+            with self._capacity:
+                while len(self._locked) >= capacity and not self._stopping.is_set():
+                    self._capacity.wait(1.0)
+                free = capacity - len(self._locked)
+            if self._stopping.is_set():
+                return
+
+            try:
+                tasks = self.client.fetch_and_lock(
+                    self.worker_id,
+                    topics,
+                    max_tasks=min(self.max_tasks, free),
+                    async_response_timeout=self.async_response_timeout,
+                    use_priority=self.use_priority,
+                )
+            except Exception as e:
+                logger.warning("fetchAndLock failed for %s: %s", self.worker_id, e)
+                self._stopping.wait(5.0)
+                continue
+
+            for task in tasks:
+                self._dispatch(task)
+
+    def _dispatch(self, task: ExternalTask) -> None:
+        subscription = self.subscriptions.get(task.topic_name)
+        if subscription is None:
+            logger.warning("No handler for external task topic %s", task.topic_name)
+            return
+
+        # Submitting under the lock keeps stop() from shutting the pool down in
+        # between, and the report of the task cannot be sent before it is
+        # registered
+        with self._lock:
+            if self._submit(task, subscription):
+                self._locked[task.id] = _LockedTask(
+                    task=task,
+                    lock_duration=subscription.lock_duration,
+                    expires_at=time.monotonic() + subscription.lock_duration / 1000,
+                )
+                self.stats.fetched += 1
+                self.stats.per_topic[task.topic_name] = (
+                    self.stats.per_topic.get(task.topic_name, 0) + 1
+                )
+                return
+
+        # Hand tasks fetched while stopping back to the engine right away
+        try:
+            self.client.unlock_external_task(task.id)
+        except Exception as e:
+            logger.warning("Unlocking external task %s failed: %s", task.id, e)
+
+    def _submit(self, task: ExternalTask, subscription: TopicSubscription) -> bool:
+        """Hand a task to the pool unless the worker is stopping."""
+        if self._executor is None or self._stopping.is_set():
+            return False
+        try:
+            self._executor.submit(self._execute, task, subscription)
+        except RuntimeError:
+            # The pool was shut down
+            return False
+        return True
+
+    def _execute(self, task: ExternalTask, subscription: TopicSubscription) -> None:
+        try:
+            variables = subscription.handler(task)
+            self._reports.put(_Report(task, subscription, variables=variables))
+        except Exception as e:
+            self._reports.put(
+                _Report(
+                    task,
+                    subscription,
+                    error=e,
+                    error_details=traceback.format_exc(),
+                )
+            )
+
+    # Reporting
+
+    def _report_loop(self) -> None:
+        while not (self._stopping.is_set() and self._drained()):
+            batch = self._next_batch()
+            if not batch or self._reporter is None:
+                continue
+            futures = [self._reporter.submit(self._send, report) for report in batch]
+            wait(futures)
+
+    def _drained(self) -> bool:
+        with self._lock:
+            return not self._locked and self._reports.empty()
+
+    def _next_batch(self) -> List[_Report]:
+        """Collect up to ``report_batch_size`` reports, briefly coalescing."""
+        try:
+            batch = [self._reports.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + 0.05
+        while len(batch) < self.report_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._reports.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _send(self, report: _Report) -> None:
+        task, subscription = report.task, report.subscription
+        try:
+            if report.error is None:
+                self.client.complete_external_task(
+                    task.id, self.worker_id, report.variables
+                )
+                self._count("completed")
+            elif isinstance(report.error, ExternalTaskBpmnError):
+                self.client.handle_external_task_bpmn_error(
+                    task.id,
+                    self.worker_id,
+                    report.error.error_code,
+                    report.error.message,
+                )
+                self._count("bpmn_errors")
+            else:
+                retries = (
+                    task.retries if task.retries is not None else subscription.retries
+                )
+                self.client.handle_external_task_failure(
+                    task.id,
+                    self.worker_id,
+                    error_message=str(report.error) or type(report.error).__name__,
+                    error_details=report.error_details,
+                    retries=max(0, retries - 1),
+                    retry_timeout=subscription.retry_timeout,
+                )
+                self._count("failed")
+        except Exception as e:
+            logger.error("Reporting external task %s failed: %s", task.id, e)
+            self._count("report_errors")
+        finally:
+            with self._capacity:
+                self._locked.pop(task.id, None)
+                self._capacity.notify()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    # Lock extension
+
+    def _lock_extension_loop(self) -> None:
+        while not (self._stopping.is_set() and self._drained()):
+            for task_id, lock_duration in self._expiring_locks():
+                self._extend_lock(task_id, lock_duration)
+            if self._stopping.is_set():
+                time.sleep(0.2)
+            else:
+                self._stopping.wait(1.0)
+
+    def _extend_lock(self, task_id: str, lock_duration: int) -> None:
+        try:
+            self.client.extend_external_task_lock(
+                task_id, self.worker_id, lock_duration
+            )
+        except Exception as e:
+            logger.warning("Extending lock of %s failed: %s", task_id, e)
+            return
+
+        with self._lock:
+            locked = self._locked.get(task_id)
+            if locked is not None:
+                locked.expires_at = time.monotonic() + lock_duration / 1000
+            self.stats.lock_extensions += 1
+
+    def _expiring_locks(self) -> List[Tuple[str, int]]:
+        """Tasks whose lock expires within a third of their lock duration."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (task_id, locked.lock_duration)
+                for task_id, locked in self._locked.items()
+                if locked.expires_at - now < locked.lock_duration / 3000
+            ]
+
+    def statistics(self) -> Dict[str, Any]:
+        """Return a snapshot of the worker counters."""
+        with self._lock:
+            return {
+                "worker_id": self.worker_id,
+                "topics": sorted(self.subscriptions),
+                "running": self.running,
+                "in_flight": len(self._locked),
+                "fetched": self.stats.fetched,
+                "completed": self.stats.completed,
+                "failed": self.stats.failed,
+                "bpmn_errors": self.stats.bpmn_errors,
+                "report_errors": self.stats.report_errors,
+                "lock_extensions": self.stats.lock_extensions,
+                "throughput_per_minute": round(self.stats.throughput, 1),
+                "per_topic": dict(self.stats.per_topic),
+            }
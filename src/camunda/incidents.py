@@ -0,0 +1,140 @@
+"""
+Incident triage
+
+Groups incidents by process definition, activity and error message, so that
+thousands of incidents caused by the same failure collapse into one entry.
+Messages are normalized before grouping: ids, numbers and quoted values that
+differ from incident to incident are replaced by placeholders.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Longest normalized message kept as group key
+MESSAGE_LENGTH = 200
+
+_NORMALIZERS = [
+    (
+        re.compile(
+            r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+            r"[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
+        ),
+        "<id>",
+    ),
+    (re.compile(r"'[^']*'"), "'<value>'"),
+    (re.compile(r'"[^"]*"'), '"<value>"'),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<hex>"),
+    (re.compile(r"\d+"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_message(message: Optional[str]) -> str:
+    """Reduce an incident message to the part shared by the same failure."""
+    if not message:
+        return "(no message)"
+    # Only the first line, the rest is usually a nested cause or stack trace
+    lines = message.strip().splitlines()
+    normalized = lines[0] if lines else ""
+    for pattern, placeholder in _NORMALIZERS:
+        normalized = pattern.sub(placeholder, normalized)
+    return normalized.strip()[:MESSAGE_LENGTH] or "(no message)"
+
+
+def trim_stacktrace(stacktrace: str, lines: int = 20) -> str:
+    """Keep the first lines of a stack trace."""
+    all_lines = stacktrace.strip().splitlines()
+    if len(all_lines) <= lines:
+        return "\n".join(all_lines)
+    return "\n".join(all_lines[:lines] + [f"... {len(all_lines) - lines} more lines"])
+
+
+@dataclass
+class IncidentGroup:
+    """Incidents with the same definition, activity and normalized message."""
+
+    process_definition_id: Optional[str]
+    activity_id: Optional[str]
+    message: str
+    incident_type: Optional[str]
+    example_message: Optional[str]
+    open: int = 0
+    resolved: int = 0
+    first_seen: Optional[str] = None
+    last_seen: Optional[str] = None
+    # Most recent incident, an open one if there is any
+    representative: Optional[Dict[str, Any]] = None
+    representative_rank: Tuple[bool, str] = field(default=(False, ""), repr=False)
+    stacktrace: Optional[str] = None
+
+    @property
+    def count(self) -> int:
+        return self.open + self.resolved
+
+
+class IncidentGrouper:
+    """Aggregates incident rows into groups one row at a time.
+
+    Accepts rows of both ``/incident`` and ``/history/incident``. Incidents
+    that were only propagated from a called process are skipped, so every
+    failure is counted once, at its root cause.
+    """
+
+    def __init__(self) -> None:
+        self.groups: Dict[Tuple[Optional[str], Optional[str], str], IncidentGroup] = {}
+        self.rows = 0
+
+    def add(self, row: Dict[str, Any], is_open: bool = True) -> None:
+        """Consume a single incident row."""
+        root_cause = row.get("rootCauseIncidentId")
+        if root_cause and root_cause != row.get("id"):
+            return
+
+        self.rows += 1
+        message = normalize_message(row.get("incidentMessage"))
+        key = (row.get("processDefinitionId"), row.get("activityId"), message)
+        group = self.groups.get(key)
+        if group is None:
+            group = IncidentGroup(
+                process_definition_id=key[0],
+                activity_id=key[1],
+                message=message,
+                incident_type=row.get("incidentType"),
+                example_message=row.get("incidentMessage"),
+            )
+            self.groups[key] = group
+
+        if is_open:
+            group.open += 1
+        else:
+            group.resolved += 1
+
+        seen = row.get("incidentTimestamp") or row.get("createTime") or ""
+        if seen:
+            if group.first_seen is None or seen < group.first_seen:
+                group.first_seen = seen
+            if group.last_seen is None or seen > group.last_seen:
+                group.last_seen = seen
+
+        # The latest open incident, or the latest resolved one if none is open
+        rank = (is_open, seen)
+        if group.representative is None or rank >= group.representative_rank:
+            group.representative = row
+            group.representative_rank = rank
+
+    def consume(
+        self, rows: Iterable[Dict[str, Any]], is_open: bool = True
+    ) -> "IncidentGrouper":
+        """Consume all rows of an iterable."""
+        for row in rows:
+            self.add(row, is_open)
+        return self
+
+    def ranking(self) -> List[IncidentGroup]:
+        """Return groups with the most incidents first."""
+        return sorted(
+            self.groups.values(),
+            key=lambda group: (group.open, group.count),
+            reverse=True,
+        )
@@ -4,9 +4,76 @@ Data models for Camunda entities
 Defines dataclasses for Camunda REST API responses.
 """
 
+import json
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import (
+    Callable,
+    Dict,
+    Any,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+
+
+def format_camunda_date(value: Union[str, datetime]) -> str:
+    """Format a date for Camunda REST query parameters.
+
+    Accepts datetimes or ISO 8601 strings (date only or full timestamp);
+    naive values are interpreted as UTC.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + (
+        f"{value.microsecond // 1000:03d}" + value.strftime("%z")
+    )
+
+
+def typed_variable(value: Any) -> Dict[str, Any]:
+    """Wrap a value as a Camunda variable, with its type inferred.
+
+    Typed numbers and booleans let decision tables and expressions compare
+    them as such instead of as strings.
+    """
+    if value is None:
+        return {"value": None, "type": "Null"}
+    if isinstance(value, bool):
+        return {"value": value, "type": "Boolean"}
+    if isinstance(value, int):
+        fits_integer = -(2**31) <= value < 2**31
+        return {"value": value, "type": "Integer" if fits_integer else "Long"}
+    if isinstance(value, float):
+        return {"value": value, "type": "Double"}
+    if isinstance(value, (dict, list)):
+        return {"value": json.dumps(value), "type": "Json"}
+    return {"value": str(value), "type": "String"}
+
+
+class EntityStream(Generic[T]):
+    """Sized iterable that builds models from API rows only while iterating.
+
+    Lets list tools render large results without holding every model at once.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], factory: Callable[[Any], T]):
+        self._rows = rows
+        self._factory = factory
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[T]:
+        factory = self._factory
+        for row in self._rows:
+            yield factory(row)
 
 
 @dataclass
@@ -173,3 +240,60 @@ class Comment:
 
         # Remove None values
         return {k: v for k, v in result.items() if v is not None}
+
+
+@dataclass
+class ExternalTask:
+    """Represents a locked Camunda external task."""
+
+    id: str
+    topic_name: str
+    worker_id: Optional[str]
+    activity_id: Optional[str]
+    process_instance_id: Optional[str]
+    process_definition_key: Optional[str]
+    business_key: Optional[str]
+    retries: Optional[int]
+    priority: int
+    variables: Dict[str, Any]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExternalTask":
+        """Create ExternalTask from a fetchAndLock response entry."""
+
+        # Flatten typed variables ({"value": ..., "type": ...}) to their values
+        variables = {
+            name: variable.get("value")
+            for name, variable in (data.get("variables") or {}).items()
+        }
+
+        return cls(
+            id=data["id"],
+            topic_name=data["topicName"],
+            worker_id=data.get("workerId"),
+            activity_id=data.get("activityId"),
+            process_instance_id=data.get("processInstanceId"),
+            process_definition_key=data.get("processDefinitionKey"),
+            business_key=data.get("businessKey"),
+            retries=data.get("retries"),
+            priority=data.get("priority", 0),
+            variables=variables,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert ExternalTask to dictionary."""
+        result = {
+            "id": self.id,
+            "topicName": self.topic_name,
+            "workerId": self.worker_id,
+            "activityId": self.activity_id,
+            "processInstanceId": self.process_instance_id,
+            "processDefinitionKey": self.process_definition_key,
+            "businessKey": self.business_key,
+            "retries": self.retries,
+            "priority": self.priority,
+            "variables": self.variables,
+        }
+
+        # Remove None values
+        return {k: v for k, v in result.items() if v is not None}
@@ -0,0 +1,157 @@
+"""
+Engine node selection
+
+Camunda clusters run several REST nodes on one shared database. The node pool
+spreads requests over the nodes weighted by observed latency, ejects nodes
+that keep failing, and tracks the latency percentile used to hedge reads.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the latency moving average
+LATENCY_SMOOTHING = 0.2
+# Recent request latencies the hedge delay percentile is computed from
+LATENCY_WINDOW = 256
+# Samples needed before reads are hedged
+MIN_HEDGE_SAMPLES = 20
+HEDGE_PERCENTILE = 0.95
+
+
+class EngineNode:
+    """A single Camunda REST node and its observed health."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: Optional[float] = None  # moving average in seconds
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    def stats(self) -> Dict[str, object]:
+        """Return health counters for this node."""
+        return {
+            "available": self.available,
+            "latency_ms": (
+                round(self.latency * 1000, 1) if self.latency is not None else None
+            ),
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+        }
+
+
+class NodePool:
+    """Health- and latency-weighted selection over engine nodes."""
+
+    def __init__(
+        self, urls: List[str], eject_after: int = 3, eject_seconds: float = 30.0
+    ):
+        if not urls:
+            raise ValueError("At least one Camunda URL is required")
+        self.nodes = [EngineNode(url) for url in urls]
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self.hedged = 0
+        self.hedges_won = 0
+
+    def select(self, exclude: Optional[EngineNode] = None) -> Optional[EngineNode]:
+        """Pick a node, preferring fast ones; None if no other node exists.
+
+        Ejected nodes are skipped until their ejection ends. If every node is
+        ejected, the one that is due back first is used rather than failing.
+        """
+        candidates = [node for node in self.nodes if node is not exclude]
+        if not candidates:
+            return None
+
+        with self._lock:
+            available = [node for node in candidates if node.available]
+            if not available:
+                return min(candidates, key=lambda node: node.ejected_until)
+            if len(available) == 1:
+                return available[0]
+
+            # Nodes without samples yet are tried as if they were the fastest
+            known = [node.latency for node in available if node.latency is not None]
+            fastest = min(known) if known else 1.0
+            weights = [
+                1.0 / max(node.latency if node.latency is not None else fastest, 1e-3)
+                for node in available
+            ]
+        return random.choices(available, weights)[0]
+
+    def record_success(self, node: EngineNode, seconds: float) -> None:
+        """Record a completed request and reinstate the node if it was ejected."""
+        with self._lock:
+            node.requests += 1
+            node.consecutive_failures = 0
+            node.ejected_until = 0.0
+            if node.latency is None:
+                node.latency = seconds
+            else:
+                node.latency += LATENCY_SMOOTHING * (seconds - node.latency)
+            self._latencies.append(seconds)
+
+    def record_failure(self, node: EngineNode) -> None:
+        """Record a failed request and eject the node after repeated failures."""
+        with self._lock:
+            node.requests += 1
+            node.failures += 1
+            node.consecutive_failures += 1
+            if node.consecutive_failures < self.eject_after or not node.available:
+                return
+            node.ejected_until = time.monotonic() + self.eject_seconds
+            node.ejections += 1
+            # After the ejection ends, a single failure ejects the node again
+            node.consecutive_failures = self.eject_after - 1
+
+        if len(self.nodes) > 1:
+            logger.warning(
+                "Ejected Camunda node %s for %gs after %s consecutive failures",
+                node.url,
+                self.eject_seconds,
+                self.eject_after,
+            )
+
+    def hedge_delay(self) -> Optional[float]:
+        """Latency after which a read is sent to a second node.
+
+        Returns None while there are too few samples to estimate it.
+        """
+        with self._lock:
+            if len(self._latencies) < MIN_HEDGE_SAMPLES:
+                return None
+            samples = sorted(self._latencies)
+        return samples[min(len(samples) - 1, int(len(samples) * HEDGE_PERCENTILE))]
+
+    def record_hedge(self, won: bool) -> None:
+        """Count a hedged read and whether the second request answered first."""
+        with self._lock:
+            self.hedged += 1
+            if won:
+                self.hedges_won += 1
+
+    def stats(self) -> Dict[str, object]:
+        """Return per-node health and hedging counters."""
+        delay = self.hedge_delay()
+        return {
+            "nodes": {node.url: node.stats() for node in self.nodes},
+            "hedge_delay_ms": round(delay * 1000, 1) if delay is not None else None,
+            "hedged": self.hedged,
+            "hedges_won": self.hedges_won,
+        }
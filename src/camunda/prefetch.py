@@ -0,0 +1,98 @@
+"""
+Speculative prefetching
+
+Runs likely follow-up requests in the background on a small thread pool, so
+their results are already cached when they are asked for. Prefetches yield to
+real work: queued ones are dropped while the engine is under pressure.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """Bounded background executor for speculative jobs."""
+
+    def __init__(
+        self,
+        workers: int,
+        under_pressure: Callable[[], bool],
+        max_pending: int = 64,
+    ):
+        self.workers = workers
+        self.under_pressure = under_pressure
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        # Bumped on shutdown, so jobs queued before it are dropped
+        self._epoch = 0
+        self.scheduled = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def submit(self, key: Hashable, job: Callable[[], None]) -> bool:
+        """Schedule a job unless one with the same key is pending.
+
+        Returns False if the job was not scheduled.
+        """
+        if not self.enabled:
+            return False
+        with self._lock:
+            if key in self._pending or len(self._pending) >= self.max_pending:
+                return False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="camunda-prefetch"
+                )
+            self._pending.add(key)
+            self.scheduled += 1
+            self._executor.submit(self._run, key, job, self._epoch)
+        return True
+
+    def _run(self, key: Hashable, job: Callable[[], None], epoch: int) -> None:
+        try:
+            if epoch != self._epoch or self.under_pressure():
+                with self._lock:
+                    self.cancelled += 1
+                return
+            job()
+            with self._lock:
+                self.completed += 1
+        except Exception as e:
+            logger.debug("Prefetch %s failed: %s", key, e, extra={"sample_every": 10})
+            with self._lock:
+                self.failed += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def shutdown(self) -> None:
+        """Drop queued jobs and stop the worker threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._epoch += 1
+            self._pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return scheduling counters."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": len(self._pending),
+                "scheduled": self.scheduled,
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+                "failed": self.failed,
+            }
@@ -0,0 +1,221 @@
+"""
+Tool call profiling
+
+Profiles selected tool calls with cProfile and tracemalloc without a
+redeploy. Profiling is switched on per tool, either for all calls through the
+environment or for the next few calls on demand. Each profiled call writes a
+pstats file (and its top allocation sites) to a directory that is rotated.
+"""
+
+import cProfile
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Allocation sites written next to each profile
+TOP_ALLOCATIONS = 20
+
+
+@dataclass
+class ProfileRecord:
+    """Summary of one profiled tool call."""
+
+    tool: str
+    arguments_hash: str
+    started: str
+    duration_ms: float
+    memory_peak_kb: float
+    path: Optional[str]
+
+
+class ToolProfiler:
+    """Wraps tool calls in cProfile and tracemalloc when enabled for the tool."""
+
+    def __init__(
+        self,
+        directory: str,
+        tools: Optional[Set[str]] = None,
+        profile_all: bool = False,
+        keep: int = 50,
+        history: int = 100,
+    ):
+        self.directory = directory
+        self.tools: Set[str] = set(tools or ())
+        self.profile_all = profile_all
+        self.keep = keep
+        self._armed: Dict[str, int] = {}
+        self._records: Deque[ProfileRecord] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        # Held while a call is profiled
+        self._active = threading.Lock()
+
+    @classmethod
+    def from_environment(cls) -> "ToolProfiler":
+        """Read ``MCP_PROFILE`` (tool names or ``all``), ``_DIR`` and ``_KEEP``."""
+        names = {
+            name.strip()
+            for name in os.getenv("MCP_PROFILE", "").split(",")
+            if name.strip()
+        }
+        return cls(
+            directory=os.getenv("MCP_PROFILE_DIR", "profiles"),
+            tools=names - {"all"},
+            profile_all="all" in names,
+            keep=int(os.getenv("MCP_PROFILE_KEEP", "50")),
+        )
+
+    def arm(self, tool: str, calls: int = 1) -> None:
+        """Profile the next ``calls`` calls of ``tool``."""
+        with self._lock:
+            self._armed[tool] = self._armed.get(tool, 0) + calls
+
+    def _should_profile(self, tool: str) -> bool:
+        if self.profile_all or tool in self.tools:
+            return True
+        if not self._armed:
+            return False
+        with self._lock:
+            remaining = self._armed.get(tool, 0)
+            if remaining <= 0:
+                return False
+            if remaining == 1:
+                del self._armed[tool]
+            else:
+                self._armed[tool] = remaining - 1
+            return True
+
+    @contextmanager
+    def profile(self, tool: str, arguments: Dict[str, Any]) -> Iterator[None]:
+        """Profile the enclosed block if profiling is enabled for ``tool``.
+
+        One call is profiled at a time: Python 3.12 allows a single active
+        profiler per process, so calls overlapping a profiled call run
+        unprofiled. tracemalloc traces the whole process, so the memory peak
+        includes allocations of those overlapping calls.
+        """
+        if not self._should_profile(tool):
+            yield
+            return
+
+        if not self._active.acquire(blocking=False):
+            logger.debug("Not profiling %s, another call is being profiled", tool)
+            if not (self.profile_all or tool in self.tools):
+                # Keep the armed call for a later invocation
+                self.arm(tool)
+            yield
+            return
+
+        try:
+            # Leave tracing alone if someone else started it
+            owns_trace = not tracemalloc.is_tracing()
+            if owns_trace:
+                tracemalloc.start()
+            baseline, _ = tracemalloc.get_traced_memory()
+
+            profiler = cProfile.Profile()
+            started = datetime.now(timezone.utc)
+            start = time.perf_counter()
+            try:
+                profiler.enable()
+            except ValueError as e:
+                # Another profiling tool, e.g. a debugger, owns the profiler hook
+                logger.warning("Could not profile %s: %s", tool, e)
+                if owns_trace:
+                    tracemalloc.stop()
+                yield
+                return
+
+            try:
+                yield
+            finally:
+                profiler.disable()
+                duration = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                if owns_trace:
+                    tracemalloc.stop()
+
+                record = ProfileRecord(
+                    tool=tool,
+                    arguments_hash=_arguments_hash(arguments),
+                    started=started.isoformat(timespec="milliseconds"),
+                    duration_ms=round(duration * 1000, 1),
+                    memory_peak_kb=round(max(0, peak - baseline) / 1024, 1),
+                    path=None,
+                )
+                try:
+                    record.path = self._write(record, profiler, snapshot)
+                except OSError as e:
+                    logger.error("Could not write profile of %s: %s", tool, e)
+                with self._lock:
+                    self._records.append(record)
+        finally:
+            self._active.release()
+
+    def _write(
+        self,
+        record: ProfileRecord,
+        profiler: cProfile.Profile,
+        snapshot: tracemalloc.Snapshot,
+    ) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        # Timestamped names sort by age, which rotation relies on
+        stamp = datetime.fromisoformat(record.started).strftime("%Y%m%dT%H%M%S%f")
+        base = os.path.join(
+            self.directory, f"{stamp}-{record.tool}-{record.arguments_hash}"
+        )
+
+        profiler.dump_stats(f"{base}.prof")
+        with open(f"{base}.mem.txt", "w") as f:
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+
+        self._rotate()
+        return f"{base}.prof"
+
+    def _rotate(self) -> None:
+        """Delete the oldest profiles beyond ``keep``."""
+        profiles = sorted(
+            name for name in os.listdir(self.directory) if name.endswith(".prof")
+        )
+        for name in profiles[: max(0, len(profiles) - self.keep)]:
+            base = os.path.join(self.directory, name[: -len(".prof")])
+            for suffix in (".prof", ".mem.txt"):
+                try:
+                    os.remove(base + suffix)
+                except FileNotFoundError:
+                    pass
+
+    def slowest(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the slowest recent profiled calls, slowest first."""
+        with self._lock:
+            records = sorted(
+                self._records, key=lambda record: record.duration_ms, reverse=True
+            )
+        return [asdict(record) for record in records[:limit]]
+
+    def status(self) -> Dict[str, Any]:
+        """Return which tools are currently profiled."""
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "tools": "all" if self.profile_all else sorted(self.tools),
+                "armed": dict(self._armed),
+            }
+
+
+def _arguments_hash(arguments: Dict[str, Any]) -> str:
+    """Short hash identifying the arguments without exposing their values."""
+    encoded = json.dumps(arguments, sort_keys=True, default=str).encode()
+    return hashlib.sha1(encoded).hexdigest()[:12]
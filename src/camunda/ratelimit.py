@@ -0,0 +1,218 @@
+"""
+Client-side rate limiting
+
+Token bucket rate limits and in-flight limits per endpoint class, protecting
+the Camunda engine (and its database) from bursts of tool calls.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+import requests
+
+# Endpoint classes requests are admitted by
+QUERY = "query"
+WRITE = "write"
+HISTORY = "history"
+ENDPOINT_CLASSES = (QUERY, WRITE, HISTORY)
+# Long-polling requests are held open by the engine and are never limited
+LONG_POLL = "long-poll"
+
+
+class CamundaBusyError(requests.RequestException):
+    """Raised when a request cannot be admitted within the allowed wait time."""
+
+
+@dataclass
+class EndpointLimit:
+    """Limits for one endpoint class; ``None`` disables a limit."""
+
+    rate: Optional[float] = None  # requests per second
+    burst: Optional[int] = None  # bucket size, defaults to max(1, rate)
+    max_in_flight: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate is not None or self.max_in_flight is not None
+
+    @classmethod
+    def from_environment(cls, endpoint_class: str) -> "EndpointLimit":
+        """Read ``CAMUNDA_<CLASS>_RATE``, ``_BURST`` and ``_MAX_IN_FLIGHT``."""
+        prefix = f"CAMUNDA_{endpoint_class.upper()}"
+        rate = os.getenv(f"{prefix}_RATE")
+        burst = os.getenv(f"{prefix}_BURST")
+        max_in_flight = os.getenv(f"{prefix}_MAX_IN_FLIGHT")
+        return cls(
+            rate=float(rate) if rate else None,
+            burst=int(burst) if burst else None,
+            max_in_flight=int(max_in_flight) if max_in_flight else None,
+        )
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations with a wait time."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Reserve a token and return the seconds to wait before using it.
+
+        Returns None without reserving if the wait would exceed ``max_wait``.
+        Tokens may go negative, which queues later callers behind earlier ones.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def refund(self) -> None:
+        """Give back a reserved token whose request was not sent."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (negative when callers are queued)."""
+        with self._lock:
+            elapsed = time.monotonic() - self._updated
+            return min(self.capacity, self._tokens + elapsed * self.rate)
+
+
+class EndpointLimiter:
+    """Rate and concurrency admission for a single endpoint class."""
+
+    def __init__(self, name: str, limit: EndpointLimit):
+        self.name = name
+        self.limit = limit
+        self.bucket = (
+            TokenBucket(limit.rate, limit.burst or max(1, int(limit.rate)))
+            if limit.rate
+            else None
+        )
+        self._slots = (
+            threading.BoundedSemaphore(limit.max_in_flight)
+            if limit.max_in_flight
+            else None
+        )
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.queued_seconds = 0.0
+
+    @contextmanager
+    def admit(self, max_wait: float) -> Iterator[None]:
+        """Wait for a token and a free slot, or raise CamundaBusyError."""
+        started = time.monotonic()
+
+        if self.bucket is not None:
+            wait = self.bucket.reserve(max_wait)
+            if wait is None:
+                self._reject(f"rate limit reached, wait exceeds {max_wait:.1f}s")
+            elif wait > 0:
+                time.sleep(wait)
+
+        if self._slots is not None:
+            remaining = max(0.0, max_wait - (time.monotonic() - started))
+            if not self._slots.acquire(timeout=remaining):
+                if self.bucket is not None:
+                    # The request is not sent, so it must not use up the rate
+                    self.bucket.refund()
+                self._reject(
+                    f"{self.limit.max_in_flight} requests in flight, "
+                    f"no slot within {max_wait:.1f}s"
+                )
+
+        with self._lock:
+            self.in_flight += 1
+            self.admitted += 1
+            self.queued_seconds += time.monotonic() - started
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            if self._slots is not None:
+                self._slots.release()
+
+    def under_pressure(self) -> bool:
+        """True once half of the burst or of the in-flight slots is used."""
+        if self.bucket is not None and self.bucket.available < self.bucket.capacity / 2:
+            return True
+        max_in_flight = self.limit.max_in_flight
+        return max_in_flight is not None and self.in_flight >= max_in_flight / 2
+
+    def _reject(self, reason: str) -> None:
+        with self._lock:
+            self.rejected += 1
+        raise CamundaBusyError(f"Camunda {self.name} requests busy: {reason}")
+
+    def stats(self) -> Dict[str, float]:
+        """Return admission counters for this endpoint class."""
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "queued_seconds": round(self.queued_seconds, 3),
+            }
+
+
+class RequestAdmission:
+    """Routes requests to the limiter of their endpoint class."""
+
+    def __init__(self, limits: Dict[str, EndpointLimit]):
+        self.limiters = {
+            name: EndpointLimiter(name, limit)
+            for name, limit in limits.items()
+            if limit.enabled
+        }
+
+    @staticmethod
+    def classify(method: str, endpoint: str) -> str:
+        """Map a request to its endpoint class."""
+        path = endpoint.lstrip("/")
+        if path.startswith("history"):
+            return HISTORY
+        if path.endswith("fetchAndLock"):
+            return LONG_POLL
+        # Decision evaluation is a POST but changes nothing
+        if method.upper() == "GET" or path.endswith("/evaluate"):
+            return QUERY
+        return WRITE
+
+    @contextmanager
+    def admit(self, method: str, endpoint: str, max_wait: float) -> Iterator[None]:
+        """Admit a request, queueing at most ``max_wait`` seconds."""
+        limiter = self.limiters.get(self.classify(method, endpoint))
+        if limiter is None:
+            yield
+            return
+        with limiter.admit(max_wait):
+            yield
+
+    def under_pressure(self, endpoint_class: str) -> bool:
+        """Whether requests of ``endpoint_class`` are close to their limits."""
+        limiter = self.limiters.get(endpoint_class)
+        return limiter is not None and limiter.under_pressure()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return admission counters per endpoint class."""
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
@@ -0,0 +1,241 @@
+"""
+Task search index
+
+In-memory inverted index over the open tasks of the engine. Names, business
+keys, descriptions and comments are tokenized; queries are answered from the
+index without requests to Camunda and ranked with BM25.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .deadline import DeadlineExceeded, map_in_context
+from .models import Task
+
+if TYPE_CHECKING:
+    from .client import CamundaClient
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+")
+
+# A match in the name or business key counts more than one in the prose
+FIELD_WEIGHTS = {"name": 3.0, "business_key": 3.0, "description": 1.0, "comment": 1.0}
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Process instances looked up per request when resolving business keys
+BUSINESS_KEY_CHUNK = 100
+# Open tasks fetched per request during a rebuild
+TASK_PAGE_SIZE = 500
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+class TaskSearchIndex:
+    """Thread-safe inverted index from tokens to tasks."""
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._lengths: Dict[str, float] = {}
+        # Weighted term frequencies per task
+        self._terms: Dict[str, Dict[str, float]] = {}
+        self.tasks: Dict[str, Task] = {}
+        self.business_keys: Dict[str, str] = {}
+        self.built_at: Optional[float] = None
+        # Tasks of the last rebuild indexed without comments for lack of time
+        self.comments_missing = 0
+        # Whether the last rebuild ran out of time before all tasks were listed
+        self.partial = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last rebuild, None if never built."""
+        return None if self.built_at is None else time.monotonic() - self.built_at
+
+    def add_task(self, task: Task, business_key: Optional[str] = None) -> None:
+        """Index a task, replacing an earlier version of it."""
+        with self._lock:
+            self._remove(task.id)
+            self.tasks[task.id] = task
+            if business_key:
+                self.business_keys[task.id] = business_key
+            self._index(task.id, "name", task.name)
+            self._index(task.id, "business_key", business_key)
+            self._index(task.id, "description", task.description)
+
+    def add_comment(self, task_id: str, message: str) -> None:
+        """Index a comment of an already indexed task."""
+        with self._lock:
+            if task_id in self.tasks:
+                self._index(task_id, "comment", message)
+
+    def remove_task(self, task_id: str) -> None:
+        """Drop a task, e.g. after it was completed."""
+        with self._lock:
+            self._remove(task_id)
+
+    def _index(self, task_id: str, field: str, text: Optional[str]) -> None:
+        weight = FIELD_WEIGHTS[field]
+        tokens = tokenize(text)
+        terms = self._terms.setdefault(task_id, {})
+        for token in tokens:
+            terms[token] = terms.get(token, 0.0) + weight
+        self._lengths[task_id] = self._lengths.get(task_id, 0.0) + weight * len(tokens)
+        for token in set(tokens):
+            self._postings.setdefault(token, {})[task_id] = terms[token]
+
+    def _remove(self, task_id: str) -> None:
+        for token in self._terms.pop(task_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(task_id, None)
+                if not postings:
+                    del self._postings[token]
+        self._lengths.pop(task_id, None)
+        self.tasks.pop(task_id, None)
+        self.business_keys.pop(task_id, None)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Task, float]]:
+        """Return tasks containing every query token, best matches first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            postings: List[Dict[str, float]] = [
+                self._postings.get(token, {}) for token in tokens
+            ]
+            if not all(postings):
+                return []
+
+            count = len(self.tasks)
+            average_length = sum(self._lengths.values()) / max(1, count)
+            # Intersect starting with the rarest token
+            rarest = min(postings, key=len)
+            candidates = set(rarest)
+            for posting in postings:
+                candidates.intersection_update(posting)
+
+            scores: Dict[str, float] = {}
+            for posting in postings:
+                idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for task_id in candidates:
+                    frequency = posting[task_id]
+                    norm = BM25_K1 * (
+                        1 - BM25_B + BM25_B * self._lengths[task_id] / average_length
+                    )
+                    scores[task_id] = scores.get(task_id, 0.0) + idf * (
+                        frequency * (BM25_K1 + 1) / (frequency + norm)
+                    )
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            return [(self.tasks[task_id], score) for task_id, score in ranked[:limit]]
+
+    def rebuild(self, client: "CamundaClient", workers: int = 4) -> None:
+        """Re-index all open tasks, their business keys and comments.
+
+        Tasks are fetched in pages of ``TASK_PAGE_SIZE``; comments are
+        fetched per task, with at most ``workers`` concurrent requests. Tasks
+        whose comments cannot be loaded are indexed without comments.
+
+        Running out of time never discards the rebuild: if the deadline is
+        reached while tasks or business keys are listed, the tasks fetched so
+        far are indexed and the index is marked ``partial``; if it is reached
+        while comments are loaded, the remaining tasks are indexed without.
+        """
+        tasks: List[Task] = []
+        partial = False
+        try:
+            tasks.extend(_open_tasks(client))
+        except DeadlineExceeded:
+            partial = True
+        business_keys, complete = _business_keys(
+            client, {task.process_instance_id for task in tasks}
+        )
+        partial = partial or not complete
+        # Camunda has no bulk endpoint for comments, so they are one request each
+        comments = map_in_context(
+            lambda task: client.get_task_comments(task.id), tasks, workers
+        )
+
+        fresh = TaskSearchIndex()
+        missing = 0
+        for task, result in zip(tasks, comments):
+            fresh.add_task(task, business_keys.get(task.process_instance_id or ""))
+            if isinstance(result, DeadlineExceeded):
+                missing += 1
+            elif isinstance(result, Exception):
+                logger.warning("Comments of task %s not indexed: %s", task.id, result)
+            else:
+                for comment in result:
+                    fresh.add_comment(task.id, comment.message)
+        if partial:
+            logger.warning(
+                "Deadline reached, search index built from %s task(s) only",
+                len(tasks),
+            )
+        if missing:
+            logger.warning(
+                "Deadline reached, %s task(s) indexed without comments", missing
+            )
+
+        with self._lock:
+            self._postings = fresh._postings
+            self._lengths = fresh._lengths
+            self._terms = fresh._terms
+            self.tasks = fresh.tasks
+            self.business_keys = fresh.business_keys
+            self.comments_missing = missing
+            self.partial = partial
+            self.built_at = time.monotonic()
+        logger.info("Indexed %s task(s) for search", len(tasks))
+
+
+def _open_tasks(client: "CamundaClient") -> Iterator[Task]:
+    """Fetch all open tasks page by page, in a stable order."""
+    first_result = 0
+    while True:
+        page = client.get_tasks(
+            sortBy="id",
+            sortOrder="asc",
+            firstResult=first_result,
+            maxResults=TASK_PAGE_SIZE,
+        )
+        yield from page
+        if len(page) < TASK_PAGE_SIZE:
+            return
+        first_result += TASK_PAGE_SIZE
+
+
+def _business_keys(
+    client: "CamundaClient", process_instance_ids: Iterable[Optional[str]]
+) -> Tuple[Dict[str, str], bool]:
+    """Look up business keys of process instances in chunks.
+
+    Returns the keys and whether all chunks were looked up before the
+    deadline ran out.
+    """
+    ids = sorted(pid for pid in process_instance_ids if pid)
+    keys: Dict[str, str] = {}
+    for start in range(0, len(ids), BUSINESS_KEY_CHUNK):
+        chunk = ids[start : start + BUSINESS_KEY_CHUNK]
+        try:
+            instances = client.get_process_instances(processInstanceIds=",".join(chunk))
+        except DeadlineExceeded:
+            return keys, False
+        for instance in instances:
+            if instance.business_key:
+                keys[instance.id] = instance.business_key
+    return keys, True
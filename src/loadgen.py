@@ -0,0 +1,524 @@
+"""
+MCP load generator
+
+Drives the Camunda MCP server over the MCP protocol with concurrent tool
+calls and reports throughput, latency percentiles, error rates and the
+server's memory over time. By default it spawns the server over stdio
+against a local stand-in engine, so the whole MCP path is measured without a
+Camunda installation; ``--url`` connects to an already running HTTP server.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .camunda.analytics import DurationHistogram
+
+# Relative weights of the tool calls issued by default
+DEFAULT_MIX = {
+    "list_tasks": 4,
+    "get_task_details": 3,
+    "list_process_instances": 2,
+    "list_process_definitions": 1,
+    "search_tasks": 1,
+}
+
+_WORDS = ["invoice", "approve", "review", "contract", "payment", "order", "claim"]
+
+# Model served for every definition, so BPMN enrichment does real work
+_BPMN_XML = (
+    '<definitions xmlns="http://www.omg.org/spec/BPMN/20100524/MODEL">'
+    '<process id="{key}" name="{name}">'
+    '<startEvent id="start" name="Start"/>'
+    '<sequenceFlow id="flow1" sourceRef="start" targetRef="userTask"/>'
+    '<userTask id="userTask" name="Handle {name}"/>'
+    '<sequenceFlow id="flow2" sourceRef="userTask" targetRef="end"/>'
+    '<endEvent id="end" name="Done"/>'
+    "</process></definitions>"
+)
+
+
+class StandInEngine(ThreadingHTTPServer):
+    """Minimal Camunda REST API serving synthetic tasks and instances."""
+
+    daemon_threads = True
+
+    def __init__(self, tasks: int = 200, latency_ms: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _StandInHandler)
+        self.latency_ms = latency_ms
+        rng = random.Random(42)
+        self.definitions = [
+            {
+                "id": f"{word}:1:{index:04d}",
+                "key": word,
+                "name": word.title(),
+                "version": 1,
+                "deploymentId": "deployment-1",
+                "resource": f"{word}.bpmn",
+                "suspended": False,
+            }
+            for index, word in enumerate(_WORDS)
+        ]
+        self.instances = [
+            {
+                "id": f"pi-{i}",
+                "definitionId": self.definitions[i % len(_WORDS)]["id"],
+                "businessKey": f"BK-{i:05d}",
+                "ended": False,
+                "suspended": False,
+            }
+            for i in range(max(1, tasks // 2))
+        ]
+        self.tasks = [
+            {
+                "id": f"task-{i}",
+                "name": f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS)}",
+                "assignee": rng.choice([None, "demo", "john", "mary"]),
+                "created": "2024-01-01T10:00:00.000+0000",
+                "due": None,
+                "processInstanceId": self.instances[i % len(self.instances)]["id"],
+                "processDefinitionId": self.instances[i % len(self.instances)][
+                    "definitionId"
+                ],
+                "taskDefinitionKey": "userTask",
+                "description": " ".join(rng.choice(_WORDS) for _ in range(12)),
+                "priority": 50,
+                "suspended": False,
+            }
+            for i in range(tasks)
+        ]
+        self.tasks_by_id = {task["id"]: task for task in self.tasks}
+        self.definitions_by_id = {d["id"]: d for d in self.definitions}
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/engine-rest"
+
+    def start(self) -> None:
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def answer(self, method: str, path: str, query: Dict[str, List[str]]) -> Any:
+        """Build the response body for a request, None for 204."""
+        with self._requests_lock:
+            self.requests += 1
+        path = path[len("/engine-rest") :] if path.startswith("/engine-rest") else path
+        if method == "POST":
+            if re.fullmatch(r"/process-definition/key/[^/]+/start", path):
+                return self.instances[0]
+            if path.startswith("/task/"):
+                return None
+            return {}
+
+        first = int(query.get("firstResult", ["0"])[0])
+        size = int(query.get("maxResults", ["1000000"])[0])
+        if path == "/engine":
+            return [{"name": "default"}]
+        if path == "/task":
+            return self.tasks[first : first + size]
+        if path == "/task/count":
+            return {"count": len(self.tasks)}
+        match = re.fullmatch(r"/task/([^/]+)(/comment)?", path)
+        if match:
+            if match.group(2):
+                return []
+            return self.tasks_by_id.get(match.group(1), {})
+        if path == "/process-instance":
+            return self.instances[first : first + size]
+        if path == "/process-definition":
+            return self.definitions
+        match = re.fullmatch(r"/process-definition/([^/]+)/xml", path)
+        if match:
+            definition = self.definitions_by_id.get(match.group(1))
+            if definition is None:
+                return {}
+            xml = _BPMN_XML.format(key=definition["key"], name=definition["name"])
+            return {"id": definition["id"], "bpmn20Xml": xml}
+        return []
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    server: StandInEngine
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._handle("POST")
+
+    def _handle(self, method: str) -> None:
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        parts = urlsplit(self.path)
+        body = self.server.answer(method, parts.path, parse_qs(parts.query))
+        if body is None:
+            self.send_response(204)
+            self.end_headers()
+            return
+        encoded = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@dataclass
+class ToolStats:
+    """Latencies and errors of one tool, or of all tools together."""
+
+    latencies: DurationHistogram = field(default_factory=DurationHistogram)
+    errors: int = 0
+
+    def record(self, latency_ms: float, failed: bool) -> None:
+        self.latencies.add(latency_ms)
+        if failed:
+            self.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = self.latencies
+        return {
+            "calls": latencies.count,
+            "errors": self.errors,
+            "error_rate": self.errors / latencies.count if latencies.count else 0.0,
+            "p50_ms": round(latencies.quantile(0.5), 1),
+            "p95_ms": round(latencies.quantile(0.95), 1),
+            "p99_ms": round(latencies.quantile(0.99), 1),
+            "max_ms": round(latencies.max, 1),
+        }
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse ``tool=weight,tool=weight`` into a weighted tool mix."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name:
+            mix[name] = int(weight or 1)
+    if not mix:
+        raise ValueError("The tool mix is empty")
+    return mix
+
+
+def default_arguments(engine: Optional[StandInEngine]) -> Dict[str, Callable[[], Any]]:
+    """Argument factories for tools of the default mix."""
+    task_ids = [task["id"] for task in engine.tasks] if engine else ["task-0"]
+    return {
+        "get_task_details": lambda: {"task_id": random.choice(task_ids)},
+        "get_task_comments": lambda: {"task_id": random.choice(task_ids)},
+        "search_tasks": lambda: {"query": random.choice(_WORDS)},
+    }
+
+
+def read_rss(pid: Optional[int]) -> Optional[float]:
+    """Resident memory of a process in MB, None where /proc is unavailable."""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def find_server_pid() -> Optional[int]:
+    """Find the server process spawned by this process for stdio."""
+    try:
+        names = os.listdir("/proc")
+    except OSError:
+        return None
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # The command may contain spaces, the fields after it do not
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+            if parent != os.getpid():
+                continue
+            with open(f"/proc/{name}/cmdline", "rb") as f:
+                if b"src.server" in f.read():
+                    return int(name)
+        except (OSError, IndexError, ValueError):
+            continue
+    return None
+
+
+class LoadGenerator:
+    """Issues weighted concurrent tool calls over one MCP session."""
+
+    def __init__(
+        self,
+        session: Any,
+        mix: Dict[str, int],
+        arguments: Dict[str, Callable[[], Any]],
+        concurrency: int,
+        duration: float,
+        interval: float,
+        server_pid: Optional[int],
+        report: Callable[[str], None] = print,
+    ):
+        self.session = session
+        self.mix = mix
+        self.arguments = arguments
+        self.concurrency = concurrency
+        self.duration = duration
+        self.interval = interval
+        self.server_pid = server_pid
+        self.report = report
+        self.total = ToolStats()
+        self.per_tool: Dict[str, ToolStats] = {name: ToolStats() for name in mix}
+        self.window = ToolStats()
+        self.rss: List[Tuple[float, float]] = []
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the load for the configured duration and return the summary."""
+        started = time.monotonic()
+        stop_at = started + self.duration
+        workers = [
+            asyncio.ensure_future(self._worker(stop_at))
+            for _ in range(self.concurrency)
+        ]
+        sampler = asyncio.ensure_future(self._sample(started))
+        await asyncio.gather(*workers)
+        sampler.cancel()
+        elapsed = time.monotonic() - started
+        self._sample_rss(elapsed)
+        return self.summary(elapsed)
+
+    async def _worker(self, stop_at: float) -> None:
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        while time.monotonic() < stop_at:
+            name = random.choices(names, weights)[0]
+            factory = self.arguments.get(name)
+            started = time.perf_counter()
+            try:
+                result = await self.session.call_tool(
+                    name, factory() if factory else {}
+                )
+                text = "".join(
+                    getattr(content, "text", "") for content in result.content
+                )
+                # Tools report Camunda errors as text rather than MCP errors
+                failed = bool(result.isError) or text.startswith("Error")
+            except Exception:
+                failed = True
+            latency_ms = (time.perf_counter() - started) * 1000
+            for stats in (self.total, self.per_tool[name], self.window):
+                stats.record(latency_ms, failed)
+
+    async def _sample(self, started: float) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            elapsed = time.monotonic() - started
+            rss = self._sample_rss(elapsed)
+            window, self.window = self.window, ToolStats()
+            summary = window.summary()
+            self.report(
+                f"[{elapsed:5.0f}s] {summary['calls']} calls "
+                f"({summary['calls'] / self.interval:.1f}/s), "
+                f"p50 {summary['p50_ms']}ms p95 {summary['p95_ms']}ms "
+                f"p99 {summary['p99_ms']}ms, errors {summary['error_rate']:.1%}, "
+                f"RSS {f'{rss:.1f} MB' if rss is not None else 'n/a'}"
+            )
+
+    def _sample_rss(self, elapsed: float) -> Optional[float]:
+        rss = read_rss(self.server_pid)
+        if rss is not None:
+            self.rss.append((round(elapsed, 1), round(rss, 1)))
+        return rss
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        """Totals, per-tool statistics and the RSS samples of the run."""
+        total = self.total.summary()
+        return {
+            "seconds": round(elapsed, 1),
+            "concurrency": self.concurrency,
+            "throughput": round(total["calls"] / elapsed, 1) if elapsed else 0.0,
+            "total": total,
+            "tools": {name: stats.summary() for name, stats in self.per_tool.items()},
+            "rss_mb": self.rss,
+        }
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Render a run summary as a plain text table."""
+    total = summary["total"]
+    lines = [
+        f"{total['calls']} calls in {summary['seconds']}s with concurrency "
+        f"{summary['concurrency']}: {summary['throughput']} calls/s, "
+        f"errors {total['error_rate']:.1%}",
+        "",
+        f"{'tool':<28} {'calls':>7} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'max ms':>8}",
+    ]
+    for name, stats in sorted(summary["tools"].items()) + [("total", total)]:
+        lines.append(
+            f"{name:<28} {stats['calls']:>7} {stats['errors']:>7} "
+            f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8} "
+            f"{stats['max_ms']:>8}"
+        )
+    if summary["rss_mb"]:
+        values = [rss for _, rss in summary["rss_mb"]]
+        lines.append("")
+        lines.append(
+            f"Server RSS: start {values[0]} MB, peak {max(values)} MB, "
+            f"end {values[-1]} MB"
+        )
+    return "\n".join(lines)
+
+
+async def run_load(args: argparse.Namespace) -> Dict[str, Any]:
+    """Connect to the server and run the load described by ``args``."""
+    mix = parse_mix(args.mix)
+    engine = None
+    if args.url is None and not args.engine_url:
+        engine = StandInEngine(args.tasks, args.engine_latency)
+        engine.start()
+
+    try:
+        with contextlib.ExitStack() as stack:
+            return await _run_session(args, mix, engine, stack)
+    finally:
+        if engine is not None:
+            engine.stop()
+
+
+async def _run_session(
+    args: argparse.Namespace,
+    mix: Dict[str, int],
+    engine: Optional[StandInEngine],
+    stack: contextlib.ExitStack,
+) -> Dict[str, Any]:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+    from mcp.client.streamable_http import streamablehttp_client
+
+    if args.url:
+        transport: Any = streamablehttp_client(args.url)
+    else:
+        env = {
+            **os.environ,
+            "CAMUNDA_URL": args.engine_url or (engine.url if engine else ""),
+            "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+        }
+        env.update(dict(item.split("=", 1) for item in args.env))
+        transport = stdio_client(
+            StdioServerParameters(
+                command=sys.executable,
+                args=["-m", "src.server"],
+                env=env,
+                cwd=args.cwd,
+            ),
+            errlog=(
+                sys.stderr
+                if args.server_log
+                else stack.enter_context(open(os.devnull, "w"))
+            ),
+        )
+
+    async with transport as streams:
+        async with ClientSession(streams[0], streams[1]) as session:
+            await session.initialize()
+            tools = {tool.name for tool in (await session.list_tools()).tools}
+            unknown = sorted(set(mix) - tools)
+            if unknown:
+                raise ValueError(f"Unknown tools in mix: {', '.join(unknown)}")
+
+            generator = LoadGenerator(
+                session,
+                mix,
+                default_arguments(engine),
+                concurrency=args.concurrency,
+                duration=args.duration,
+                interval=args.interval,
+                server_pid=args.pid if args.url else find_server_pid(),
+                report=(lambda line: None) if args.json else print,
+            )
+            return await generator.run()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options of the load generator."""
+    parser = argparse.ArgumentParser(
+        prog="camunda-mcp-loadgen",
+        description="Generate MCP tool call load against the Camunda MCP server.",
+    )
+    parser.add_argument(
+        "--mix",
+        default=",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()),
+        help="weighted tool mix, e.g. list_tasks=4,get_task_details=1",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument(
+        "--interval", type=float, default=5.0, help="seconds between reports"
+    )
+    parser.add_argument(
+        "--url", help="streamable HTTP endpoint of a running server instead of stdio"
+    )
+    parser.add_argument("--pid", type=int, help="server process to sample RSS of")
+    parser.add_argument(
+        "--engine-url", help="Camunda REST URL instead of the stand-in engine"
+    )
+    parser.add_argument(
+        "--tasks", type=int, default=200, help="tasks in the stand-in engine"
+    )
+    parser.add_argument(
+        "--engine-latency",
+        type=float,
+        default=0.0,
+        help="added latency of the stand-in engine in ms",
+    )
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="environment variable for the spawned server",
+    )
+    parser.add_argument("--cwd", default=os.getcwd(), help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--server-log", action="store_true", help="show the server's stderr"
+    )
+    parser.add_argument("--json", action="store_true", help="print a JSON summary")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the load generator and print its summary."""
+    args = build_parser().parse_args(argv)
+
+    try:
+        summary = asyncio.run(run_load(args))
+    except KeyboardInterrupt:
+        sys.exit(130)
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Logging configuration
+
+Log records are put on a queue by the calling thread and written to stderr by
+a background listener, so tool calls never block on a slow log destination.
+Records are written as JSON lines by default. High-volume debug events are
+sampled: only every n-th record of the same message template is kept.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime"}
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only every n-th debug record of the same message template.
+
+    The rate is ``sample_every`` passed via ``extra`` on the logging call, or
+    ``default_every`` for debug records without one. Kept records carry the
+    rate in ``sample_every`` so counts can be scaled back up.
+    """
+
+    def __init__(self, default_every: int = 1):
+        super().__init__()
+        self.default_every = default_every
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        every = getattr(record, "sample_every", None)
+        if every is None:
+            if record.levelno > logging.DEBUG:
+                return True
+            every = self.default_every
+        if every <= 1:
+            return True
+
+        key = (record.name, str(record.msg))
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        record.sample_every = every
+        return count % every == 0
+
+
+class _QueueHandler(QueueHandler):
+    """Queue handler that keeps the traceback apart from the message."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only render the message here, the listener's formatter does the rest
+        record = logging.makeLogRecord(record.__dict__)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(
+    level: Optional[str] = None, log_format: Optional[str] = None
+) -> None:
+    """Route all logging through a queue to stderr.
+
+    Args:
+        level: Log level name, defaults to ``LOG_LEVEL`` (INFO)
+        log_format: ``json`` or ``text``, defaults to ``LOG_FORMAT`` (json)
+    """
+    global _listener
+
+    resolved_level = (level or os.getenv("LOG_LEVEL") or "INFO").upper()
+    resolved_format = (log_format or os.getenv("LOG_FORMAT") or "json").lower()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        JsonFormatter() if resolved_format == "json" else logging.Formatter(TEXT_FORMAT)
+    )
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(
+        SamplingFilter(int(os.getenv("LOG_DEBUG_SAMPLE_EVERY", "1")))
+    )
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(resolved_level)
+
+    if _listener is None:
+        atexit.register(stop_logging)
+    else:
+        _listener.stop()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -6,41 +6,386 @@ This server provides Model Context Protocol tools for interacting
 with Camunda workflow engine.
 """
 
+import argparse
+import contextlib
+import contextvars
+import functools
+import inspect
+import io
+import itertools
+import json
 import logging
-from typing import Optional, Dict, Any
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Optional,
+    Dict,
+    Any,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    TypeVar,
+)
 
+import anyio
 from mcp.server.fastmcp import FastMCP
 
-try:
-    from .camunda.client import CamundaClient
-except ImportError:
-    # When running as a script, relative imports don't work
-    import sys
-    import os
-
-    # Add the src directory to path
-    src_dir = os.path.dirname(os.path.abspath(__file__))
-    if src_dir not in sys.path:
-        sys.path.insert(0, src_dir)
-    from camunda.client import CamundaClient
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+from .camunda.analytics import (
+    BottleneckAnalyzer,
+    TaskDurationSketches,
+    format_duration,
 )
+from .camunda.bpmn import BpmnModelIndex
+from .camunda.cache import ResultCache
+from .camunda.incidents import IncidentGrouper, trim_stacktrace
+from .camunda.prefetch import Prefetcher
+from .camunda.profiling import ToolProfiler
+from .camunda.search import TaskSearchIndex
+from .logging_config import configure_logging
+from .camunda.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    activate_deadline,
+    current_deadline,
+    deadline,
+    deadline_statistics,
+    map_in_context,
+    record_exceeded,
+)
+
+if TYPE_CHECKING:
+    from mcp.server.transport_security import TransportSecuritySettings
+
+    from .camunda.client import CamundaClient
+    from .camunda.models import ProcessInstance, Task
+
 logger = logging.getLogger("camunda-mcp-server")
 
 # Create MCP server
 mcp = FastMCP("camunda-mcp-server")
 
-# Initialize Camunda client
-camunda_client = CamundaClient()
+# The Camunda client (and with it ``requests``) is created on first use, so
+# importing this module only registers tools and opens no network sessions.
+_camunda_client: Optional["CamundaClient"] = None
+_camunda_client_lock = threading.Lock()
+
+
+def get_client() -> "CamundaClient":
+    """Get the shared Camunda client, creating it on first use."""
+    global _camunda_client
+    if _camunda_client is None:
+        with _camunda_client_lock:
+            if _camunda_client is None:
+                from .camunda.client import CamundaClient
+
+                _camunda_client = CamundaClient()
+    return _camunda_client
+
+
+def prewarm_client() -> threading.Thread:
+    """Create the client and open a pooled connection in the background."""
+
+    def warm_up() -> None:
+        if get_client().health_check():
+            logger.info("Camunda connection pre-warmed")
+
+    thread = threading.Thread(target=warm_up, name="camunda-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def shutdown() -> None:
+    """Stop background workers and release the shared Camunda client."""
+    global _camunda_client
+    from .camunda.external_task import ExternalTaskWorker
+
+    for worker in ExternalTaskWorker.running_workers():
+        worker.stop()
+    prefetcher.shutdown()
+
+    with _camunda_client_lock:
+        if _camunda_client is not None:
+            _camunda_client.close()
+            _camunda_client = None
+            logger.info("Camunda client closed")
+
+
+def __getattr__(name: str) -> Any:
+    # Keep ``server.camunda_client`` working without creating it at import time
+    if name == "camunda_client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _get_bpmn_index(definition_id: Optional[str]) -> Optional[BpmnModelIndex]:
+    """Get the cached BPMN model index, or None if it is not available.
+
+    Model lookups only enrich tool output, so failures are ignored. The
+    client logs them once and serves repeated lookups from its failure cache.
+    """
+    if not definition_id:
+        return None
+    try:
+        return get_client().get_bpmn_index(definition_id)
+    except Exception as e:
+        logger.debug("BPMN model for %s not available: %s", definition_id, e)
+        return None
+
+
+ToolFunction = TypeVar("ToolFunction", bound=Callable[..., str])
+
+# Maximum number of tool calls executed concurrently across all sessions
+_tool_workers = int(os.getenv("MCP_WORKERS", "8"))
+_tool_limiter: Optional[anyio.CapacityLimiter] = None
+
+# Time budget of a single tool call in seconds, including queueing
+DEFAULT_TOOL_DEADLINE = float(os.getenv("MCP_TOOL_DEADLINE", "60"))
+
+# Results of read-only tools, reused for MCP_CACHE_TTL seconds (0 disables)
+tool_cache = ResultCache(
+    ttl=float(os.getenv("MCP_CACHE_TTL", "10")),
+    max_entries=int(os.getenv("MCP_CACHE_SIZE", "256")),
+)
+
+# cProfile/tracemalloc profiling of selected tool calls (MCP_PROFILE)
+profiler = ToolProfiler.from_environment()
+_tool_names: List[str] = []
+
+_FRESH_PARAMETER = inspect.Parameter(
+    "fresh", inspect.Parameter.KEYWORD_ONLY, default=False, annotation=bool
+)
+
+
+class _ToolCall:
+    """State of a running tool call shared with the tool function."""
+
+    __slots__ = ("cacheable",)
+
+    def __init__(self) -> None:
+        self.cacheable = True
+
+
+_current_call: "contextvars.ContextVar[Optional[_ToolCall]]" = contextvars.ContextVar(
+    "tool_call", default=None
+)
+
+
+def _skip_result_cache() -> None:
+    """Keep the result of the running tool call out of ``tool_cache``.
+
+    For results that do not start with "Error" but report a partial failure.
+    """
+    call = _current_call.get()
+    if call is not None:
+        call.cacheable = False
+
+
+def _tool_cache_key(fn: Callable[..., str], kwargs: Dict[str, Any]) -> Hashable:
+    """Cache key of a tool call, with default arguments filled in."""
+    arguments = inspect.signature(fn).bind(**kwargs)
+    arguments.apply_defaults()
+    return tool_cache.key(fn.__name__, arguments.arguments)
+
+
+def camunda_tool(
+    deadline_seconds: Optional[float] = None,
+    cached: bool = False,
+    invalidates_cache: bool = False,
+) -> Callable[[ToolFunction], ToolFunction]:
+    """Register a blocking tool function with the MCP server.
+
+    Tools call the Camunda REST API synchronously, so they are executed on a
+    bounded worker thread pool instead of the event loop. This lets many MCP
+    sessions share one server process without blocking each other.
+
+    Each call runs under a deadline (``MCP_TOOL_DEADLINE`` unless overridden):
+    Camunda requests only get the remaining budget as timeout and are refused
+    once it is spent. The undecorated function is returned for direct use.
+
+    Results of ``cached`` (read-only) tools are kept in ``tool_cache``; these
+    tools get an extra ``fresh`` argument to bypass it. Tools that change
+    engine state set ``invalidates_cache``.
+    """
+
+    def decorator(fn: ToolFunction) -> ToolFunction:
+        name = fn.__name__
+        signature = inspect.signature(fn)
+
+        def run_with_deadline(
+            tool_deadline: Deadline, kwargs: Dict[str, Any], call: _ToolCall
+        ) -> str:
+            token = _current_call.set(call)
+            try:
+                with activate_deadline(tool_deadline), profiler.profile(name, kwargs):
+                    result = fn(**kwargs)
+            finally:
+                _current_call.reset(token)
+                if invalidates_cache:
+                    tool_cache.invalidate()
+            if tool_deadline.expired:
+                record_exceeded(name)
+                logger.warning(
+                    "Tool %s exceeded its deadline of %gs", name, tool_deadline.seconds
+                )
+            return result
+
+        @functools.wraps(fn)
+        async def run_in_worker(**kwargs: Any) -> str:
+            # The deadline starts before queueing for a worker thread
+            tool_deadline = Deadline(deadline_seconds or DEFAULT_TOOL_DEADLINE, name)
+            if not (cached and tool_cache.enabled):
+                kwargs.pop("fresh", None)
+                return await anyio.to_thread.run_sync(
+                    functools.partial(
+                        run_with_deadline, tool_deadline, kwargs, _ToolCall()
+                    ),
+                    limiter=_get_tool_limiter(),
+                )
+
+            fresh = kwargs.pop("fresh", False)
+            key = _tool_cache_key(fn, kwargs)
+            if not fresh:
+                result = tool_cache.get(key)
+                if result is not None:
+                    return result
+
+            generation = tool_cache.generation
+            call = _ToolCall()
+            result = await anyio.to_thread.run_sync(
+                functools.partial(run_with_deadline, tool_deadline, kwargs, call),
+                limiter=_get_tool_limiter(),
+            )
+            # Errors, partial failures and results cut short by the deadline
+            # are not reused
+            if (
+                call.cacheable
+                and not result.startswith("Error")
+                and not tool_deadline.expired
+            ):
+                tool_cache.put(key, result, generation)
+            return result
+
+        description = fn.__doc__
+        if cached:
+            setattr(
+                run_in_worker,
+                "__signature__",
+                signature.replace(
+                    parameters=[*signature.parameters.values(), _FRESH_PARAMETER]
+                ),
+            )
+            description = (
+                f"{fn.__doc__}\n"
+                "    Results are cached briefly; pass fresh=true to bypass the cache.\n"
+            )
+
+        mcp.add_tool(run_in_worker, name=name, description=description)
+        _tool_names.append(name)
+        return fn
+
+    return decorator
+
+
+def _get_tool_limiter() -> anyio.CapacityLimiter:
+    """Create the worker limiter inside the running event loop."""
+    global _tool_limiter
+    if _tool_limiter is None:
+        _tool_limiter = anyio.CapacityLimiter(_tool_workers)
+    return _tool_limiter
+
+
+def _engine_under_pressure() -> bool:
+    """Whether speculative requests would compete with real tool calls."""
+    if _tool_limiter is not None and _tool_limiter.available_tokens < 1:
+        return True
+    client = _camunda_client
+    if client is None:
+        return True
+    from .camunda.ratelimit import QUERY
+
+    return client.admission.under_pressure(QUERY)
+
+
+# Opt-in prefetching of details and comments of the first tasks of a list
+PREFETCH_TOP_TASKS = int(os.getenv("MCP_PREFETCH_TOP", "5"))
+PREFETCH_DEADLINE = 10.0
+prefetcher = Prefetcher(
+    workers=(
+        int(os.getenv("MCP_PREFETCH_WORKERS", "2"))
+        if os.getenv("MCP_PREFETCH", "false").lower() == "true" and tool_cache.enabled
+        else 0
+    ),
+    under_pressure=_engine_under_pressure,
+)
+
+
+# Full-text index of open tasks for search_tasks, rebuilt when older than this
+SEARCH_INDEX_TTL = float(os.getenv("MCP_SEARCH_INDEX_TTL", "300"))
+SEARCH_INDEX_WORKERS = int(os.getenv("MCP_SEARCH_INDEX_WORKERS", "4"))
+task_search = TaskSearchIndex()
+_task_search_lock = threading.Lock()
+
+
+def _prefetch_tool(fn: Callable[..., str], **kwargs: Any) -> None:
+    """Run a read-only tool and keep its result in the tool cache."""
+    key = _tool_cache_key(fn, kwargs)
+    if key in tool_cache:
+        return
+    generation = tool_cache.generation
+    with deadline(PREFETCH_DEADLINE, f"prefetch {fn.__name__}"):
+        result = fn(**kwargs)
+    if not result.startswith("Error"):
+        tool_cache.put(key, result, generation, prefetched=True)
+
+
+def _prefetch_task_follow_ups(tasks: Iterable["Task"]) -> None:
+    """Warm details and comments of the first tasks of a list."""
+    for task in itertools.islice(tasks, PREFETCH_TOP_TASKS):
+        for fn in (get_task_details, get_task_comments):
+            prefetcher.submit(
+                (fn.__name__, task.id),
+                functools.partial(_prefetch_tool, fn, task_id=task.id),
+            )
+
+
+Entity = TypeVar("Entity")
 
-logger.info("Camunda MCP Server initialized with all tools")
+
+def _render_list(
+    entities: Iterable[Entity],
+    count: int,
+    noun: str,
+    render: Callable[[Entity], Iterator[str]],
+) -> str:
+    """Render entities one by one into a single buffer.
+
+    Entities are consumed lazily and their lines are written straight to the
+    buffer, so only the output text is held, not intermediate line lists.
+    """
+    buffer = io.StringIO()
+    buffer.write(f"Found {count} {noun}(s):\n\n")
+    separator = ""
+    for entity in entities:
+        buffer.write(separator)
+        separator = "\n\n---\n\n"
+        line_break = ""
+        for line in render(entity):
+            buffer.write(line_break)
+            buffer.write(line)
+            line_break = "\n"
+    return buffer.getvalue()
 
 
 # Task Management Tools
-@mcp.tool()
+@camunda_tool(cached=True)
 def list_tasks(
     assignee: Optional[str] = None, process_definition_key: Optional[str] = None
 ) -> str:
@@ -56,42 +401,41 @@ def list_tasks(
     """
     try:
         logger.info(
-            f"Listing tasks - assignee: {assignee}, "
-            f"process: {process_definition_key}"
+            "Listing tasks - assignee: %s, process: %s",
+            assignee,
+            process_definition_key,
         )
 
-        tasks = camunda_client.get_tasks(
+        tasks = get_client().stream_tasks(
             assignee=assignee, process_definition_key=process_definition_key
         )
 
         if not tasks:
             return "No tasks found matching the specified criteria."
 
-        # Format tasks for display
-        task_list = []
-        for task in tasks:
-            task_info = [
-                f"Task ID: {task.id}",
-                f"Name: {task.name or 'Unnamed'}",
-                f"Assignee: {task.assignee or 'Unassigned'}",
-                f"Created: {task.created or 'Unknown'}",
-                f"Due: {task.due or 'No due date'}",
-                f"Process Instance: {task.process_instance_id or 'N/A'}",
-                f"Description: {task.description or 'No description'}",
-            ]
-            if task.priority is not None:
-                task_info.append(f"Priority: {task.priority}")
-
-            task_list.append("\n".join(task_info))
-
-        return f"Found {len(tasks)} task(s):\n\n" + "\n\n---\n\n".join(task_list)
+        result = _render_list(tasks, len(tasks), "task", _task_lines)
+        if prefetcher.enabled:
+            _prefetch_task_follow_ups(tasks)
+        return result
 
     except Exception as e:
-        logger.error(f"Error listing tasks: {e}")
+        logger.error("Error listing tasks: %s", e)
         return f"Error retrieving tasks: {str(e)}"
 
 
-@mcp.tool()
+def _task_lines(task: "Task") -> Iterator[str]:
+    yield f"Task ID: {task.id}"
+    yield f"Name: {task.name or 'Unnamed'}"
+    yield f"Assignee: {task.assignee or 'Unassigned'}"
+    yield f"Created: {task.created or 'Unknown'}"
+    yield f"Due: {task.due or 'No due date'}"
+    yield f"Process Instance: {task.process_instance_id or 'N/A'}"
+    yield f"Description: {task.description or 'No description'}"
+    if task.priority is not None:
+        yield f"Priority: {task.priority}"
+
+
+@camunda_tool(cached=True)
 def get_task_details(task_id: str) -> str:
     """
     Get detailed information for a specific task.
@@ -103,9 +447,9 @@ def get_task_details(task_id: str) -> str:
         Detailed task information
     """
     try:
-        logger.info(f"Getting task details for: {task_id}")
+        logger.info("Getting task details for: %s", task_id)
 
-        task = camunda_client.get_task(task_id)
+        task = get_client().get_task(task_id)
 
         details = [
             f"Task Details for {task_id}:",
@@ -126,14 +470,26 @@ def get_task_details(task_id: str) -> str:
         if task.delegation_state:
             details.append(f"Delegation State: {task.delegation_state}")
 
+        index = _get_bpmn_index(task.process_definition_id)
+        activity = index.get(task.task_definition_key) if index else None
+        if index and activity:
+            details.append(f"Activity: {activity.label}")
+            if activity.lane:
+                details.append(f"Lane: {activity.lane}")
+            next_steps = index.next_activities(activity.id)
+            if next_steps:
+                details.append(
+                    "Next Steps: " + ", ".join(step.label for step in next_steps)
+                )
+
         return "\n".join(details)
 
     except Exception as e:
-        logger.error(f"Error getting task details: {e}")
+        logger.error("Error getting task details: %s", e)
         return f"Error retrieving task details: {str(e)}"
 
 
-@mcp.tool()
+@camunda_tool(invalidates_cache=True)
 def complete_task(task_id: str, variables: Optional[Dict[str, Any]] = None) -> str:
     """
     Complete a Camunda task with optional variables.
@@ -146,13 +502,14 @@ def complete_task(task_id: str, variables: Optional[Dict[str, Any]] = None) -> s
         Confirmation of task completion
     """
     try:
-        logger.info(f"Completing task: {task_id}")
+        logger.info("Completing task: %s", task_id)
 
         # Get task details first to show what we're completing
-        task = camunda_client.get_task(task_id)
+        task = get_client().get_task(task_id)
 
         # Complete the task
-        camunda_client.complete_task(task_id, variables)
+        get_client().complete_task(task_id, variables)
+        task_search.remove_task(task_id)
 
         result_text = "Task completed successfully!\n\n"
         result_text += f"Task ID: {task_id}\n"
@@ -167,11 +524,11 @@ def complete_task(task_id: str, variables: Optional[Dict[str, Any]] = None) -> s
         return result_text
 
     except Exception as e:
-        logger.error(f"Error completing task: {e}")
+        logger.error("Error completing task: %s", e)
         return f"Error completing task: {str(e)}"
 
 
-@mcp.tool()
+@camunda_tool(invalidates_cache=True)
 def create_task(
     name: str,
     assignee: Optional[str] = None,
@@ -191,7 +548,7 @@ def create_task(
         Details of the created task
     """
     try:
-        logger.info(f"Creating new task: {name}")
+        logger.info("Creating new task: %s", name)
 
         task_data = {"name": name}
 
@@ -202,7 +559,9 @@ def create_task(
         if priority is not None:
             task_data["priority"] = str(priority)
 
-        task = camunda_client.create_task(task_data)
+        task = get_client().create_task(task_data)
+        if task_search.built_at is not None:
+            task_search.add_task(task)
 
         result_text = "Task created successfully!\n\n"
         result_text += f"Task ID: {task.id}\n"
@@ -216,12 +575,236 @@ def create_task(
         return result_text
 
     except Exception as e:
-        logger.error(f"Error creating task: {e}")
+        logger.error("Error creating task: %s", e)
         return f"Error creating task: {str(e)}"
 
 
+@camunda_tool(deadline_seconds=300)
+def search_tasks(query: str, limit: int = 10, refresh: bool = False) -> str:
+    """
+    Search open tasks by words in their name, description, business key or comments.
+
+    Args:
+        query: Words to search for; tasks must contain all of them
+        limit: Maximum number of results (default 10)
+        refresh: Rebuild the search index from Camunda before searching
+
+    Returns:
+        Matching tasks, best matches first
+    """
+    try:
+        logger.info("Searching tasks for: %s", query)
+
+        age = task_search.age
+        note = ""
+        if (refresh or _task_search_outdated()) and not _rebuild_task_search(refresh):
+            if age is None:
+                return "The search index is still being built, try again shortly."
+            note = (
+                "\n\nNote: the search index is being rebuilt, results are "
+                f"from {age:.0f} seconds ago."
+            )
+
+        matches = task_search.search(query, limit)
+        if task_search.partial:
+            note += (
+                f"\n\nNote: only {len(task_search)} open task(s) are indexed, "
+                "the time budget ran out while listing them. The next search "
+                "rebuilds the index."
+            )
+        if task_search.comments_missing:
+            note += (
+                f"\n\nNote: comments of {task_search.comments_missing} task(s) "
+                "are not searchable yet, the time budget ran out while loading "
+                "them. Search with refresh=True to index them."
+            )
+
+        if not matches:
+            return f"No tasks found matching '{query}'.{note}"
+
+        def lines(match: Tuple["Task", float]) -> Iterator[str]:
+            task, score = match
+            yield from _task_lines(task)
+            business_key = task_search.business_keys.get(task.id)
+            if business_key:
+                yield f"Business Key: {business_key}"
+            yield f"Score: {score:.2f}"
+
+        return _render_list(matches, len(matches), "matching task", lines) + note
+
+    except Exception as e:
+        logger.error("Error searching tasks: %s", e)
+        return f"Error searching tasks: {str(e)}"
+
+
+def _task_search_outdated() -> bool:
+    """Whether the search index is missing, expired or incomplete."""
+    age = task_search.age
+    return age is None or age > SEARCH_INDEX_TTL or task_search.partial
+
+
+def _rebuild_task_search(refresh: bool) -> bool:
+    """Rebuild the search index unless another search is rebuilding it.
+
+    Only the first search waits for a rebuild, for at most its remaining
+    time budget; while an index exists, concurrent searches use it as is.
+    Returns False if the rebuild was left to another search.
+    """
+    if task_search.age is not None:
+        acquired = _task_search_lock.acquire(blocking=False)
+    else:
+        active = current_deadline()
+        acquired = _task_search_lock.acquire(
+            timeout=active.remaining() if active is not None else -1
+        )
+    if not acquired:
+        return False
+
+    try:
+        # Another search may have finished a rebuild while this one waited
+        if refresh or _task_search_outdated():
+            task_search.rebuild(get_client(), SEARCH_INDEX_WORKERS)
+        return True
+    finally:
+        _task_search_lock.release()
+
+
+# Filter Tools
+@camunda_tool(cached=True)
+def list_filters() -> str:
+    """
+    List the saved task filters (Tasklist queues) defined in Camunda.
+
+    Returns:
+        Filters with their ID, name, owner and description
+    """
+    try:
+        logger.info("Listing filters")
+
+        filters = get_client().get_filters()
+
+        if not filters:
+            return "No task filters found."
+
+        return _render_list(filters, len(filters), "filter", _filter_lines)
+
+    except Exception as e:
+        logger.error("Error listing filters: %s", e)
+        return f"Error retrieving filters: {str(e)}"
+
+
+def _filter_lines(task_filter: Dict[str, Any]) -> Iterator[str]:
+    properties = task_filter.get("properties") or {}
+    yield f"Filter ID: {task_filter.get('id', 'Unknown')}"
+    yield f"Name: {task_filter.get('name') or 'Unnamed'}"
+    yield f"Owner: {task_filter.get('owner') or 'Shared'}"
+    if properties.get("description"):
+        yield f"Description: {properties['description']}"
+    if properties.get("priority") is not None:
+        yield f"Priority: {properties['priority']}"
+
+
+@camunda_tool(cached=True)
+def list_filter_tasks(
+    filter_id: str, first_result: int = 0, max_results: int = 50
+) -> str:
+    """
+    List the tasks of a saved task filter, one page at a time.
+
+    Args:
+        filter_id: The ID of the filter
+        first_result: Index of the first task to return
+        max_results: Maximum number of tasks to return
+
+    Returns:
+        One page of the tasks matched by the filter
+    """
+    try:
+        logger.info(
+            "Listing tasks of filter %s from %s (max %s)",
+            filter_id,
+            first_result,
+            max_results,
+        )
+
+        tasks = get_client().stream_filter_tasks(filter_id, first_result, max_results)
+
+        if not tasks:
+            return f"No tasks found in filter {filter_id} from position {first_result}."
+
+        result = _render_list(tasks, len(tasks), "task", _task_lines)
+        if len(tasks) == max_results:
+            result += (
+                "\n\nMore tasks may be available, continue with "
+                f"first_result={first_result + max_results}."
+            )
+        return result
+
+    except Exception as e:
+        logger.error("Error listing filter tasks: %s", e)
+        return f"Error retrieving tasks of filter {filter_id}: {str(e)}"
+
+
+# Concurrent count requests of filter_counts
+FILTER_COUNT_WORKERS = int(os.getenv("MCP_FILTER_COUNT_WORKERS", "8"))
+
+
+@camunda_tool(deadline_seconds=60, cached=True)
+def filter_counts() -> str:
+    """
+    Count the tasks in every saved task filter.
+
+    All filters are counted concurrently, so this answers "how many items
+    are in each queue" in one call.
+
+    Returns:
+        Number of tasks per filter
+    """
+    try:
+        logger.info("Counting tasks of all filters")
+
+        filters = get_client().get_filters()
+
+        if not filters:
+            return "No task filters found."
+
+        counts = map_in_context(
+            lambda task_filter: get_client().get_filter_count(task_filter["id"]),
+            filters,
+            FILTER_COUNT_WORKERS,
+        )
+
+        if any(isinstance(result, Exception) for result in counts):
+            # A failed count would be served from the cache until it expires
+            _skip_result_cache()
+
+        count_list = []
+        not_counted = 0
+        for task_filter, result in zip(filters, counts):
+            name = task_filter.get("name") or "Unnamed"
+            if isinstance(result, DeadlineExceeded):
+                not_counted += 1
+                count_list.append(
+                    f"{name} ({task_filter.get('id')}): "
+                    "not counted (time budget exhausted)"
+                )
+            elif isinstance(result, Exception):
+                count_list.append(f"{name} ({task_filter.get('id')}): Error: {result}")
+            else:
+                count_list.append(f"{name} ({task_filter.get('id')}): {result}")
+
+        header = f"Task counts of {len(filters)} filter(s)"
+        if not_counted:
+            header += f" ({not_counted} not counted)"
+        return f"{header}:\n\n" + "\n".join(count_list)
+
+    except Exception as e:
+        logger.error("Error counting filter tasks: %s", e)
+        return f"Error counting filter tasks: {str(e)}"
+
+
 # Process Management Tools
-@mcp.tool()
+@camunda_tool(cached=True)
 def list_process_instances(
     process_definition_key: Optional[str] = None, business_key: Optional[str] = None
 ) -> str:
@@ -242,39 +825,36 @@ def list_process_instances(
         if business_key:
             filters["businessKey"] = business_key
 
-        instances = camunda_client.get_process_instances(
+        instances = get_client().stream_process_instances(
             process_definition_key=process_definition_key, **filters
         )
 
         if not instances:
             return "No process instances found matching the criteria."
 
-        # Format instances for display
-        instance_list = []
-        for instance in instances:
-            instance_info = [
-                f"Instance ID: {instance.id}",
-                f"Definition ID: {instance.definition_id}",
-                f"Business Key: {instance.business_key or 'None'}",
-                f"Status: {'Ended' if instance.ended else 'Active'}",
-                f"Suspended: {'Yes' if instance.suspended else 'No'}",
-            ]
-
-            if instance.tenant_id:
-                instance_info.append(f"Tenant: {instance.tenant_id}")
-
-            instance_list.append("\n".join(instance_info))
-
-        return f"Found {len(instances)} process instance(s):\n\n" + "\n\n---\n\n".join(
-            instance_list
+        return _render_list(
+            instances, len(instances), "process instance", _process_instance_lines
         )
 
     except Exception as e:
-        logger.error(f"Error listing process instances: {e}")
+        logger.error("Error listing process instances: %s", e)
         return f"Error retrieving process instances: {str(e)}"
 
 
-@mcp.tool()
+def _process_instance_lines(instance: "ProcessInstance") -> Iterator[str]:
+    index = _get_bpmn_index(instance.definition_id)
+    process_name = index.process_name if index else None
+    yield f"Instance ID: {instance.id}"
+    yield f"Definition ID: {instance.definition_id}"
+    yield f"Process: {process_name or 'Unknown'}"
+    yield f"Business Key: {instance.business_key or 'None'}"
+    yield f"Status: {'Ended' if instance.ended else 'Active'}"
+    yield f"Suspended: {'Yes' if instance.suspended else 'No'}"
+    if instance.tenant_id:
+        yield f"Tenant: {instance.tenant_id}"
+
+
+@camunda_tool(cached=True)
 def list_process_definitions() -> str:
     """
     List available process definitions from Camunda.
@@ -285,44 +865,145 @@ def list_process_definitions() -> str:
     try:
         logger.info("Listing process definitions")
 
-        definitions = camunda_client.get_process_definitions()
+        definitions = get_client().get_process_definitions()
 
         if not definitions:
             return "No process definitions found."
 
-        # Format definitions for display
-        definition_list = []
-        for definition in definitions:
-            def_info = [
-                f"ID: {definition.get('id', 'Unknown')}",
-                f"Key: {definition.get('key', 'Unknown')}",
-                f"Name: {definition.get('name', 'Unnamed')}",
-                f"Version: {definition.get('version', 'Unknown')}",
-                f"Deployment ID: {definition.get('deploymentId', 'Unknown')}",
-                f"Resource Name: {definition.get('resource', 'Unknown')}",
+        return _render_list(
+            definitions,
+            len(definitions),
+            "process definition",
+            _process_definition_lines,
+        )
+
+    except Exception as e:
+        logger.error("Error listing process definitions: %s", e)
+        return f"Error retrieving process definitions: {str(e)}"
+
+
+def _process_definition_lines(definition: Dict[str, Any]) -> Iterator[str]:
+    yield f"ID: {definition.get('id', 'Unknown')}"
+    yield f"Key: {definition.get('key', 'Unknown')}"
+    yield f"Name: {definition.get('name', 'Unnamed')}"
+    yield f"Version: {definition.get('version', 'Unknown')}"
+    yield f"Deployment ID: {definition.get('deploymentId', 'Unknown')}"
+    yield f"Resource Name: {definition.get('resource', 'Unknown')}"
+    yield "Status: Suspended" if definition.get("suspended") else "Status: Active"
+    if definition.get("tenantId"):
+        yield f"Tenant: {definition['tenantId']}"
+
+
+@camunda_tool(cached=True)
+def get_process_model(process_definition_id: str) -> str:
+    """
+    Show the activities of a process definition with their flow structure.
+
+    Args:
+        process_definition_id: The ID of the process definition
+
+    Returns:
+        Activities with name, type, lane and outgoing flows
+    """
+    try:
+        logger.info("Getting process model for: %s", process_definition_id)
+
+        index = get_client().get_bpmn_index(process_definition_id)
+
+        if not index.activities:
+            return f"No activities found in process definition {process_definition_id}."
+
+        activity_list = []
+        for activity in index.activities.values():
+            activity_info = [
+                f"Activity ID: {activity.id}",
+                f"Name: {activity.name or 'Unnamed'}",
+                f"Type: {activity.type}",
             ]
+            if activity.lane:
+                activity_info.append(f"Lane: {activity.lane}")
+            if activity.outgoing:
+                activity_info.append(
+                    "Next: " + ", ".join(index.label(t) for t in activity.outgoing)
+                )
 
-            if definition.get("suspended"):
-                def_info.append("Status: Suspended")
-            else:
-                def_info.append("Status: Active")
+            activity_list.append("\n".join(activity_info))
+
+        return (
+            f"Process {index.process_name or process_definition_id} "
+            f"has {len(index)} activities:\n\n" + "\n\n---\n\n".join(activity_list)
+        )
+
+    except Exception as e:
+        logger.error("Error getting process model: %s", e)
+        return f"Error retrieving process model: {str(e)}"
+
+
+@camunda_tool(cached=True)
+def get_process_instance_position(process_instance_id: str) -> str:
+    """
+    Show where a process instance currently waits, using activity names.
+
+    Args:
+        process_instance_id: The ID of the process instance
+
+    Returns:
+        Current activities of the instance and their possible next steps
+    """
+    try:
+        logger.info("Getting position of process instance: %s", process_instance_id)
 
-            if definition.get("tenantId"):
-                def_info.append(f"Tenant: {definition['tenantId']}")
+        tree = get_client().get_activity_instance_tree(process_instance_id)
+        index = _get_bpmn_index(tree.get("processDefinitionId"))
 
-            definition_list.append("\n".join(def_info))
+        waiting = _collect_current_activities(tree)
+        if not waiting:
+            return f"Process instance {process_instance_id} has no active activities."
+
+        position_list = []
+        for activity_id, state in waiting:
+            activity = index.get(activity_id) if index else None
+            position_info = [
+                f"Activity: {activity.label if activity else activity_id}",
+                f"State: {state}",
+            ]
+            if activity and activity.lane:
+                position_info.append(f"Lane: {activity.lane}")
+            if index and activity:
+                next_steps = index.next_activities(activity_id)
+                if next_steps:
+                    position_info.append(
+                        "Next Steps: " + ", ".join(step.label for step in next_steps)
+                    )
+
+            position_list.append("\n".join(position_info))
 
         return (
-            f"Found {len(definitions)} process definition(s):\n\n"
-            + "\n\n---\n\n".join(definition_list)
+            f"Process instance {process_instance_id} is at "
+            f"{len(waiting)} activit{'y' if len(waiting) == 1 else 'ies'}:\n\n"
+            + "\n\n---\n\n".join(position_list)
         )
 
     except Exception as e:
-        logger.error(f"Error listing process definitions: {e}")
-        return f"Error retrieving process definitions: {str(e)}"
+        logger.error("Error getting process instance position: %s", e)
+        return f"Error retrieving process instance position: {str(e)}"
 
 
-@mcp.tool()
+def _collect_current_activities(tree: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Collect the leaf activities of an activity instance tree."""
+    current: List[Tuple[str, str]] = []
+    for transition in tree.get("childTransitionInstances") or []:
+        current.append((transition.get("activityId"), "Waiting for job execution"))
+    for child in tree.get("childActivityInstances") or []:
+        nested = _collect_current_activities(child)
+        if nested:
+            current.extend(nested)
+        else:
+            current.append((child.get("activityId"), "Active"))
+    return current
+
+
+@camunda_tool(invalidates_cache=True)
 def start_process(
     process_definition_key: str,
     business_key: Optional[str] = None,
@@ -340,9 +1021,9 @@ def start_process(
         Details of the started process instance
     """
     try:
-        logger.info(f"Starting process: {process_definition_key}")
+        logger.info("Starting process: %s", process_definition_key)
 
-        instance = camunda_client.start_process(
+        instance = get_client().start_process(
             process_definition_key=process_definition_key,
             business_key=business_key,
             variables=variables,
@@ -366,86 +1047,1468 @@ def start_process(
         return result_text
 
     except Exception as e:
-        logger.error(f"Error starting process: {e}")
+        logger.error("Error starting process: %s", e)
         return f"Error starting process: {str(e)}"
 
 
-# Comment Management Tools
-@mcp.tool()
-def get_task_comments(task_id: str) -> str:
+# Message and Signal Tools
+@camunda_tool(invalidates_cache=True)
+def correlate_message(
+    message_name: str,
+    business_key: Optional[str] = None,
+    process_instance_id: Optional[str] = None,
+    correlation_keys: Optional[Dict[str, Any]] = None,
+    variables: Optional[Dict[str, Any]] = None,
+    correlate_all: bool = False,
+) -> str:
     """
-    Get all comments for a specific task.
+    Correlate a message to process instances waiting for it.
 
     Args:
-        task_id: The ID of the task to get comments for
+        message_name: The name of the message
+        business_key: Optional business key of the process instance to target
+        process_instance_id: Optional ID of the process instance to target
+        correlation_keys: Optional process variables the target must have
+        variables: Optional variables to set in the process when correlating
+        correlate_all: Deliver to every match instead of requiring exactly one
 
     Returns:
-        List of comments for the task
+        The process instances that received the message
     """
     try:
-        logger.info(f"Getting comments for task: {task_id}")
+        logger.info("Correlating message %s", message_name)
 
-        comments = camunda_client.get_task_comments(task_id)
+        results = get_client().correlate_message(
+            message_name,
+            business_key=business_key,
+            process_instance_id=process_instance_id,
+            correlation_keys=correlation_keys,
+            variables=variables,
+            correlate_all=correlate_all,
+        )
 
-        if not comments:
-            return f"No comments found for task {task_id}."
+        return f"Message {message_name} correlated {_correlation_summary(results)}."
 
-        # Format comments for display
-        comment_list = []
-        for comment in comments:
-            comment_info = [
-                f"Comment ID: {comment.id}",
-                f"Author: {comment.user_id or 'System'}",
-                f"Time: {comment.time or 'Unknown'}",
-                f"Message: {comment.message}",
-            ]
+    except Exception as e:
+        logger.error("Error correlating message: %s", e)
+        return f"Error correlating message {message_name}: {_engine_error(e)}"
 
-            comment_list.append("\n".join(comment_info))
 
-        return (
-            f"Found {len(comments)} comment(s) for task {task_id}:\n\n"
-            + "\n\n---\n\n".join(comment_list)
+# Concurrent correlations of correlate_messages, and its item limit
+CORRELATION_WORKERS = int(os.getenv("MCP_CORRELATION_WORKERS", "8"))
+MAX_CORRELATIONS = 500
+
+
+@camunda_tool(deadline_seconds=120, invalidates_cache=True)
+def correlate_messages(correlations: List[Dict[str, Any]]) -> str:
+    """
+    Correlate many messages in one call, e.g. to unblock instances in bulk.
+
+    Each correlation is an object with "message_name" and optionally
+    "business_key", "process_instance_id", "correlation_keys", "variables"
+    and "correlate_all", as for correlate_message. Correlations run
+    concurrently and fail independently. Correlations not sent before the
+    time budget ran out are listed as such and can be sent again safely.
+
+    Args:
+        correlations: The correlations to perform (at most 500)
+
+    Returns:
+        One result line per correlation
+    """
+    try:
+        if not correlations:
+            return "No correlations given."
+        if len(correlations) > MAX_CORRELATIONS:
+            return (
+                f"Too many correlations ({len(correlations)}), "
+                f"send at most {MAX_CORRELATIONS} per call."
+            )
+
+        logger.info("Correlating %s message(s)", len(correlations))
+
+        def correlate(item: Dict[str, Any]) -> Any:
+            if "message_name" not in item:
+                raise ValueError("message_name is missing")
+            return get_client().correlate_message(
+                item["message_name"],
+                business_key=item.get("business_key"),
+                process_instance_id=item.get("process_instance_id"),
+                correlation_keys=item.get("correlation_keys"),
+                variables=item.get("variables"),
+                correlate_all=bool(item.get("correlate_all", False)),
+            )
+
+        # Failures are returned per item, delivered messages must be reported
+        results = map_in_context(correlate, correlations, CORRELATION_WORKERS)
+
+        result_list = []
+        failed = 0
+        not_sent = 0
+        for position, (item, result) in enumerate(zip(correlations, results), 1):
+            target = item.get("business_key") or item.get("process_instance_id")
+            label = f"{position}. {item.get('message_name', '?')}"
+            if target:
+                label += f" ({target})"
+            if isinstance(result, DeadlineExceeded):
+                if result.__cause__ is None:
+                    not_sent += 1
+                    result_list.append(f"{label}: not sent (time budget exhausted)")
+                else:
+                    # The request was cut off in flight, it may have been delivered
+                    failed += 1
+                    result_list.append(
+                        f"{label}: Error: cut off by the time budget, "
+                        "check whether it was delivered before sending it again"
+                    )
+            elif isinstance(result, Exception):
+                failed += 1
+                result_list.append(f"{label}: Error: {_engine_error(result)}")
+            else:
+                result_list.append(
+                    f"{label}: correlated {_correlation_summary(result)}"
+                )
+
+        summary = (
+            f"Correlated {len(correlations) - failed - not_sent} of "
+            f"{len(correlations)} message(s), {failed} failed"
         )
+        if not_sent:
+            summary += f", {not_sent} not sent"
+        return f"{summary}:\n\n" + "\n".join(result_list)
 
     except Exception as e:
-        logger.error(f"Error getting task comments: {e}")
-        return f"Error retrieving comments: {str(e)}"
+        logger.error("Error correlating messages: %s", e)
+        return f"Error correlating messages: {str(e)}"
 
 
-@mcp.tool()
-def add_task_comment(task_id: str, message: str) -> str:
+@camunda_tool(invalidates_cache=True)
+def send_signal(signal_name: str, variables: Optional[Dict[str, Any]] = None) -> str:
     """
-    Add a comment to a specific task.
+    Broadcast a signal to all process instances and start events waiting for it.
 
     Args:
-        task_id: The ID of the task to add a comment to
-        message: The comment message text
+        signal_name: The name of the signal
+        variables: Optional variables passed along with the signal
 
     Returns:
-        Confirmation of comment addition with details
+        Confirmation that the signal was sent
     """
     try:
-        logger.info(f"Adding comment to task: {task_id}")
-
-        comment = camunda_client.add_task_comment(task_id, message)
+        logger.info("Sending signal %s", signal_name)
 
-        result_text = "Comment added successfully!\n\n"
-        result_text += f"Comment ID: {comment.id}\n"
-        result_text += f"Task ID: {task_id}\n"
-        result_text += f"Author: {comment.user_id or 'System'}\n"
-        result_text += f"Time: {comment.time or 'Just now'}\n"
-        result_text += f"Message: {comment.message}"
+        get_client().send_signal(signal_name, variables)
 
-        return result_text
+        return f"Signal {signal_name} sent."
 
     except Exception as e:
-        logger.error(f"Error adding task comment: {e}")
-        return f"Error adding comment: {str(e)}"
+        logger.error("Error sending signal: %s", e)
+        return f"Error sending signal {signal_name}: {_engine_error(e)}"
+
+
+def _correlation_summary(results: List[Dict[str, Any]]) -> str:
+    """Describe which process instances a message reached."""
+    instance_ids = []
+    for result in results:
+        if result.get("resultType") == "ProcessDefinition":
+            instance = result.get("processInstance") or {}
+            instance_ids.append(f"{instance.get('id', 'Unknown')} (started)")
+        else:
+            execution = result.get("execution") or {}
+            instance_ids.append(execution.get("processInstanceId", "Unknown"))
+    if not instance_ids:
+        return "0 time(s)"
+    return f"{len(instance_ids)} time(s): {', '.join(instance_ids)}"
+
+
+def _engine_error(error: Exception) -> str:
+    """Prefer the engine's explanation of a failed request to the HTTP status."""
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            message = response.json().get("message")
+        except (ValueError, AttributeError):
+            message = None
+        if message:
+            return str(message)
+    return str(error)
+
+
+# Batch Operation Tools
+def _process_instance_query(
+    process_definition_key: Optional[str],
+    business_key: Optional[str],
+    activity_id: Optional[str],
+) -> Dict[str, Any]:
+    """Build a process instance query, refusing to match all instances."""
+    query: Dict[str, Any] = {}
+    if process_definition_key:
+        query["processDefinitionKey"] = process_definition_key
+    if business_key:
+        query["businessKey"] = business_key
+    if activity_id:
+        query["activityIdIn"] = [activity_id]
+
+    if not query:
+        raise ValueError(
+            "At least one of process_definition_key, business_key or "
+            "activity_id is required"
+        )
+    return query
 
 
-# Main entry point for MCP stdio protocol
-if __name__ == "__main__":
-    logger.info("Starting Camunda MCP Server with stdio transport")
+def _format_batch(action: str, batch: Dict[str, Any]) -> str:
+    """Format a newly created batch."""
+    return (
+        f"{action} batch started!\n\n"
+        f"Batch ID: {batch.get('id')}\n"
+        f"Type: {batch.get('type', 'Unknown')}\n"
+        f"Total Jobs: {batch.get('totalJobs', 'Unknown')}\n\n"
+        "The engine processes the batch in the background. "
+        "Use get_batch_progress to follow it."
+    )
 
-    # FastMCP automatically handles stdio protocol when run as main
-    mcp.run()
+
+@camunda_tool(invalidates_cache=True)
+def batch_delete_process_instances(
+    process_definition_key: Optional[str] = None,
+    business_key: Optional[str] = None,
+    activity_id: Optional[str] = None,
+    delete_reason: Optional[str] = None,
+    skip_custom_listeners: bool = False,
+) -> str:
+    """
+    Delete all process instances matching a query as an engine-side batch.
+
+    Args:
+        process_definition_key: Delete instances of this process definition
+        business_key: Delete instances with this business key
+        activity_id: Delete instances currently waiting at this activity
+        delete_reason: Optional reason recorded in the history
+        skip_custom_listeners: Skip execution listeners while deleting
+
+    Returns:
+        Batch ID and number of batch jobs
+    """
+    try:
+        query = _process_instance_query(
+            process_definition_key, business_key, activity_id
+        )
+        logger.info("Starting delete batch for query: %s", query)
+
+        batch = get_client().delete_process_instances_async(
+            query,
+            delete_reason=delete_reason,
+            skip_custom_listeners=skip_custom_listeners,
+        )
+        return _format_batch("Delete", batch)
+
+    except Exception as e:
+        logger.error("Error starting delete batch: %s", e)
+        return f"Error starting delete batch: {str(e)}"
+
+
+@camunda_tool(invalidates_cache=True)
+def batch_suspend_process_instances(
+    suspended: bool = True,
+    process_definition_key: Optional[str] = None,
+    business_key: Optional[str] = None,
+    activity_id: Optional[str] = None,
+) -> str:
+    """
+    Suspend or activate all process instances matching a query as a batch.
+
+    Args:
+        suspended: True to suspend, False to activate the instances
+        process_definition_key: Match instances of this process definition
+        business_key: Match instances with this business key
+        activity_id: Match instances currently waiting at this activity
+
+    Returns:
+        Batch ID and number of batch jobs
+    """
+    try:
+        query = _process_instance_query(
+            process_definition_key, business_key, activity_id
+        )
+        logger.info("Starting suspension batch (%s) for query: %s", suspended, query)
+
+        batch = get_client().suspend_process_instances_async(query, suspended)
+        return _format_batch("Suspend" if suspended else "Activate", batch)
+
+    except Exception as e:
+        logger.error("Error starting suspension batch: %s", e)
+        return f"Error starting suspension batch: {str(e)}"
+
+
+@camunda_tool(invalidates_cache=True)
+def batch_set_job_retries(
+    retries: int,
+    process_definition_key: Optional[str] = None,
+    activity_id: Optional[str] = None,
+    only_failed: bool = True,
+    all_failed_jobs: bool = False,
+) -> str:
+    """
+    Set the retries of all matching jobs as a batch, e.g. to retry failures.
+
+    Args:
+        retries: Number of retries to set
+        process_definition_key: Match jobs of this process definition
+        activity_id: Match jobs of this activity
+        only_failed: Only match jobs without retries left (failed jobs)
+        all_failed_jobs: Retry every failed job of the engine; required when
+            neither process_definition_key nor activity_id is given
+
+    Returns:
+        Batch ID and number of batch jobs
+    """
+    try:
+        job_query: Dict[str, Any] = {}
+        if process_definition_key:
+            job_query["processDefinitionKey"] = process_definition_key
+        if activity_id:
+            job_query["activityId"] = activity_id
+        if not job_query and not all_failed_jobs:
+            raise ValueError(
+                "process_definition_key or activity_id is required, or "
+                "all_failed_jobs=True to retry every failed job of the engine"
+            )
+        if only_failed or all_failed_jobs:
+            job_query["noRetriesLeft"] = True
+
+        logger.info("Starting job retries batch for query: %s", job_query)
+
+        batch = get_client().set_job_retries_async(job_query, retries)
+        return _format_batch("Job retries", batch)
+
+    except Exception as e:
+        logger.error("Error starting job retries batch: %s", e)
+        return f"Error starting job retries batch: {str(e)}"
+
+
+@camunda_tool(invalidates_cache=True)
+def batch_set_process_variables(
+    variables: Dict[str, Any],
+    process_definition_key: Optional[str] = None,
+    business_key: Optional[str] = None,
+    activity_id: Optional[str] = None,
+) -> str:
+    """
+    Set variables on all process instances matching a query as a batch.
+
+    Args:
+        variables: Variables to set on every matching instance
+        process_definition_key: Match instances of this process definition
+        business_key: Match instances with this business key
+        activity_id: Match instances currently waiting at this activity
+
+    Returns:
+        Batch ID and number of batch jobs
+    """
+    try:
+        query = _process_instance_query(
+            process_definition_key, business_key, activity_id
+        )
+        logger.info("Starting variables batch for query: %s", query)
+
+        batch = get_client().set_process_variables_async(query, variables)
+        return _format_batch("Variables", batch)
+
+    except Exception as e:
+        logger.error("Error starting variables batch: %s", e)
+        return f"Error starting variables batch: {str(e)}"
+
+
+@camunda_tool(deadline_seconds=300)
+def get_batch_progress(batch_id: str, wait_seconds: int = 0) -> str:
+    """
+    Get the progress of an engine-side batch operation.
+
+    Args:
+        batch_id: The ID of the batch
+        wait_seconds: Optionally keep polling up to this many seconds until
+            the batch has finished
+
+    Returns:
+        Completed, failed and remaining batch jobs
+    """
+    try:
+        logger.info("Getting batch progress for: %s", batch_id)
+
+        client = get_client()
+        budget = float(max(0, wait_seconds))
+        tool_deadline = current_deadline()
+        if tool_deadline is not None:
+            # Keep a little budget for the final status request
+            budget = min(budget, max(0.0, tool_deadline.remaining() - 5))
+
+        wait_until = time.monotonic() + budget
+        statistics = client.get_batch_statistics(batch_id)
+        while statistics is not None and time.monotonic() < wait_until:
+            time.sleep(min(2.0, max(0.0, wait_until - time.monotonic())))
+            statistics = client.get_batch_statistics(batch_id)
+
+        if statistics is None:
+            batch = client.get_historic_batch(batch_id)
+            return (
+                f"Batch {batch_id} has finished.\n\n"
+                f"Type: {batch.get('type', 'Unknown')}\n"
+                f"Total Jobs: {batch.get('totalJobs', 'Unknown')}\n"
+                f"Started: {batch.get('startTime') or 'Unknown'}\n"
+                f"Ended: {batch.get('endTime') or 'Unknown'}"
+            )
+
+        total = statistics.get("totalJobs") or 0
+        completed = statistics.get("completedJobs", 0)
+        progress = completed / total * 100 if total else 0.0
+        return (
+            f"Batch {batch_id} is running.\n\n"
+            f"Type: {statistics.get('type', 'Unknown')}\n"
+            f"Progress: {progress:.1f}%\n"
+            f"Total Jobs: {total}\n"
+            f"Completed Jobs: {completed}\n"
+            f"Failed Jobs: {statistics.get('failedJobs', 0)}\n"
+            f"Remaining Jobs: {statistics.get('remainingJobs', 0)}\n"
+            f"Suspended: {'Yes' if statistics.get('suspended') else 'No'}"
+        )
+
+    except Exception as e:
+        logger.error("Error getting batch progress: %s", e)
+        return f"Error retrieving batch progress: {str(e)}"
+
+
+# External Task Tools
+@camunda_tool(cached=True)
+def external_task_backlog(topic_name: Optional[str] = None) -> str:
+    """
+    Show the external task backlog per topic.
+
+    Args:
+        topic_name: Optional topic to report on; all topics when omitted
+
+    Returns:
+        Available, locked and failed (no retries left) task counts per topic
+    """
+    try:
+        logger.info("Getting external task backlog - topic: %s", topic_name)
+
+        client = get_client()
+        topics = [topic_name] if topic_name else client.get_external_task_topic_names()
+
+        if not topics:
+            return "No external task topics found."
+
+        backlog_list = []
+        for position, topic in enumerate(topics):
+            tool_deadline = current_deadline()
+            if tool_deadline is not None and tool_deadline.expired:
+                backlog_list.append(
+                    f"Note: time budget ran out, {len(topics) - position} "
+                    "topic(s) not counted."
+                )
+                break
+            available = client.get_external_task_count(
+                topicName=topic, notLocked="true"
+            )
+            locked = client.get_external_task_count(topicName=topic, locked="true")
+            failed = client.get_external_task_count(
+                topicName=topic, noRetriesLeft="true"
+            )
+            backlog_info = [
+                f"Topic: {topic}",
+                f"Available: {available}",
+                f"Locked: {locked}",
+                f"Failed (no retries left): {failed}",
+            ]
+            backlog_list.append("\n".join(backlog_info))
+
+        return (
+            f"External task backlog for {len(topics)} topic(s):\n\n"
+            + "\n\n---\n\n".join(backlog_list)
+        )
+
+    except Exception as e:
+        logger.error("Error getting external task backlog: %s", e)
+        return f"Error retrieving external task backlog: {str(e)}"
+
+
+@camunda_tool()
+def external_task_workers() -> str:
+    """
+    Show throughput of the external task workers running in this server.
+
+    Returns:
+        Per-worker counts of fetched, completed and failed tasks
+    """
+    try:
+        logger.info("Getting external task worker statistics")
+
+        from .camunda.external_task import ExternalTaskWorker
+
+        workers = ExternalTaskWorker.running_workers()
+
+        if not workers:
+            return "No external task workers are running in this server."
+
+        worker_list = []
+        for worker in workers:
+            stats = worker.statistics()
+            worker_info = [
+                f"Worker ID: {stats['worker_id']}",
+                f"Topics: {', '.join(stats['topics'])}",
+                f"In Flight: {stats['in_flight']}",
+                f"Fetched: {stats['fetched']}",
+                f"Completed: {stats['completed']}",
+                f"Failed: {stats['failed']}",
+                f"BPMN Errors: {stats['bpmn_errors']}",
+                f"Lock Extensions: {stats['lock_extensions']}",
+                f"Throughput: {stats['throughput_per_minute']} tasks/min",
+            ]
+            worker_list.append("\n".join(worker_info))
+
+        return f"Found {len(workers)} worker(s):\n\n" + "\n\n---\n\n".join(worker_list)
+
+    except Exception as e:
+        logger.error("Error getting external task workers: %s", e)
+        return f"Error retrieving external task workers: {str(e)}"
+
+
+# Analytics Tools
+@camunda_tool(cached=True)
+def process_statistics(process_definition_id: Optional[str] = None) -> str:
+    """
+    Get counts of running instances, failed jobs and incidents.
+
+    The counts are aggregated by the engine in a single query, so prefer this
+    over listing process instances when only numbers are needed.
+
+    Args:
+        process_definition_id: Optional definition ID; when given, counts are
+            broken down per activity of that definition
+
+    Returns:
+        Instance, failed job and incident counts
+    """
+    try:
+        if process_definition_id:
+            logger.info("Getting activity statistics for: %s", process_definition_id)
+            return _format_activity_statistics(process_definition_id)
+
+        logger.info("Getting process definition statistics")
+
+        statistics = get_client().get_process_definition_statistics()
+
+        if not statistics:
+            return "No process definitions with running instances found."
+
+        statistic_list = []
+        for entry in statistics:
+            definition = entry.get("definition") or {}
+            statistic_info = [
+                f"Definition ID: {entry.get('id', 'Unknown')}",
+                f"Key: {definition.get('key', 'Unknown')}",
+                f"Name: {definition.get('name') or 'Unnamed'}",
+                f"Version: {definition.get('version', 'Unknown')}",
+                f"Running Instances: {entry.get('instances', 0)}",
+                f"Failed Jobs: {entry.get('failedJobs', 0)}",
+                f"Incidents: {_format_incident_counts(entry.get('incidents'))}",
+            ]
+            statistic_list.append("\n".join(statistic_info))
+
+        return (
+            f"Statistics for {len(statistics)} process definition(s):\n\n"
+            + "\n\n---\n\n".join(statistic_list)
+        )
+
+    except Exception as e:
+        logger.error("Error getting process statistics: %s", e)
+        return f"Error retrieving process statistics: {str(e)}"
+
+
+def _format_activity_statistics(process_definition_id: str) -> str:
+    """Format per-activity statistics of a single process definition."""
+    statistics = get_client().get_activity_statistics(process_definition_id)
+
+    if not statistics:
+        return f"No running activities found for {process_definition_id}."
+
+    index = _get_bpmn_index(process_definition_id)
+
+    statistic_list = []
+    for entry in statistics:
+        activity_id = entry.get("id", "Unknown")
+        statistic_info = [
+            f"Activity: {index.label(activity_id) if index else activity_id}",
+            f"Running Instances: {entry.get('instances', 0)}",
+            f"Failed Jobs: {entry.get('failedJobs', 0)}",
+            f"Incidents: {_format_incident_counts(entry.get('incidents'))}",
+        ]
+        statistic_list.append("\n".join(statistic_info))
+
+    return f"Activity statistics for {process_definition_id}:\n\n" + "\n\n---\n\n".join(
+        statistic_list
+    )
+
+
+def _format_incident_counts(incidents: Optional[List[Dict[str, Any]]]) -> str:
+    """Format incident counts grouped by incident type."""
+    if not incidents:
+        return "None"
+    return ", ".join(
+        f"{incident.get('incidentCount', 0)} {incident.get('incidentType')}"
+        for incident in incidents
+    )
+
+
+@camunda_tool(deadline_seconds=300, cached=True)
+def analyze_bottlenecks(
+    process_definition_key: str,
+    started_after: Optional[str] = None,
+    started_before: Optional[str] = None,
+    rank_by: str = "total",
+    top: int = 10,
+) -> str:
+    """
+    Identify bottleneck activities of a process from its execution history.
+
+    Pages through all historic activity instances of every version of the
+    process and aggregates duration percentiles per activity. This can take
+    a while for processes with a long history; narrow the time window with
+    started_after/started_before where possible.
+
+    Args:
+        process_definition_key: The key of the process definition to analyze
+        started_after: Only include activities started after this ISO date
+        started_before: Only include activities started before this ISO date
+        rank_by: Ranking criterion - "total" (time spent), "p90" or "waiting"
+        top: Number of activities to include in the report
+
+    Returns:
+        Ranked bottleneck report with duration percentiles and waiting counts
+    """
+    try:
+        logger.info(
+            "Analyzing bottlenecks - process: %s, window: %s - %s",
+            process_definition_key,
+            started_after,
+            started_before,
+        )
+
+        definitions = get_client().get_process_definitions(key=process_definition_key)
+        if not definitions:
+            return f"No process definition found with key {process_definition_key}."
+
+        analyzer = BottleneckAnalyzer()
+        partial = False
+        try:
+            for definition in definitions:
+                analyzer.consume(
+                    get_client().iter_history_activity_instances(
+                        definition["id"],
+                        started_after=started_after,
+                        started_before=started_before,
+                    )
+                )
+        except DeadlineExceeded:
+            # Report what was aggregated so far rather than nothing
+            partial = True
+
+        if not analyzer.rows:
+            return (
+                f"No activity history found for process {process_definition_key} "
+                "in the given time window."
+            )
+
+        ranking = analyzer.ranking(rank_by)[:top]
+        grand_total = sum(s.durations.total for s in analyzer.activities.values())
+
+        report_list = []
+        for position, stats in enumerate(ranking, start=1):
+            durations = stats.durations
+            share = durations.total / grand_total * 100 if grand_total else 0.0
+            report_info = [
+                f"{position}. {stats.label}",
+                f"Completed: {durations.count}",
+                f"Waiting: {stats.waiting}",
+                f"Mean: {format_duration(durations.mean)}",
+                f"P50: {format_duration(durations.quantile(0.5))}",
+                f"P90: {format_duration(durations.quantile(0.9))}",
+                f"P99: {format_duration(durations.quantile(0.99))}",
+                f"Max: {format_duration(durations.max)}",
+                f"Share of Total Time: {share:.1f}%",
+            ]
+            report_list.append("\n".join(report_info))
+
+        header = (
+            f"Bottleneck report for {process_definition_key} "
+            f"({analyzer.rows} activity instances, "
+            f"{len(definitions)} version(s), ranked by {rank_by}):\n\n"
+        )
+        if partial:
+            header += (
+                "Note: partial report, the time budget ran out before all "
+                "history was read. Narrow the time window for a full report.\n\n"
+            )
+        return header + "\n\n---\n\n".join(report_list)
+
+    except Exception as e:
+        logger.error("Error analyzing bottlenecks: %s", e)
+        return f"Error analyzing bottlenecks: {str(e)}"
+
+
+@camunda_tool(deadline_seconds=120, cached=True)
+def incident_summary(
+    process_definition_key: Optional[str] = None,
+    include_resolved: bool = False,
+    top: int = 10,
+) -> str:
+    """
+    Summarize incidents grouped by their root cause.
+
+    Incidents are grouped by process definition, activity and error message,
+    with ids and numbers in the message ignored. Each group lists its counts,
+    when it was first and last seen and the stack trace of one representative
+    incident. Use this instead of inspecting incidents one by one.
+
+    Args:
+        process_definition_key: Optional process definition key to filter by
+        include_resolved: Whether to include resolved incidents from the history
+        top: Number of groups to report, largest first
+
+    Returns:
+        Incident groups with counts, timestamps and a representative stack trace
+    """
+    try:
+        logger.info(
+            "Summarizing incidents - process: %s, resolved: %s",
+            process_definition_key,
+            include_resolved,
+        )
+
+        grouper = IncidentGrouper()
+        partial = False
+        try:
+            open_filters: Dict[str, Any] = {}
+            if process_definition_key:
+                open_filters["processDefinitionKeyIn"] = process_definition_key
+            grouper.consume(get_client().iter_incidents(**open_filters))
+            if include_resolved:
+                history_filters: Dict[str, Any] = {"resolved": "true"}
+                if process_definition_key:
+                    history_filters["processDefinitionKey"] = process_definition_key
+                grouper.consume(
+                    get_client().iter_history_incidents(**history_filters),
+                    is_open=False,
+                )
+        except DeadlineExceeded:
+            partial = True
+
+        if not grouper.rows:
+            return "No incidents found."
+
+        groups = grouper.ranking()[:top]
+        # One stack trace per group, not per incident
+        for group in groups:
+            try:
+                group.stacktrace = _incident_stacktrace(group.representative or {})
+            except DeadlineExceeded:
+                partial = True
+                break
+            except Exception as e:
+                logger.warning("Stack trace of incident group not loaded: %s", e)
+
+        group_list = []
+        for position, group in enumerate(groups, start=1):
+            representative = group.representative or {}
+            group_info = [
+                f"{position}. {group.message}",
+                f"Process Definition: {group.process_definition_id or 'Unknown'}",
+                f"Activity: {group.activity_id or 'Unknown'}",
+                f"Type: {group.incident_type or 'Unknown'}",
+                f"Incidents: {group.count} ({group.open} open, "
+                f"{group.resolved} resolved)",
+                f"First Seen: {group.first_seen or 'Unknown'}",
+                f"Last Seen: {group.last_seen or 'Unknown'}",
+                f"Example Incident: {representative.get('id', 'Unknown')}",
+                f"Example Message: {group.example_message or 'None'}",
+            ]
+            if group.stacktrace:
+                group_info.append(f"Stacktrace:\n{trim_stacktrace(group.stacktrace)}")
+            group_list.append("\n".join(group_info))
+
+        header = f"Found {grouper.rows} incident(s) in {len(grouper.groups)} group(s)"
+        if len(groups) < len(grouper.groups):
+            header += f", showing the largest {len(groups)}"
+        header += ":\n\n"
+        if partial:
+            header += (
+                "Note: partial summary, the time budget ran out before all "
+                "incidents were read.\n\n"
+            )
+        return header + "\n\n---\n\n".join(group_list)
+
+    except Exception as e:
+        logger.error("Error summarizing incidents: %s", e)
+        return f"Error summarizing incidents: {str(e)}"
+
+
+def _incident_stacktrace(incident: Dict[str, Any]) -> Optional[str]:
+    """Fetch the stack trace behind a failed job or external task incident."""
+    configuration = incident.get("configuration")
+    if not configuration:
+        return None
+    if incident.get("incidentType") == "failedJob":
+        return get_client().get_job_stacktrace(configuration)
+    if incident.get("incidentType") == "failedExternalTask":
+        return get_client().get_external_task_error_details(configuration)
+    return None
+
+
+# Task duration histograms per process and history window, rebuilt after this
+SLA_HISTORY_TTL = float(os.getenv("MCP_SLA_HISTORY_TTL", "3600"))
+# Processes whose histograms are kept, least recently used ones are dropped
+SLA_HISTORY_ENTRIES = int(os.getenv("MCP_SLA_HISTORY_SIZE", "32"))
+_task_durations: "OrderedDict[Tuple[str, int], Tuple[float, TaskDurationSketches]]" = (
+    OrderedDict()
+)
+_task_durations_lock = threading.Lock()
+
+
+@camunda_tool(deadline_seconds=300, cached=True)
+def sla_risk(
+    process_definition_key: str,
+    history_days: int = 90,
+    min_probability: float = 0.5,
+    top: int = 20,
+) -> str:
+    """
+    Rank open tasks of a process by their risk of missing the due date.
+
+    The probability is estimated from how long completed tasks of the same
+    task definition took, given how long each open task has been open
+    already. Durations are read from the task history once and reused for
+    an hour.
+
+    Args:
+        process_definition_key: The key of the process definition
+        history_days: Days of task history to learn durations from
+        min_probability: Only list tasks at least this likely to breach (0..1)
+        top: Maximum number of tasks to list
+
+    Returns:
+        Open tasks ranked by breach probability
+    """
+    try:
+        logger.info("Scoring SLA risk of %s", process_definition_key)
+
+        # Open tasks are listed first, the history read may use up the rest of
+        # the time budget
+        open_tasks = get_client().stream_tasks(
+            process_definition_key=process_definition_key
+        )
+        sketches, partial = _task_duration_sketches(
+            process_definition_key, history_days
+        )
+        if partial:
+            # Estimates from part of the history must not be served again
+            _skip_result_cache()
+        now = datetime.now(timezone.utc)
+
+        scored = []
+        without_due = without_history = 0
+        for task in open_tasks:
+            if task.due is None or task.created is None:
+                without_due += 1
+                continue
+            created = _as_utc(task.created)
+            due = _as_utc(task.due)
+            open_ms = (now - created).total_seconds() * 1000
+            probability = sketches.breach_probability(
+                task.task_definition_key or "",
+                open_ms,
+                (due - created).total_seconds() * 1000,
+            )
+            if probability is None:
+                without_history += 1
+            elif probability >= min_probability:
+                scored.append((probability, due, open_ms, task))
+
+        # Most likely breaches first, the earliest due among equals
+        scored.sort(key=lambda entry: (-entry[0], entry[1]))
+
+        header = (
+            f"{len(scored)} open task(s) of {process_definition_key} with a breach "
+            f"probability of at least {min_probability:.0%} "
+            f"(durations from {sketches.rows} completed task(s))"
+        )
+        if without_due or without_history:
+            header += (
+                f", {without_due} without due date and {without_history} "
+                "without history not scored"
+            )
+        header += ":\n\n"
+        if partial:
+            header += (
+                "Note: the time budget ran out while reading the task history, "
+                "estimates are based on part of it.\n\n"
+            )
+
+        task_list = []
+        for probability, due, open_ms, task in scored[:top]:
+            durations = sketches.durations[task.task_definition_key or ""]
+            time_left = (due - now).total_seconds() * 1000
+            task_info = [
+                f"Task ID: {task.id}",
+                f"Name: {task.name or 'Unnamed'}",
+                f"Assignee: {task.assignee or 'Unassigned'}",
+                f"Due: {task.due}",
+                f"Open For: {format_duration(open_ms)}",
+                (
+                    f"Time Left: {format_duration(time_left)}"
+                    if time_left > 0
+                    else f"Overdue By: {format_duration(-time_left)}"
+                ),
+                f"Breach Probability: {probability:.0%}",
+                f"Typical Duration: P50 {format_duration(durations.quantile(0.5))}, "
+                f"P90 {format_duration(durations.quantile(0.9))}",
+            ]
+            task_list.append("\n".join(task_info))
+
+        return header + "\n\n---\n\n".join(task_list)
+
+    except Exception as e:
+        logger.error("Error scoring SLA risk: %s", e)
+        return f"Error scoring SLA risk: {str(e)}"
+
+
+def _task_duration_sketches(
+    process_definition_key: str, history_days: int
+) -> Tuple[TaskDurationSketches, bool]:
+    """Return duration histograms of a process, built from history if stale.
+
+    Returns the histograms and whether they cover only part of the history
+    because the deadline ran out; partial histograms are not kept.
+    """
+    key = (process_definition_key, history_days)
+    with _task_durations_lock:
+        cached = _task_durations.get(key)
+        if cached is not None:
+            _task_durations.move_to_end(key)
+    if cached is not None and time.monotonic() - cached[0] < SLA_HISTORY_TTL:
+        return cached[1], False
+
+    started_after = datetime.now(timezone.utc) - timedelta(days=history_days)
+    sketches = TaskDurationSketches()
+    try:
+        sketches.consume(
+            get_client().iter_history(
+                "task",
+                started_after=started_after.isoformat(),
+                processDefinitionKey=process_definition_key,
+                finished=True,
+            )
+        )
+    except DeadlineExceeded:
+        return sketches, True
+
+    with _task_durations_lock:
+        _task_durations[key] = (time.monotonic(), sketches)
+        _task_durations.move_to_end(key)
+        while len(_task_durations) > SLA_HISTORY_ENTRIES:
+            _task_durations.popitem(last=False)
+    return sketches, False
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes from the engine as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# Decision Tools
+@camunda_tool(cached=True)
+def list_decision_definitions(latest_only: bool = True) -> str:
+    """
+    List DMN decision definitions from Camunda.
+
+    Args:
+        latest_only: Whether to list only the latest version of each decision
+
+    Returns:
+        List of decision definitions with their details
+    """
+    try:
+        logger.info("Listing decision definitions")
+
+        filters = {"latestVersion": "true"} if latest_only else {}
+        definitions = get_client().get_decision_definitions(**filters)
+
+        if not definitions:
+            return "No decision definitions found."
+
+        return _render_list(
+            definitions,
+            len(definitions),
+            "decision definition",
+            _decision_definition_lines,
+        )
+
+    except Exception as e:
+        logger.error("Error listing decision definitions: %s", e)
+        return f"Error retrieving decision definitions: {str(e)}"
+
+
+def _decision_definition_lines(definition: Dict[str, Any]) -> Iterator[str]:
+    yield f"ID: {definition.get('id', 'Unknown')}"
+    yield f"Key: {definition.get('key', 'Unknown')}"
+    yield f"Name: {definition.get('name', 'Unnamed')}"
+    yield f"Version: {definition.get('version', 'Unknown')}"
+    yield f"Deployment ID: {definition.get('deploymentId', 'Unknown')}"
+    yield f"Resource Name: {definition.get('resource', 'Unknown')}"
+    if definition.get("decisionRequirementsDefinitionKey"):
+        yield f"Requirements: {definition['decisionRequirementsDefinitionKey']}"
+    if definition.get("tenantId"):
+        yield f"Tenant: {definition['tenantId']}"
+
+
+# Concurrent evaluations of one evaluate_decision call, and its input limit
+DECISION_WORKERS = int(os.getenv("MCP_DECISION_WORKERS", "4"))
+MAX_DECISION_INPUTS = 500
+
+
+@camunda_tool(deadline_seconds=120)
+def evaluate_decision(
+    decision_definition_key: str, inputs: List[Dict[str, Any]]
+) -> str:
+    """
+    Evaluate a DMN decision for a batch of input rows.
+
+    Each row is evaluated separately against the latest version of the
+    decision, so a rule table can be tested against many cases in one call.
+    Numbers and booleans are passed typed, not as strings.
+
+    Args:
+        decision_definition_key: The key of the decision definition
+        inputs: Input rows, each mapping input variable names to values
+            (at most 500 rows)
+
+    Returns:
+        Table with one line per input row and the outputs of the matched rules
+    """
+    try:
+        if not inputs:
+            return "No input rows given."
+        if len(inputs) > MAX_DECISION_INPUTS:
+            return (
+                f"Too many input rows ({len(inputs)}), "
+                f"evaluate at most {MAX_DECISION_INPUTS} per call."
+            )
+
+        logger.info(
+            "Evaluating decision %s for %s input row(s)",
+            decision_definition_key,
+            len(inputs),
+        )
+
+        # Failures are kept per row, so rows evaluated in time are still reported
+        results = map_in_context(
+            lambda variables: get_client().evaluate_decision(
+                decision_definition_key, variables
+            ),
+            inputs,
+            DECISION_WORKERS,
+        )
+
+        return _format_decision_table(decision_definition_key, inputs, results)
+
+    except Exception as e:
+        logger.error("Error evaluating decision: %s", e)
+        return f"Error evaluating decision: {str(e)}"
+
+
+def _format_decision_table(
+    decision_definition_key: str, inputs: List[Dict[str, Any]], results: List[Any]
+) -> str:
+    """Render inputs and matched outputs as one pipe-separated line per row."""
+    input_names = list(dict.fromkeys(name for row in inputs for name in row))
+    output_names = list(
+        dict.fromkeys(
+            name
+            for result in results
+            if isinstance(result, list)
+            for match in result
+            for name in match
+        )
+    )
+
+    def cell(value: Any) -> str:
+        if value is None:
+            return "-"
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return str(value)
+
+    lines = [" | ".join(["#"] + input_names + ["->"] + output_names)]
+    failed = unmatched = skipped = 0
+    for position, (row, result) in enumerate(zip(inputs, results), start=1):
+        values = [cell(row.get(name)) for name in input_names]
+        if isinstance(result, DeadlineExceeded):
+            skipped += 1
+            outputs = ["not evaluated (time budget exhausted)"]
+        elif isinstance(result, Exception):
+            failed += 1
+            outputs = [f"Error: {result}"]
+        elif not result:
+            unmatched += 1
+            outputs = ["(no rule matched)"]
+        else:
+            # Hit policies like COLLECT match several rules
+            outputs = [
+                "; ".join(cell(match.get(name)) for match in result)
+                for name in output_names
+            ]
+        lines.append(" | ".join([str(position)] + values + ["->"] + outputs))
+
+    header = f"Evaluated {decision_definition_key} for {len(inputs)} input row(s)"
+    if failed or unmatched or skipped:
+        header += f" ({unmatched} without match, {failed} failed"
+        if skipped:
+            header += f", {skipped} not evaluated"
+        header += ")"
+    return header + ":\n\n" + "\n".join(lines)
+
+
+# Comment Management Tools
+@camunda_tool(cached=True)
+def get_task_comments(task_id: str) -> str:
+    """
+    Get all comments for a specific task.
+
+    Args:
+        task_id: The ID of the task to get comments for
+
+    Returns:
+        List of comments for the task
+    """
+    try:
+        logger.info("Getting comments for task: %s", task_id)
+
+        comments = get_client().get_task_comments(task_id)
+
+        if not comments:
+            return f"No comments found for task {task_id}."
+
+        # Format comments for display
+        comment_list = []
+        for comment in comments:
+            comment_info = [
+                f"Comment ID: {comment.id}",
+                f"Author: {comment.user_id or 'System'}",
+                f"Time: {comment.time or 'Unknown'}",
+                f"Message: {comment.message}",
+            ]
+
+            comment_list.append("\n".join(comment_info))
+
+        return (
+            f"Found {len(comments)} comment(s) for task {task_id}:\n\n"
+            + "\n\n---\n\n".join(comment_list)
+        )
+
+    except Exception as e:
+        logger.error("Error getting task comments: %s", e)
+        return f"Error retrieving comments: {str(e)}"
+
+
+@camunda_tool(invalidates_cache=True)
+def add_task_comment(task_id: str, message: str) -> str:
+    """
+    Add a comment to a specific task.
+
+    Args:
+        task_id: The ID of the task to add a comment to
+        message: The comment message text
+
+    Returns:
+        Confirmation of comment addition with details
+    """
+    try:
+        logger.info("Adding comment to task: %s", task_id)
+
+        comment = get_client().add_task_comment(task_id, message)
+        task_search.add_comment(task_id, message)
+
+        result_text = "Comment added successfully!\n\n"
+        result_text += f"Comment ID: {comment.id}\n"
+        result_text += f"Task ID: {task_id}\n"
+        result_text += f"Author: {comment.user_id or 'System'}\n"
+        result_text += f"Time: {comment.time or 'Just now'}\n"
+        result_text += f"Message: {comment.message}"
+
+        return result_text
+
+    except Exception as e:
+        logger.error("Error adding task comment: %s", e)
+        return f"Error adding comment: {str(e)}"
+
+
+# Export Tools
+@camunda_tool(deadline_seconds=600)
+def export_history(resource: str, max_rows: Optional[int] = None) -> str:
+    """
+    Export Camunda history to compressed JSONL files on the server.
+
+    Rows are appended in start time order to gzip JSONL part files in the
+    export directory (MCP_EXPORT_DIR). An interrupted export resumes from its
+    checkpoint when called again.
+
+    Args:
+        resource: History to export: process-instance, task or activity-instance
+        max_rows: Optional maximum number of rows to export in this call
+
+    Returns:
+        Exported rows, throughput and written files
+    """
+    try:
+        logger.info("Exporting %s history", resource)
+
+        from .camunda.export import HistoryExporter
+
+        exporter = HistoryExporter(
+            get_client(), resource, os.getenv("MCP_EXPORT_DIR", "exports")
+        )
+        result = exporter.run(max_rows)
+
+        lines = [
+            f"Exported {result.rows} {resource} row(s) in {result.seconds:.1f}s "
+            f"({result.rows_per_second:.0f} rows/s)",
+            f"Total Exported: {result.total_rows}",
+            f"Status: {'Complete' if result.complete else 'Partial'}",
+        ]
+        if result.files:
+            lines.append("Files:")
+            lines.extend(f"- {path}" for path in result.files)
+        if not result.complete:
+            lines.append("Call export_history again to continue from the checkpoint.")
+        return "\n".join(lines)
+
+    except Exception as e:
+        logger.error("Error exporting history: %s", e)
+        return f"Error exporting history: {str(e)}"
+
+
+# Diagnostics Tools
+@camunda_tool()
+def profile_tool_calls(tool_name: str, calls: int = 1) -> str:
+    """
+    Profile the next calls of a tool with cProfile and tracemalloc.
+
+    Args:
+        tool_name: Name of the tool to profile
+        calls: Number of upcoming calls to profile (default 1)
+
+    Returns:
+        Confirmation with the directory the profiles are written to
+    """
+    try:
+        logger.info("Profiling next %s call(s) of %s", calls, tool_name)
+
+        if tool_name not in _tool_names:
+            return f"Error: unknown tool {tool_name}"
+        if calls < 1:
+            return "Error: calls must be at least 1"
+
+        profiler.arm(tool_name, calls)
+        return (
+            f"Profiling the next {calls} call(s) of {tool_name}.\n"
+            f"Profiles are written to {os.path.abspath(profiler.directory)}; "
+            "the slowest calls are listed in the camunda://profiles resource."
+        )
+
+    except Exception as e:
+        logger.error("Error enabling profiling: %s", e)
+        return f"Error enabling profiling: {str(e)}"
+
+
+@mcp.resource("camunda://profiles", mime_type="application/json")
+def profiles() -> str:
+    """Slowest recently profiled tool calls and the profiling settings."""
+    return json.dumps(
+        {"profiling": profiler.status(), "slowest_calls": profiler.slowest()},
+        indent=2,
+    )
+
+
+@mcp.resource("camunda://metrics", mime_type="application/json")
+def metrics() -> str:
+    """Request admission, engine node, cache, prefetch and deadline counters."""
+    cache_stats = tool_cache.stats()
+    prefetch_stats: Dict[str, Any] = dict(prefetcher.stats())
+    completed = prefetch_stats["completed"]
+    prefetch_stats["hit_rate"] = (
+        round(cache_stats["prefetch_hits"] / completed, 3) if completed else None
+    )
+    data: Dict[str, Any] = {
+        "deadlines_exceeded": deadline_statistics(),
+        "tool_cache": cache_stats,
+        "prefetch": prefetch_stats,
+    }
+    if _camunda_client is not None:
+        data["admission"] = _camunda_client.admission.stats()
+        data["engine_nodes"] = _camunda_client.nodes.stats()
+    return json.dumps(data, indent=2)
+
+
+_LOCAL_HOSTS = ["127.0.0.1:*", "localhost:*", "[::1]:*"]
+
+
+def _transport_security(host: str) -> "TransportSecuritySettings":
+    """Host and Origin headers accepted by the HTTP transports.
+
+    Local names are always accepted. Names under which the server is reached
+    from elsewhere come from ``MCP_ALLOWED_HOSTS`` (e.g. ``mcp.example.com``
+    or ``mcp.example.com:*``), origins from ``MCP_ALLOWED_ORIGINS`` and by
+    default the http and https origins of the allowed hosts. Requests with
+    any other Host or Origin header are refused.
+    """
+    try:
+        from mcp.server.transport_security import TransportSecuritySettings
+    except ImportError as e:
+        raise RuntimeError(
+            "HTTP transports need mcp>=1.10.0 for Host/Origin checks, "
+            "upgrade mcp or use the stdio transport"
+        ) from e
+
+    allowed_hosts = _LOCAL_HOSTS + [
+        name.strip()
+        for name in os.getenv("MCP_ALLOWED_HOSTS", "").split(",")
+        if name.strip()
+    ]
+    allowed_origins = [
+        origin.strip()
+        for origin in os.getenv("MCP_ALLOWED_ORIGINS", "").split(",")
+        if origin.strip()
+    ] or [
+        f"{scheme}://{name}" for name in allowed_hosts for scheme in ("http", "https")
+    ]
+
+    if host not in ("127.0.0.1", "localhost", "::1") and allowed_hosts == _LOCAL_HOSTS:
+        logger.warning(
+            "Listening on %s, but only local Host headers are accepted; "
+            "set MCP_ALLOWED_HOSTS to the names clients use to reach the server",
+            host,
+        )
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=allowed_hosts,
+        allowed_origins=allowed_origins,
+    )
+
+
+def run_http(transport: str, host: str, port: int, shutdown_timeout: int) -> None:
+    """Serve MCP over HTTP (streamable HTTP or SSE) until interrupted.
+
+    The server does not authenticate clients. Beyond localhost it has to run
+    behind a reverse proxy that does, see docs/docker_deployment.md.
+    """
+    import uvicorn
+
+    mcp.settings.host = host
+    mcp.settings.port = port
+    # Host and Origin checks against DNS rebinding, whatever the bind address
+    mcp.settings.transport_security = _transport_security(host)
+
+    app = mcp.streamable_http_app() if transport == "streamable-http" else mcp.sse_app()
+
+    # uvicorn re-raises the termination signal after draining connections,
+    # so shared resources are released as part of the application lifespan
+    app_lifespan = app.router.lifespan_context
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Any) -> AsyncIterator[Any]:
+        try:
+            async with app_lifespan(app) as state:
+                yield state
+        finally:
+            shutdown()
+
+    app.router.lifespan_context = lifespan
+
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        timeout_graceful_shutdown=shutdown_timeout,
+        log_level=logging.getLevelName(logger.getEffectiveLevel()).lower(),
+        # Let uvicorn log through the root logger's queue handler
+        log_config=None,
+    )
+    uvicorn.Server(config).run()
+
+
+def main() -> None:
+    """Run the Camunda MCP server."""
+    global _tool_workers
+
+    parser = argparse.ArgumentParser(
+        prog="camunda-mcp-server", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "streamable-http", "sse"],
+        default=os.getenv("MCP_TRANSPORT", "stdio"),
+        help="MCP transport (env: MCP_TRANSPORT, default: stdio)",
+    )
+    parser.add_argument(
+        "--host",
+        default=os.getenv("MCP_HOST", "127.0.0.1"),
+        help="bind address for HTTP transports (env: MCP_HOST)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.getenv("MCP_PORT", "8000")),
+        help="port for HTTP transports (env: MCP_PORT)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=_tool_workers,
+        help="maximum concurrent tool calls (env: MCP_WORKERS)",
+    )
+    parser.add_argument(
+        "--shutdown-timeout",
+        type=int,
+        default=int(os.getenv("MCP_SHUTDOWN_TIMEOUT", "30")),
+        help="seconds to wait for running requests on shutdown "
+        "(env: MCP_SHUTDOWN_TIMEOUT)",
+    )
+    parser.add_argument(
+        "--prewarm",
+        action="store_true",
+        default=os.getenv("CAMUNDA_PREWARM", "").lower() in ("1", "true", "yes"),
+        help="connect to Camunda in the background at startup "
+        "(env: CAMUNDA_PREWARM)",
+    )
+    args = parser.parse_args()
+    _tool_workers = args.workers
+
+    configure_logging()
+
+    if args.prewarm:
+        prewarm_client()
+
+    logger.info("Starting Camunda MCP Server with %s transport", args.transport)
+
+    try:
+        if args.transport == "stdio":
+            mcp.run()
+        else:
+            run_http(args.transport, args.host, args.port, args.shutdown_timeout)
+    finally:
+        shutdown()
+
+
+# Main entry point
+if __name__ == "__main__":
+    main()
@@ -71,7 +71,7 @@ docker-compose ps
 
 echo.
 echo 🔍 Testing MCP Server connection...
-docker exec camunda-mcp-server python -c "from src.camunda.client import CamundaClient; from src.camunda.models import CamundaConfig; print('✅ MCP Server is working!') if CamundaClient(CamundaConfig.from_env()).health_check() else print('❌ Cannot connect to Camunda')" 2>nul
+docker exec camunda-mcp-server python -c "from src.camunda.client import CamundaClient; print('✅ MCP Server is working!') if CamundaClient().health_check() else print('❌ Cannot connect to Camunda')" 2>nul
 if %errorlevel% equ 0 (
     echo.
     echo 🎉 SUCCESS! Your Camunda MCP Server is running!
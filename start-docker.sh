@@ -83,7 +83,7 @@ if [ "$choice" != "3" ]; then
     
     echo ""
     echo "🔍 Testing MCP Server connection..."
-    if docker exec camunda-mcp-server python -c "from src.camunda.client import CamundaClient; from src.camunda.models import CamundaConfig; print('✅ MCP Server is working!') if CamundaClient(CamundaConfig.from_env()).health_check() else print('❌ Cannot connect to Camunda')" 2>/dev/null; then
+    if docker exec camunda-mcp-server python -c "from src.camunda.client import CamundaClient; print('✅ MCP Server is working!') if CamundaClient().health_check() else print('❌ Cannot connect to Camunda')" 2>/dev/null; then
         echo ""
         echo "🎉 SUCCESS! Your Camunda MCP Server is running!"
         echo ""
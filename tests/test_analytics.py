@@ -0,0 +1,327 @@
+"""
+Tests for streaming process analytics
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.camunda.analytics import (
+    BottleneckAnalyzer,
+    DurationHistogram,
+    TaskDurationSketches,
+)
+from src.camunda.models import Task
+from src.camunda.client import CamundaClient, CamundaConfig
+
+
+def history_rows(count: int) -> Iterator[Dict[str, Any]]:
+    """Generate synthetic history rows without materializing them."""
+    rng = random.Random(42)
+    for i in range(count):
+        if i % 10 == 0:
+            yield {
+                "activityId": "approve",
+                "activityName": "Approve Invoice",
+                "activityType": "userTask",
+                "endTime": None,
+            }
+        elif i % 2 == 0:
+            yield {
+                "activityId": "approve",
+                "activityName": "Approve Invoice",
+                "activityType": "userTask",
+                "endTime": "2024-01-01T10:00:00.000+0000",
+                "durationInMillis": rng.uniform(60_000, 120_000),
+            }
+        else:
+            yield {
+                "activityId": "archive",
+                "activityName": "Archive",
+                "activityType": "serviceTask",
+                "endTime": "2024-01-01T10:00:00.000+0000",
+                "durationInMillis": rng.uniform(10, 20),
+            }
+
+
+class TestDurationHistogram:
+    """Test cases for DurationHistogram."""
+
+    def test_quantiles_are_approximately_correct(self) -> None:
+        """Test quantile estimates stay within the bucket error."""
+        histogram = DurationHistogram()
+        for value in range(1, 10_001):
+            histogram.add(float(value))
+
+        assert histogram.count == 10_000
+        assert histogram.max == 10_000
+        assert histogram.quantile(0.5) == pytest.approx(5_000, rel=0.1)
+        assert histogram.quantile(0.9) == pytest.approx(9_000, rel=0.1)
+        assert histogram.quantile(1.0) == 10_000
+        assert histogram.mean == pytest.approx(5_000.5)
+
+    def test_empty_histogram(self) -> None:
+        """Test an empty histogram reports zero."""
+        histogram = DurationHistogram()
+
+        assert histogram.quantile(0.5) == 0.0
+        assert histogram.mean == 0.0
+
+    def test_cdf_is_approximately_correct(self) -> None:
+        """Test that the cdf inverts the quantiles within the bucket error."""
+        histogram = DurationHistogram()
+        for value in range(1, 10_001):
+            histogram.add(float(value))
+
+        assert histogram.cdf(0) == 0.0
+        assert histogram.cdf(2_500) == pytest.approx(0.25, abs=0.02)
+        assert histogram.cdf(9_000) == pytest.approx(0.9, abs=0.02)
+        assert histogram.cdf(20_000) == 1.0
+
+
+class TestTaskDurationSketches:
+    """Test cases for breach probabilities from task history."""
+
+    def make_sketches(self) -> TaskDurationSketches:
+        # Reviews take one to ten hours, evenly spread
+        hour = 3_600_000
+        return TaskDurationSketches().consume(
+            [
+                {
+                    "taskDefinitionKey": "review",
+                    "durationInMillis": hour + i * hour / 100,
+                }
+                for i in range(901)
+            ]
+            + [{"taskDefinitionKey": "review", "durationInMillis": None}]
+        )
+
+    def test_breach_probability(self) -> None:
+        """Test that the probability is conditioned on the time already open."""
+        sketches = self.make_sketches()
+        hour = 3_600_000
+
+        fresh = sketches.breach_probability("review", 0, 5.5 * hour)
+        waiting = sketches.breach_probability("review", 5 * hour, 5.5 * hour)
+
+        assert sketches.rows == 901
+        assert fresh == pytest.approx(0.5, abs=0.05)
+        assert waiting == pytest.approx(0.9, abs=0.05)
+
+    def test_edge_cases(self) -> None:
+        """Test overdue tasks, unusually old tasks and unknown definitions."""
+        sketches = self.make_sketches()
+        hour = 3_600_000
+
+        assert sketches.breach_probability("review", 6 * hour, 5 * hour) == 1.0
+        assert sketches.breach_probability("review", 11 * hour, 12 * hour) == 1.0
+        assert sketches.breach_probability("review", 0, 11 * hour) == 0.0
+        assert sketches.breach_probability("approve", 0, hour) is None
+
+
+class TestSlaRiskTool:
+    """Test cases for the sla_risk tool."""
+
+    def test_ranks_open_tasks(self) -> None:
+        """Test that likely breaches are listed first and history is reused."""
+        from src import server
+
+        now = datetime.now(timezone.utc)
+        hour = 3_600_000
+        history = [
+            {"taskDefinitionKey": "review", "durationInMillis": hour + i * hour / 100}
+            for i in range(901)
+        ]
+        tasks = [
+            Task.from_dict(
+                {
+                    "id": task_id,
+                    "name": "Review",
+                    "taskDefinitionKey": "review",
+                    "created": (now - timedelta(hours=open_hours)).isoformat(),
+                    "due": (now + timedelta(hours=left_hours)).isoformat(),
+                }
+            )
+            for task_id, open_hours, left_hours in [
+                ("relaxed", 0, 20),
+                ("tight", 5, 0.5),
+                ("late", 8, -1),
+            ]
+        ] + [Task.from_dict({"id": "no-due", "taskDefinitionKey": "review"})]
+
+        client = Mock()
+        client.iter_history.side_effect = lambda *args, **kwargs: iter(history)
+        client.stream_tasks.side_effect = lambda **kwargs: iter(tasks)
+        server._task_durations.clear()
+        with patch("src.server.get_client", return_value=client):
+            result = server.sla_risk("invoice")
+            server.sla_risk("invoice")
+
+        ids = [
+            line.split(": ")[1]
+            for line in result.splitlines()
+            if line.startswith("Task ID")
+        ]
+        assert ids == ["late", "tight"]
+        assert "Breach Probability: 100%" in result
+        assert "1 without due date" in result
+        client.iter_history.assert_called_once()
+        assert client.iter_history.call_args[1]["processDefinitionKey"] == "invoice"
+
+    def test_ranks_tasks_when_history_read_runs_out_of_time(self) -> None:
+        """Test that a history read cut off by the deadline still ranks tasks."""
+        from src import server
+        from src.camunda.deadline import DeadlineExceeded, current_deadline
+
+        now = datetime.now(timezone.utc)
+        hour = 3_600_000
+        tasks = [
+            Task.from_dict(
+                {
+                    "id": "late",
+                    "taskDefinitionKey": "review",
+                    "created": (now - timedelta(hours=8)).isoformat(),
+                    "due": (now - timedelta(hours=1)).isoformat(),
+                }
+            )
+        ]
+
+        def stream_tasks(**kwargs: Any) -> Any:
+            active = current_deadline()
+            assert active is not None
+            active.check()
+            return iter(tasks)
+
+        def iter_history(*args: Any, **kwargs: Any) -> Any:
+            yield {"taskDefinitionKey": "review", "durationInMillis": hour}
+            active = current_deadline()
+            assert active is not None
+            time.sleep(active.remaining())
+            raise DeadlineExceeded("sla_risk exceeded its deadline")
+
+        client = Mock()
+        client.stream_tasks.side_effect = stream_tasks
+        client.iter_history.side_effect = iter_history
+        server._task_durations.clear()
+        with patch("src.server.get_client", return_value=client), server.deadline(
+            0.2, "sla_risk"
+        ):
+            result = server.sla_risk("invoice")
+
+        assert "Task ID: late" in result
+        assert "time budget ran out while reading the task history" in result
+        assert not server._task_durations
+
+    def test_history_cache_is_bounded(self) -> None:
+        """Test that histograms of the least recently used processes are dropped."""
+        from src import server
+
+        client = Mock()
+        client.iter_history.side_effect = lambda *args, **kwargs: iter([])
+        server._task_durations.clear()
+        with patch("src.server.get_client", return_value=client), patch(
+            "src.server.SLA_HISTORY_ENTRIES", 2
+        ):
+            for key in ["invoice", "order", "invoice", "claim"]:
+                server._task_duration_sketches(key, 30)
+
+        assert list(server._task_durations) == [("invoice", 30), ("claim", 30)]
+        assert client.iter_history.call_count == 3
+
+
+class TestBottleneckAnalyzer:
+    """Test cases for BottleneckAnalyzer."""
+
+    def test_ranking_by_total_time(self) -> None:
+        """Test that the slowest activity is ranked first."""
+        analyzer = BottleneckAnalyzer().consume(history_rows(1_000))
+
+        ranking = analyzer.ranking("total")
+
+        assert analyzer.rows == 1_000
+        assert [s.activity_id for s in ranking] == ["approve", "archive"]
+        assert ranking[0].waiting == 100
+        assert ranking[0].label == "Approve Invoice (userTask)"
+
+    def test_unknown_ranking_raises(self) -> None:
+        """Test that an invalid ranking criterion is rejected."""
+        with pytest.raises(ValueError):
+            BottleneckAnalyzer().ranking("fastest")
+
+    @pytest.mark.slow
+    def test_memory_is_bounded(self) -> None:
+        """Test that state size does not grow with the number of rows."""
+        analyzer = BottleneckAnalyzer().consume(history_rows(1_000))
+        before = sys.getsizeof(analyzer.activities["approve"].durations.counts)
+
+        analyzer.consume(history_rows(200_000))
+        after = sys.getsizeof(analyzer.activities["approve"].durations.counts)
+
+        assert len(analyzer.activities) == 2
+        assert after == before
+
+
+class TestHistoryPaging:
+    """Test cases for paging through history endpoints."""
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_iter_history_activity_instances_pages(self, mock_request: Mock) -> None:
+        """Test that pages are requested until a short page is returned."""
+        pages: List[List[Dict[str, Any]]] = [
+            [{"activityId": "a"}, {"activityId": "b"}],
+            [{"activityId": "c"}],
+        ]
+
+        def respond(*args: Any, **kwargs: Any) -> Mock:
+            response = Mock()
+            response.status_code = 200
+            response.raise_for_status.return_value = None
+            response.json.return_value = pages.pop(0)
+            return response
+
+        mock_request.side_effect = respond
+
+        client = CamundaClient(CamundaConfig(url="http://localhost:8080/engine-rest"))
+        rows = list(
+            client.iter_history_activity_instances(
+                "invoice:1:abc", started_after="2024-01-01", page_size=2
+            )
+        )
+
+        assert [row["activityId"] for row in rows] == ["a", "b", "c"]
+        assert mock_request.call_count == 2
+        params = mock_request.call_args_list[1][1]["params"]
+        assert params["firstResult"] == 2
+        assert params["maxResults"] == 2
+        assert params["startedAfter"] == "2024-01-01T00:00:00.000+0000"
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_iter_history_sorts_by_start_and_id(self, mock_request: Mock) -> None:
+        """Test that rows sharing a start time are paged in a stable order."""
+        response = Mock()
+        response.status_code = 200
+        response.raise_for_status.return_value = None
+        response.json.return_value = []
+        mock_request.return_value = response
+
+        client = CamundaClient(CamundaConfig(url="http://localhost:8080/engine-rest"))
+        list(
+            client.iter_history(
+                "activity-instance", started_after="2024-01-01", page_size=2
+            )
+        )
+
+        args, kwargs = mock_request.call_args
+        assert args[0] == "POST"
+        assert args[1].endswith("/history/activity-instance")
+        assert kwargs["json"]["sorting"] == [
+            {"sortBy": "startTime", "sortOrder": "asc"},
+            {"sortBy": "activityInstanceId", "sortOrder": "asc"},
+        ]
+        assert kwargs["json"]["startedAfter"] == "2024-01-01T00:00:00.000+0000"
+        assert kwargs["params"] == {"firstResult": 0, "maxResults": 2}
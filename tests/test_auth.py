@@ -0,0 +1,192 @@
+"""
+Tests for OAuth2 client credentials authentication
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, List
+
+import pytest
+import requests
+
+from src.camunda.auth import OAuth2ClientCredentials, TokenError
+from src.camunda.client import CamundaClient, CamundaConfig
+
+
+class TokenServer(ThreadingHTTPServer):
+    """Stand-in token endpoint and a resource that checks the tokens."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), TokenHandler)
+        self.expires_in = 3600
+        self.token_delay = 0.0
+        self.reject_all = False
+        self.omit_token = False
+        self.issued: List[str] = []
+        self.valid: List[str] = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class TokenHandler(BaseHTTPRequestHandler):
+    server: TokenServer
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(self.server.token_delay)
+        with self.server.lock:
+            token = f"token-{len(self.server.issued) + 1}"
+            self.server.issued.append(token)
+            self.server.valid.append(token)
+        if self.server.omit_token:
+            self.reply(200, {"error_description": "no token for you"})
+            return
+        self.reply(200, {"access_token": token, "expires_in": self.server.expires_in})
+
+    def do_GET(self) -> None:
+        token = self.headers.get("Authorization", "")[len("Bearer ") :]
+        if token in self.server.valid and not self.server.reject_all:
+            self.reply(200, {"token": token})
+        else:
+            self.reply(401, {"message": "Unauthorized"})
+
+    def reply(self, status: int, body: Any) -> None:
+        encoded = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[TokenServer]:
+    server = TokenServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_session(server: TokenServer, **kwargs: Any) -> requests.Session:
+    session = requests.Session()
+    session.auth = OAuth2ClientCredentials(
+        f"{server.url}/token", "mcp", "secret", **kwargs
+    )
+    return session
+
+
+class TestOAuth2ClientCredentials:
+    """Test cases for token caching and refreshing."""
+
+    def test_token_is_cached(self, server: TokenServer) -> None:
+        """Test that requests share one token."""
+        session = make_session(server)
+
+        for _ in range(3):
+            assert session.get(f"{server.url}/engine").json() == {"token": "token-1"}
+
+        assert server.issued == ["token-1"]
+
+    def test_concurrent_requests_share_one_fetch(self, server: TokenServer) -> None:
+        """Test that requests waiting for the first token cause one fetch."""
+        server.token_delay = 0.2
+        session = make_session(server)
+
+        threads = [
+            threading.Thread(target=session.get, args=(f"{server.url}/engine",))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert server.issued == ["token-1"]
+
+    def test_refreshes_before_expiry(self, server: TokenServer) -> None:
+        """Test that an expiring token is refreshed in the background."""
+        server.expires_in = 1
+        session = make_session(server)
+        auth = session.auth
+        assert isinstance(auth, OAuth2ClientCredentials)
+
+        assert session.get(f"{server.url}/engine").json() == {"token": "token-1"}
+        time.sleep(0.6)
+        # Served with the current token while the new one is fetched
+        assert session.get(f"{server.url}/engine").json() == {"token": "token-1"}
+
+        for _ in range(50):
+            if auth.fetches == 2:
+                break
+            time.sleep(0.02)
+        assert session.get(f"{server.url}/engine").json() == {"token": "token-2"}
+
+    def test_retries_once_on_401(self, server: TokenServer) -> None:
+        """Test that a revoked token is replaced and the request retried."""
+        session = make_session(server)
+        session.get(f"{server.url}/engine")
+        server.valid.clear()
+
+        response = session.get(f"{server.url}/engine")
+
+        assert response.json() == {"token": "token-2"}
+        assert [r.status_code for r in response.history] == [401]
+
+    def test_does_not_retry_twice(self, server: TokenServer) -> None:
+        """Test that a request refused with a new token fails."""
+        server.reject_all = True
+        session = make_session(server)
+
+        response = session.get(f"{server.url}/engine")
+
+        assert response.status_code == 401
+        assert len(response.history) == 1
+        assert server.issued == ["token-1", "token-2"]
+
+    def test_response_without_token(self, server: TokenServer) -> None:
+        """Test that a token response without access_token fails clearly."""
+        server.omit_token = True
+        session = make_session(server)
+
+        with pytest.raises(TokenError, match="no access_token"):
+            session.get(f"{server.url}/engine")
+
+
+class TestOAuthConfiguration:
+    """Test cases for selecting OAuth in the client."""
+
+    def test_client_uses_oauth(self) -> None:
+        """Test that auth_type oauth installs the token auth."""
+        config = CamundaConfig(
+            url="http://localhost:8080/engine-rest",
+            auth_type="oauth",
+            client_id="mcp",
+            client_secret="secret",
+            token_url="http://localhost:8081/token",
+        )
+
+        client = CamundaClient(config)
+
+        assert isinstance(client.session.auth, OAuth2ClientCredentials)
+        assert client.session.auth.token_url == "http://localhost:8081/token"
+
+    def test_oauth_requires_token_url(self) -> None:
+        """Test that a missing token endpoint is reported at startup."""
+        config = CamundaConfig(
+            url="http://localhost:8080/engine-rest", auth_type="oauth"
+        )
+
+        with pytest.raises(ValueError):
+            CamundaClient(config)
@@ -0,0 +1,122 @@
+"""
+Tests for the BPMN model index
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.camunda.bpmn import BpmnModelIndex
+from src.camunda.client import CamundaClient, CamundaConfig
+
+INVOICE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL"
+                  id="Definitions_1">
+  <bpmn:collaboration id="Collaboration_1">
+    <bpmn:participant id="Participant_1" processRef="invoice" />
+  </bpmn:collaboration>
+  <bpmn:process id="invoice" name="Invoice Receipt" isExecutable="true">
+    <bpmn:laneSet id="LaneSet_1">
+      <bpmn:lane id="Lane_Accounting" name="Accounting">
+        <bpmn:flowNodeRef>StartEvent_1</bpmn:flowNodeRef>
+        <bpmn:flowNodeRef>approveInvoice</bpmn:flowNodeRef>
+      </bpmn:lane>
+      <bpmn:lane id="Lane_Team">
+        <bpmn:flowNodeRef>Gateway_1</bpmn:flowNodeRef>
+      </bpmn:lane>
+    </bpmn:laneSet>
+    <bpmn:startEvent id="StartEvent_1" name="Invoice received" />
+    <bpmn:sequenceFlow id="Flow_1" sourceRef="StartEvent_1"
+                       targetRef="approveInvoice" />
+    <bpmn:userTask id="approveInvoice" name="Approve Invoice" />
+    <bpmn:sequenceFlow id="Flow_2" sourceRef="approveInvoice"
+                       targetRef="Gateway_1" />
+    <bpmn:exclusiveGateway id="Gateway_1" name="Approved?" />
+    <bpmn:sequenceFlow id="Flow_3" sourceRef="Gateway_1" targetRef="EndEvent_1" />
+    <bpmn:sequenceFlow id="Flow_4" sourceRef="Gateway_1" targetRef="review" />
+    <bpmn:subProcess id="review" name="Review">
+      <bpmn:serviceTask id="archive" />
+    </bpmn:subProcess>
+    <bpmn:endEvent id="EndEvent_1" />
+  </bpmn:process>
+</bpmn:definitions>
+"""
+
+
+class TestBpmnModelIndex:
+    """Test cases for BpmnModelIndex."""
+
+    def test_from_xml_indexes_activities(self) -> None:
+        """Test that flow nodes are indexed with name and type."""
+        index = BpmnModelIndex.from_xml("invoice:1:abc", INVOICE_XML)
+
+        assert index.process_name == "Invoice Receipt"
+        assert len(index) == 6
+        task = index.get("approveInvoice")
+        assert task is not None
+        assert task.name == "Approve Invoice"
+        assert task.type == "userTask"
+        assert task.label == "Approve Invoice (userTask)"
+        assert index.get("archive") is not None
+        assert index.label("unknown") == "unknown"
+
+    def test_outgoing_flows_and_lanes(self) -> None:
+        """Test that sequence flows and lanes are resolved."""
+        index = BpmnModelIndex.from_xml("invoice:1:abc", INVOICE_XML)
+
+        next_steps = index.next_activities("Gateway_1")
+        assert [step.id for step in next_steps] == ["EndEvent_1", "review"]
+        assert index.activities["approveInvoice"].lane == "Accounting"
+        assert index.activities["Gateway_1"].lane == "Lane_Team"
+        assert index.activities["EndEvent_1"].lane is None
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_client_caches_index_per_definition(self, mock_request: Mock) -> None:
+        """Test that the XML is fetched only once per definition id."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {
+            "id": "invoice:1:abc",
+            "bpmn20Xml": INVOICE_XML,
+        }
+        mock_request.return_value = mock_response
+
+        client = CamundaClient(CamundaConfig(url="http://localhost:8080/engine-rest"))
+        first = client.get_bpmn_index("invoice:1:abc")
+        second = client.get_bpmn_index("invoice:1:abc")
+
+        assert first is second
+        mock_request.assert_called_once()
+        args, _ = mock_request.call_args
+        assert args[1].endswith("/process-definition/invoice:1:abc/xml")
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_client_caches_failures_briefly(self, mock_request: Mock) -> None:
+        """Test that an unavailable model is not requested again for every row."""
+        mock_request.side_effect = requests.ConnectionError("connection refused")
+
+        client = CamundaClient(CamundaConfig(url="http://localhost:8080/engine-rest"))
+        raised = []
+        for _ in range(3):
+            with pytest.raises(requests.ConnectionError) as info:
+                client.get_bpmn_index("invoice:1:abc")
+            raised.append(info.value)
+        assert mock_request.call_count == 1
+        # Callers served from the failure cache each get their own exception
+        assert raised[1] is not raised[2]
+        assert raised[1].__cause__ is raised[0]
+
+        # Once the failure has expired the model is requested again
+        _, error = client._bpmn_failures["invoice:1:abc"]
+        client._bpmn_failures["invoice:1:abc"] = (0.0, error)
+        with pytest.raises(requests.ConnectionError):
+            client.get_bpmn_index("invoice:1:abc")
+        assert mock_request.call_count == 2
+
+        # Expired failures of other definitions are dropped on the next failure
+        client._bpmn_failures["invoice:1:abc"] = (0.0, error)
+        with pytest.raises(requests.ConnectionError):
+            client.get_bpmn_index("order:1:def")
+        assert list(client._bpmn_failures) == ["order:1:def"]
@@ -132,6 +132,130 @@ class TestCamundaClient:
         assert 'task/task-123/complete' in args[1]
         assert 'json' in kwargs
     
+    @patch("src.camunda.client.requests.Session.request")
+    def test_get_process_definition_statistics(self, mock_request: Mock) -> None:
+        """Test that statistics are requested with failed jobs and incidents."""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = [
+            {
+                "id": "invoice:1:abc",
+                "instances": 12,
+                "failedJobs": 2,
+                "incidents": [{"incidentType": "failedJob", "incidentCount": 2}],
+            }
+        ]
+        mock_request.return_value = mock_response
+
+        with camunda_test_environment() as config:
+            client = CamundaClient(config)
+            statistics = client.get_process_definition_statistics()
+
+        assert statistics[0]["instances"] == 12
+        args, kwargs = mock_request.call_args
+        assert args[1].endswith("/process-definition/statistics")
+        assert kwargs["params"] == {"failedJobs": "true", "incidents": "true"}
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_delete_process_instances_async(self, mock_request: Mock) -> None:
+        """Test that batch deletion sends a query instead of instance ids."""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {"id": "batch-1", "totalJobs": 10}
+        mock_request.return_value = mock_response
+
+        with camunda_test_environment() as config:
+            client = CamundaClient(config)
+            batch = client.delete_process_instances_async(
+                {"processDefinitionKey": "invoice"}, delete_reason="cleanup"
+            )
+
+        assert batch["id"] == "batch-1"
+        args, kwargs = mock_request.call_args
+        assert args[0] == "POST"
+        assert args[1].endswith("/process-instance/delete")
+        assert kwargs["json"]["processInstanceQuery"] == {
+            "processDefinitionKey": "invoice"
+        }
+        assert kwargs["json"]["deleteReason"] == "cleanup"
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_filter_definitions_are_cached(self, mock_request: Mock) -> None:
+        """Test that filters are fetched once until a refresh is requested."""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = [{"id": "mine", "name": "My Tasks"}]
+        mock_request.return_value = mock_response
+
+        with camunda_test_environment() as config:
+            client = CamundaClient(config)
+            client.get_filters()
+            filters = client.get_filters()
+            assert mock_request.call_count == 1
+
+            client.get_filters(refresh=True)
+
+        assert filters == [{"id": "mine", "name": "My Tasks"}]
+        assert mock_request.call_count == 2
+        assert mock_request.call_args[1]["params"] == {"resourceType": "Task"}
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_evaluate_decision_sends_typed_variables(self, mock_request: Mock) -> None:
+        """Test that decision inputs keep their types and outputs are unwrapped."""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = [
+            {"approver": {"type": "String", "value": "manager", "valueInfo": {}}}
+        ]
+        mock_request.return_value = mock_response
+
+        with camunda_test_environment() as config:
+            client = CamundaClient(config)
+            results = client.evaluate_decision(
+                "approver",
+                {"amount": 1500.0, "count": 3, "urgent": True, "category": "travel"},
+            )
+
+        assert results == [{"approver": "manager"}]
+        args, kwargs = mock_request.call_args
+        assert args[1].endswith("/decision-definition/key/approver/evaluate")
+        assert kwargs["json"]["variables"] == {
+            "amount": {"value": 1500.0, "type": "Double"},
+            "count": {"value": 3, "type": "Integer"},
+            "urgent": {"value": True, "type": "Boolean"},
+            "category": {"value": "travel", "type": "String"},
+        }
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_correlate_message_payload(self, mock_request: Mock) -> None:
+        """Test that correlation keys and variables are sent typed."""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = [{"resultType": "Execution"}]
+        mock_request.return_value = mock_response
+
+        with camunda_test_environment() as config:
+            client = CamundaClient(config)
+            results = client.correlate_message(
+                "PaymentReceived",
+                business_key="order-1",
+                correlation_keys={"orderId": "order-1"},
+                variables={"amount": 99.5},
+                correlate_all=True,
+            )
+
+        assert results == [{"resultType": "Execution"}]
+        args, kwargs = mock_request.call_args
+        assert args[1].endswith("/message")
+        assert kwargs["json"] == {
+            "messageName": "PaymentReceived",
+            "all": True,
+            "resultEnabled": True,
+            "businessKey": "order-1",
+            "correlationKeys": {"orderId": {"value": "order-1", "type": "String"}},
+            "processVariables": {"amount": {"value": 99.5, "type": "Double"}},
+        }
+
     @patch('src.camunda.client.requests.Session.request')
     def test_health_check_success(self, mock_request: Mock) -> None:
         """Test successful health check."""
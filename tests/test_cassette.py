@@ -0,0 +1,133 @@
+"""
+Tests for recording and replaying Camunda traffic
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+
+from src.camunda.cassette import CassetteMiss
+from src.camunda.client import CamundaClient, CamundaConfig
+
+TASKS = [
+    {"id": f"task-{i}", "name": "Review", "created": "2024-01-01T10:00:00.000+0000"}
+    for i in range(3)
+]
+
+
+class EngineHandler(BaseHTTPRequestHandler):
+    """Stand-in engine answering a task list and a process start."""
+
+    def do_GET(self) -> None:
+        self.reply(TASKS)
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.reply({"id": "pi-1", "definitionId": "invoice:1:abc", "ended": False})
+
+    def reply(self, body: Any) -> None:
+        encoded = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def engine_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EngineHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/engine-rest"
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(
+    url: str, cassette: str, mode: str, scale: float = 0.0
+) -> CamundaClient:
+    return CamundaClient(
+        CamundaConfig(
+            url=url,
+            username="demo",
+            password="s3cret",
+            cassette_path=cassette,
+            cassette_mode=mode,
+            replay_latency_scale=scale,
+        )
+    )
+
+
+class TestCassette:
+    """Test cases for record and replay mode."""
+
+    def test_record_then_replay(self, engine_url: str, tmp_path: Any) -> None:
+        """Test that a recording answers the same calls without the engine."""
+        cassette = str(tmp_path / "engine.jsonl")
+        recorder = make_client(engine_url, cassette, "record")
+        recorded_tasks = recorder.get_tasks(assignee="demo")
+        recorder.start_process("invoice", variables={"password": "hunter2"})
+        recorder.close()
+
+        # Replayed against a host that does not exist
+        replayer = make_client("http://engine.invalid/engine-rest", cassette, "replay")
+        tasks = replayer.get_tasks(assignee="demo")
+        instance = replayer.start_process("invoice", variables={"password": "other"})
+
+        assert [task.id for task in tasks] == [task.id for task in recorded_tasks]
+        assert instance.id == "pi-1"
+        with pytest.raises(CassetteMiss):
+            replayer.get_tasks(assignee="someone-else")
+
+    def test_credentials_are_scrubbed(self, engine_url: str, tmp_path: Any) -> None:
+        """Test that neither auth headers nor secret values are written."""
+        cassette = tmp_path / "engine.jsonl"
+        recorder = make_client(engine_url, str(cassette), "record")
+        recorder.start_process("invoice", variables={"password": "hunter2"})
+
+        content = cassette.read_text()
+
+        assert "hunter2" not in content
+        assert "s3cret" not in content
+        assert "Authorization" not in content
+        body = json.loads(json.loads(content)["body"])
+        assert body["variables"]["password"] == "***"
+
+    def test_latency_is_scaled(self, tmp_path: Any) -> None:
+        """Test that recorded latency is replayed with the scale factor."""
+        cassette = tmp_path / "engine.jsonl"
+        cassette.write_text(
+            json.dumps(
+                {
+                    "method": "GET",
+                    "path": "/engine-rest/task",
+                    "body": None,
+                    "status": 200,
+                    "reason": "OK",
+                    "content_type": "application/json",
+                    "response": json.dumps(TASKS),
+                    "elapsed": 0.4,
+                }
+            )
+            + "\n"
+        )
+        client = make_client(
+            "http://engine.invalid/engine-rest", str(cassette), "replay", 0.5
+        )
+
+        started = time.monotonic()
+        first = client.get_tasks()
+        elapsed = time.monotonic() - started
+        # Responses repeat when a request is replayed more often than recorded
+        second = client.get_tasks()
+
+        assert 0.15 <= elapsed < 0.35
+        assert len(first) == len(second) == 3
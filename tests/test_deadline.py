@@ -0,0 +1,144 @@
+"""
+Tests for per-tool deadlines
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.camunda.client import CamundaClient, CamundaConfig
+from src.camunda.deadline import (
+    DeadlineExceeded,
+    current_deadline,
+    deadline,
+    deadline_statistics,
+    map_in_context,
+    record_exceeded,
+)
+
+
+class TestDeadline:
+    """Test cases for the deadline context."""
+
+    def test_nested_deadline_never_extends_outer(self) -> None:
+        """Test that the earlier of two nested deadlines wins."""
+        with deadline(1, "outer") as outer:
+            with deadline(60, "inner") as inner:
+                assert inner.expires_at == outer.expires_at
+                assert current_deadline() is inner
+            assert current_deadline() is outer
+        assert current_deadline() is None
+
+    def test_map_in_context_keeps_deadline_and_errors(self) -> None:
+        """Test that workers see the deadline and failures become results."""
+
+        def remaining(item: int) -> float:
+            if item < 0:
+                raise ValueError("negative")
+            active = current_deadline()
+            assert active is not None
+            return active.remaining()
+
+        with deadline(30, "tool"):
+            results = map_in_context(remaining, [1, -1, 2], max_workers=8)
+
+        assert 0 < results[0] <= 30
+        assert isinstance(results[1], ValueError)
+        assert 0 < results[2] <= 30
+        assert map_in_context(remaining, [], max_workers=8) == []
+
+    def test_check_raises_after_expiry(self) -> None:
+        """Test that an expired deadline raises."""
+        with deadline(0.01, "tool") as active:
+            time.sleep(0.02)
+            with pytest.raises(DeadlineExceeded):
+                active.check()
+
+    def test_record_exceeded(self) -> None:
+        """Test that exceeded deadlines are counted per name."""
+        before = deadline_statistics().get("counted_tool", 0)
+        record_exceeded("counted_tool")
+
+        assert deadline_statistics()["counted_tool"] == before + 1
+
+
+class TestClientDeadline:
+    """Test cases for deadline propagation into requests."""
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_timeout_is_remaining_budget(self, mock_request: Mock) -> None:
+        """Test that requests only get the remaining time as timeout."""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = []
+        mock_request.return_value = mock_response
+
+        client = CamundaClient(CamundaConfig(url="http://localhost:8080/engine-rest"))
+        with deadline(2, "list_tasks"):
+            client.get_tasks()
+
+        _, kwargs = mock_request.call_args
+        assert 0 < kwargs["timeout"] <= 2
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_admission_wait_is_taken_from_timeout(self, mock_request: Mock) -> None:
+        """Test that time queued for admission shortens the request timeout."""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = []
+        mock_request.return_value = mock_response
+
+        @contextmanager
+        def slow_admit(*args: Any) -> Iterator[None]:
+            time.sleep(0.3)
+            yield
+
+        client = CamundaClient(CamundaConfig(url="http://localhost:8080/engine-rest"))
+        client.admission.admit = slow_admit  # type: ignore[assignment]
+        with deadline(1, "list_tasks"):
+            client.get_tasks()
+
+        _, kwargs = mock_request.call_args
+        assert 0 < kwargs["timeout"] <= 0.75
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_expired_deadline_refuses_request(self, mock_request: Mock) -> None:
+        """Test that no request is sent once the budget is spent."""
+        client = CamundaClient(CamundaConfig(url="http://localhost:8080/engine-rest"))
+
+        with deadline(0.01, "list_tasks"):
+            time.sleep(0.02)
+            with pytest.raises(DeadlineExceeded):
+                client.get_tasks()
+
+        mock_request.assert_not_called()
+
+
+class TestToolDeadline:
+    """Test cases for deadlines of tool invocations."""
+
+    def test_bottleneck_report_is_partial_on_deadline(self) -> None:
+        """Test that aggregated rows are reported when time runs out."""
+        from src.server import analyze_bottlenecks
+
+        def rows(*args: Any, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+            yield {
+                "activityId": "approve",
+                "activityType": "userTask",
+                "endTime": "2024-01-01T10:00:00.000+0000",
+                "durationInMillis": 1000,
+            }
+            raise DeadlineExceeded("analyze_bottlenecks exceeded its deadline")
+
+        client = Mock()
+        client.get_process_definitions.return_value = [{"id": "invoice:1:abc"}]
+        client.iter_history_activity_instances.side_effect = rows
+
+        with patch("src.server.get_client", return_value=client):
+            result = analyze_bottlenecks("invoice")
+
+        assert "partial report" in result
+        assert "1 activity instances" in result
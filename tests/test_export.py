@@ -0,0 +1,157 @@
+"""
+Tests for the history export
+"""
+
+import gzip
+import json
+import os
+from typing import Any, Dict, List, Optional
+from unittest.mock import Mock
+
+import pytest
+
+from src.camunda.deadline import DeadlineExceeded
+from src.camunda.export import ExportInProgress, HistoryExporter
+
+
+def make_rows(count: int) -> List[Dict[str, Any]]:
+    # Two rows per second, so resuming has to tell rows with equal start apart
+    return [
+        {
+            "id": f"pi-{i}",
+            "startTime": f"2024-01-01T10:00:{i // 2:02d}.000+0000",
+        }
+        for i in range(count)
+    ]
+
+
+def make_client(rows: List[Dict[str, Any]]) -> Mock:
+    """Client returning all rows, ignoring startedAfter."""
+
+    def iter_history(
+        resource: str, started_after: Optional[str] = None, page_size: int = 500
+    ) -> Any:
+        yield from rows
+
+    client = Mock()
+    client.iter_history.side_effect = iter_history
+    return client
+
+
+def read_ids(directory: str) -> List[str]:
+    ids = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".jsonl.gz"):
+            with gzip.open(os.path.join(directory, name), "rt") as f:
+                ids.extend(json.loads(line)["id"] for line in f)
+    return ids
+
+
+class TestHistoryExporter:
+    """Test cases for exporting history to JSONL files."""
+
+    def test_writes_gzip_jsonl_parts(self, tmp_path: Any) -> None:
+        """Test that rows are split into compressed part files."""
+        client = make_client(make_rows(5))
+
+        result = HistoryExporter(
+            client, "process-instance", str(tmp_path), rows_per_file=2
+        ).run()
+
+        assert result.complete
+        assert result.rows == 5
+        assert [os.path.basename(path) for path in result.files] == [
+            "process-instance.part-00001.jsonl.gz",
+            "process-instance.part-00002.jsonl.gz",
+            "process-instance.part-00003.jsonl.gz",
+        ]
+        assert read_ids(str(tmp_path)) == [f"pi-{i}" for i in range(5)]
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    def test_resume_continues_after_checkpoint(self, tmp_path: Any) -> None:
+        """Test that a partial export continues without duplicates."""
+        client = make_client(make_rows(7))
+
+        first = HistoryExporter(client, "process-instance", str(tmp_path)).run(
+            max_rows=3
+        )
+        second = HistoryExporter(client, "process-instance", str(tmp_path)).run()
+
+        assert not first.complete
+        assert first.rows == 3
+        assert second.complete
+        assert second.rows == 4
+        assert second.total_rows == 7
+        # pi-2 and pi-3 share a start time, only pi-3 was left to export
+        assert read_ids(str(tmp_path)) == [f"pi-{i}" for i in range(7)]
+        started_after = client.iter_history.call_args[0][1]
+        assert started_after.startswith("2024-01-01T10:00:00.999")
+
+    def test_deadline_keeps_exported_rows(self, tmp_path: Any) -> None:
+        """Test that rows written before the deadline are checkpointed."""
+        rows = make_rows(4)
+
+        def iter_history(*args: Any) -> Any:
+            yield from rows[:2]
+            raise DeadlineExceeded("export")
+
+        client = Mock()
+        client.iter_history.side_effect = iter_history
+
+        result = HistoryExporter(client, "task", str(tmp_path)).run()
+
+        assert not result.complete
+        assert result.rows == 2
+        with open(tmp_path / "task.checkpoint.json") as f:
+            checkpoint = json.load(f)
+        assert checkpoint["rows"] == 2
+        assert checkpoint["last_ids"] == ["pi-0", "pi-1"]
+
+    def test_rows_without_id_are_skipped(self, tmp_path: Any) -> None:
+        """Test that no null ends up in the checkpoint's dedupe list."""
+        rows = make_rows(2)
+        del rows[1]["id"]
+        client = make_client(rows)
+
+        result = HistoryExporter(client, "task", str(tmp_path)).run()
+
+        assert result.rows == 1
+        with open(tmp_path / "task.checkpoint.json") as f:
+            assert json.load(f)["last_ids"] == ["pi-0"]
+
+    def test_concurrent_export_is_refused(self, tmp_path: Any) -> None:
+        """Test that a resource is not exported twice at the same time."""
+        rows = make_rows(3)
+        results: List[Any] = []
+
+        def iter_history(*args: Any) -> Any:
+            # Starts a second export of the same resource mid-run
+            yield rows[0]
+            try:
+                HistoryExporter(client, "task", str(tmp_path)).run()
+            except ExportInProgress as e:
+                results.append(e)
+            yield from rows[1:]
+
+        client = Mock()
+        client.iter_history.side_effect = iter_history
+
+        result = HistoryExporter(client, "task", str(tmp_path)).run()
+
+        assert result.rows == 3
+        assert len(results) == 1
+        assert not os.path.exists(tmp_path / "task.lock")
+
+    def test_stale_lock_file_is_removed(self, tmp_path: Any) -> None:
+        """Test that a lock left by a dead process does not block exports."""
+        (tmp_path / "task.lock").write_text("999999999")
+        client = make_client(make_rows(1))
+
+        result = HistoryExporter(client, "task", str(tmp_path)).run()
+
+        assert result.rows == 1
+
+    def test_unknown_resource(self, tmp_path: Any) -> None:
+        """Test that only history resources can be exported."""
+        with pytest.raises(ValueError):
+            HistoryExporter(Mock(), "variable-instance", str(tmp_path))
@@ -0,0 +1,155 @@
+"""
+Tests for the external task worker
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.camunda.client import CamundaClient, CamundaConfig
+from src.camunda.external_task import ExternalTaskBpmnError, ExternalTaskWorker
+from src.camunda.models import ExternalTask
+
+
+def external_task(task_id: str, topic: str = "charge-card") -> ExternalTask:
+    """Create an external task as returned by fetchAndLock."""
+    return ExternalTask.from_dict(
+        {
+            "id": task_id,
+            "topicName": topic,
+            "retries": None,
+            "variables": {"amount": {"value": 42, "type": "Integer"}},
+        }
+    )
+
+
+def fake_client(batches: List[List[ExternalTask]]) -> Mock:
+    """Client mock that returns the given batches, then long-polls empty."""
+    client = Mock(spec=CamundaClient)
+
+    def fetch_and_lock(*args: Any, **kwargs: Any) -> List[ExternalTask]:
+        if batches:
+            return batches.pop(0)
+        time.sleep(0.05)
+        return []
+
+    client.fetch_and_lock.side_effect = fetch_and_lock
+    return client
+
+
+class TestExternalTaskWorker:
+    """Test cases for ExternalTaskWorker."""
+
+    def test_tasks_are_executed_and_reported(self) -> None:
+        """Test completion, failure and BPMN error reporting."""
+        client = fake_client(
+            [[external_task("ok"), external_task("fail"), external_task("bpmn")]]
+        )
+        worker = ExternalTaskWorker(client, worker_id="test-worker")
+        done = threading.Event()
+
+        @worker.subscribe("charge-card", retries=3)
+        def charge_card(task: ExternalTask) -> Optional[Dict[str, Any]]:
+            if task.id == "fail":
+                raise RuntimeError("card declined")
+            if task.id == "bpmn":
+                raise ExternalTaskBpmnError("NO_FUNDS", "insufficient funds")
+            return {"charged": task.variables["amount"]}
+
+        client.handle_external_task_bpmn_error.side_effect = (
+            lambda *args, **kwargs: done.set()
+        )
+        worker.start()
+        assert done.wait(5)
+        worker.stop()
+
+        client.complete_external_task.assert_called_once_with(
+            "ok", "test-worker", {"charged": 42}
+        )
+        failure = client.handle_external_task_failure.call_args
+        assert failure[0][:2] == ("fail", "test-worker")
+        assert failure[1]["error_message"] == "card declined"
+        assert failure[1]["retries"] == 2
+        client.handle_external_task_bpmn_error.assert_called_once_with(
+            "bpmn", "test-worker", "NO_FUNDS", "insufficient funds"
+        )
+
+        stats = worker.statistics()
+        assert stats["fetched"] == 3
+        assert stats["completed"] == 1
+        assert stats["failed"] == 1
+        assert stats["bpmn_errors"] == 1
+        assert stats["in_flight"] == 0
+        assert worker not in ExternalTaskWorker.running_workers()
+
+    def test_long_running_task_lock_is_extended(self) -> None:
+        """Test that locks are extended before they expire."""
+        client = fake_client([[external_task("slow")]])
+        worker = ExternalTaskWorker(client, worker_id="test-worker")
+        worker.subscribe(
+            "charge-card", lambda task: time.sleep(1.5), lock_duration=1500
+        )
+
+        worker.start()
+        time.sleep(1.2)
+        worker.stop()
+
+        client.extend_external_task_lock.assert_called_with("slow", "test-worker", 1500)
+        client.complete_external_task.assert_called_once()
+
+    def test_tasks_fetched_while_stopping_are_unlocked(self) -> None:
+        """Test that a late long poll result is handed back, not executed."""
+        client = fake_client([])
+        worker = ExternalTaskWorker(client, worker_id="test-worker")
+        handler = Mock(return_value=None)
+        worker.subscribe("charge-card", handler)
+
+        worker.start()
+        worker.stop()
+        worker._dispatch(external_task("late"))
+
+        client.unlock_external_task.assert_called_once_with("late")
+        handler.assert_not_called()
+        assert worker.in_flight == 0
+
+    def test_start_requires_subscription(self) -> None:
+        """Test that a worker without topics cannot be started."""
+        worker = ExternalTaskWorker(Mock(spec=CamundaClient))
+
+        with pytest.raises(ValueError):
+            worker.start()
+
+
+class TestExternalTaskClient:
+    """Test cases for the external task client methods."""
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_fetch_and_lock_long_polls(self, mock_request: Mock) -> None:
+        """Test that the HTTP timeout covers the long-polling timeout."""
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = [
+            {
+                "id": "ext-1",
+                "topicName": "charge-card",
+                "variables": {"amount": {"value": 42, "type": "Integer"}},
+            }
+        ]
+        mock_request.return_value = mock_response
+
+        client = CamundaClient(CamundaConfig(url="http://localhost:8080/engine-rest"))
+        tasks = client.fetch_and_lock(
+            "worker-1",
+            [{"topicName": "charge-card", "lockDuration": 10000}],
+            max_tasks=5,
+            async_response_timeout=20000,
+        )
+
+        assert tasks[0].variables == {"amount": 42}
+        _, kwargs = mock_request.call_args
+        assert kwargs["json"]["asyncResponseTimeout"] == 20000
+        assert kwargs["json"]["maxTasks"] == 5
+        assert kwargs["timeout"] == 50
@@ -0,0 +1,128 @@
+"""
+Tests for incident triage
+"""
+
+from typing import Any, Dict
+from unittest.mock import Mock, patch
+
+from src.camunda.incidents import IncidentGrouper, normalize_message, trim_stacktrace
+import src.server as server
+
+
+def incident(
+    incident_id: str, message: str, timestamp: str, **data: Any
+) -> Dict[str, Any]:
+    return {
+        "id": incident_id,
+        "rootCauseIncidentId": incident_id,
+        "processDefinitionId": "invoice:1:abc",
+        "activityId": "archive",
+        "incidentType": "failedJob",
+        "incidentMessage": message,
+        "incidentTimestamp": timestamp,
+        "configuration": f"job-{incident_id}",
+        **data,
+    }
+
+
+class TestIncidentGrouper:
+    """Test cases for grouping incidents by root cause."""
+
+    def test_normalize_message(self) -> None:
+        """Test that ids, numbers and quoted values are ignored."""
+        first = normalize_message(
+            "Invoice 4711 not found for '3f2a1c9e-1b2c-4d5e-8f90-123456789abc'\nat ..."
+        )
+        second = normalize_message(
+            "Invoice 815 not found for 'a1b2c3d4-0000-4000-8000-000000000000'"
+        )
+
+        assert first == second == "Invoice <n> not found for '<value>'"
+        assert normalize_message(None) == "(no message)"
+
+    def test_groups_by_normalized_message(self) -> None:
+        """Test that incidents of the same failure are counted together."""
+        grouper = IncidentGrouper().consume(
+            [
+                incident("1", "Timeout after 30s", "2024-01-01T10:00:00.000+0000"),
+                incident("2", "Timeout after 31s", "2024-01-03T10:00:00.000+0000"),
+                incident("3", "Timeout after 29s", "2024-01-02T10:00:00.000+0000"),
+                incident("4", "Connection refused", "2024-01-02T10:00:00.000+0000"),
+            ]
+        )
+
+        largest = grouper.ranking()[0]
+
+        assert len(grouper.groups) == 2
+        assert largest.count == 3
+        assert largest.first_seen == "2024-01-01T10:00:00.000+0000"
+        assert largest.last_seen == "2024-01-03T10:00:00.000+0000"
+        assert largest.representative is not None
+        assert largest.representative["id"] == "2"
+
+    def test_propagated_incidents_are_skipped(self) -> None:
+        """Test that incidents of calling processes are not counted again."""
+        grouper = IncidentGrouper().consume(
+            [
+                incident("1", "Boom", "2024-01-01T10:00:00.000+0000"),
+                incident(
+                    "2", "Boom", "2024-01-01T10:00:00.000+0000", rootCauseIncidentId="1"
+                ),
+            ]
+        )
+
+        assert grouper.rows == 1
+
+    def test_open_incident_represents_group(self) -> None:
+        """Test that an open incident is preferred over a newer resolved one."""
+        grouper = IncidentGrouper()
+        grouper.add(incident("1", "Boom", "2024-01-01T10:00:00.000+0000"))
+        history = incident("2", "Boom", None, createTime="2024-01-05T10:00:00.000+0000")
+        grouper.add(history, is_open=False)
+
+        group = grouper.ranking()[0]
+
+        assert (group.open, group.resolved) == (1, 1)
+        assert group.last_seen == "2024-01-05T10:00:00.000+0000"
+        assert group.representative is not None
+        assert group.representative["id"] == "1"
+
+    def test_trim_stacktrace(self) -> None:
+        """Test that long stack traces are cut off."""
+        trace = "\n".join(f"at line {i}" for i in range(30))
+
+        assert (
+            trim_stacktrace(trace, lines=3)
+            == "at line 0\nat line 1\nat line 2\n... 27 more lines"
+        )
+
+
+class TestIncidentSummaryTool:
+    """Test cases for the incident_summary tool."""
+
+    @patch("src.server.get_client")
+    def test_fetches_one_stacktrace_per_group(self, mock_get_client: Mock) -> None:
+        """Test that stack traces are loaded for representatives only."""
+        client = Mock()
+        client.iter_incidents.return_value = iter(
+            [
+                incident(
+                    str(i), f"Timeout after {i}s", f"2024-01-01T10:00:{i:02d}.000+0000"
+                )
+                for i in range(50)
+            ]
+            + [incident("x", "Connection refused", "2024-01-02T10:00:00.000+0000")]
+        )
+        client.get_job_stacktrace.return_value = (
+            "java.net.SocketTimeoutException\n\tat Foo"
+        )
+        mock_get_client.return_value = client
+
+        result = server.incident_summary()
+
+        assert "Found 51 incident(s) in 2 group(s)" in result
+        assert "Incidents: 50 (50 open, 0 resolved)" in result
+        assert "java.net.SocketTimeoutException" in result
+        assert client.get_job_stacktrace.call_count == 2
+        client.get_job_stacktrace.assert_any_call("job-49")
+        client.iter_history_incidents.assert_not_called()
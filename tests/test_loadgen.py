@@ -0,0 +1,81 @@
+"""
+Tests for the MCP load generator
+"""
+
+import asyncio
+
+import pytest
+import requests
+
+from src.camunda.bpmn import BpmnModelIndex
+from src.loadgen import StandInEngine, build_parser, parse_mix, run_load
+
+
+class TestLoadGenerator:
+    """Test cases for the load generator and its stand-in engine."""
+
+    def test_parse_mix(self) -> None:
+        """Test that weights default to one."""
+        assert parse_mix("list_tasks=4, get_task_details") == {
+            "list_tasks": 4,
+            "get_task_details": 1,
+        }
+        with pytest.raises(ValueError):
+            parse_mix("")
+
+    def test_stand_in_engine_pages(self) -> None:
+        """Test that the stand-in engine answers paged task queries."""
+        engine = StandInEngine(tasks=10)
+        engine.start()
+        try:
+            page = requests.get(
+                f"{engine.url}/task", params={"firstResult": 8, "maxResults": 5}
+            ).json()
+            task = requests.get(f"{engine.url}/task/task-3").json()
+        finally:
+            engine.stop()
+
+        assert [t["id"] for t in page] == ["task-8", "task-9"]
+        assert task["id"] == "task-3"
+
+    def test_stand_in_engine_serves_bpmn(self) -> None:
+        """Test that definitions have a model for BPMN enrichment."""
+        engine = StandInEngine(tasks=10)
+        engine.start()
+        try:
+            definition_id = engine.tasks[0]["processDefinitionId"]
+            body = requests.get(
+                f"{engine.url}/process-definition/{definition_id}/xml"
+            ).json()
+        finally:
+            engine.stop()
+
+        index = BpmnModelIndex.from_xml(body["id"], body["bpmn20Xml"])
+        assert body["id"] == definition_id
+        assert "userTask" in index
+
+    def test_drives_server_over_stdio(self) -> None:
+        """Test a short run against the spawned server."""
+        args = build_parser().parse_args(
+            [
+                "--mix",
+                "list_tasks=2,get_task_details=1",
+                "--concurrency",
+                "2",
+                "--duration",
+                "1",
+                "--interval",
+                "0.5",
+                "--tasks",
+                "20",
+                "--env",
+                "MCP_CACHE_TTL=0",
+                "--json",
+            ]
+        )
+
+        summary = asyncio.run(run_load(args))
+
+        assert summary["total"]["calls"] > 0
+        assert summary["total"]["errors"] == 0
+        assert set(summary["tools"]) == {"list_tasks", "get_task_details"}
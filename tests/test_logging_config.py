@@ -0,0 +1,105 @@
+"""
+Tests for structured, queued logging
+"""
+
+import json
+import logging
+import os
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from src.logging_config import (
+    JsonFormatter,
+    SamplingFilter,
+    configure_logging,
+    stop_logging,
+)
+
+
+def make_record(
+    msg: str, *args: object, level: int = logging.INFO
+) -> logging.LogRecord:
+    return logging.LogRecord("camunda", level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def root_logger() -> Iterator[logging.Logger]:
+    """Restore the root logger after configure_logging replaced its handlers."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class TestJsonFormatter:
+    """Test cases for JSON log lines."""
+
+    def test_lazy_arguments_and_extra_fields(self) -> None:
+        """Test that arguments are rendered and extra fields kept."""
+        record = make_record("Getting task details for: %s", "task-1")
+        record.tool = "get_task_details"
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["message"] == "Getting task details for: task-1"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "camunda"
+        assert entry["tool"] == "get_task_details"
+
+
+class TestSamplingFilter:
+    """Test cases for sampling of high-volume debug records."""
+
+    def test_debug_records_are_sampled_per_template(self) -> None:
+        """Test that every n-th record of each template is kept."""
+        sampler = SamplingFilter(default_every=10)
+
+        kept = [
+            sampler.filter(make_record("GET %s", i, level=logging.DEBUG))
+            for i in range(100)
+        ]
+        other = sampler.filter(make_record("POST %s", 1, level=logging.DEBUG))
+
+        assert sum(kept) == 10
+        assert other is True
+
+    def test_info_records_are_kept(self) -> None:
+        """Test that records above debug are not sampled by default."""
+        sampler = SamplingFilter(default_every=10)
+
+        assert all(sampler.filter(make_record("Listing tasks")) for _ in range(20))
+
+    def test_rate_from_extra(self) -> None:
+        """Test that a call site can set its own sampling rate."""
+        sampler = SamplingFilter()
+        record = make_record("Prefetch failed")
+        record.sample_every = 5
+
+        assert sampler.filter(record) is True
+        assert sampler.filter(record) is False
+
+
+class TestConfigureLogging:
+    """Test cases for the queued logging setup."""
+
+    def test_honors_log_level_and_writes_json(
+        self, root_logger: logging.Logger, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that LOG_LEVEL is applied and records arrive as JSON."""
+        with patch.dict(os.environ, {"LOG_LEVEL": "warning", "LOG_FORMAT": "json"}):
+            configure_logging()
+
+        logger = logging.getLogger("camunda-mcp-server")
+        logger.info("dropped")
+        logger.warning("Node %s ejected", "node-a")
+        stop_logging()
+
+        lines = capsys.readouterr().err.strip().splitlines()
+        assert root_logger.level == logging.WARNING
+        assert [json.loads(line)["message"] for line in lines] == [
+            "Node node-a ejected"
+        ]
@@ -2,7 +2,15 @@
 Tests for MCP tools - Now using FastMCP architecture
 """
 
+import asyncio
+import os
+import time
+import tracemalloc
+from typing import Any, List
+from unittest.mock import Mock, patch
+
 from src.camunda.client import CamundaClient
+from src.camunda.models import EntityStream, Task
 
 
 class TestMCPServer:
@@ -43,9 +51,33 @@ class TestMCPServer:
             'create_task',
             'list_process_instances',
             'list_process_definitions',
+            "get_process_model",
+            "get_process_instance_position",
             'start_process',
+            "batch_delete_process_instances",
+            "batch_suspend_process_instances",
+            "batch_set_job_retries",
+            "batch_set_process_variables",
+            "get_batch_progress",
+            "external_task_backlog",
+            "external_task_workers",
+            "process_statistics",
+            "analyze_bottlenecks",
+            "incident_summary",
+            "sla_risk",
+            "list_decision_definitions",
+            "evaluate_decision",
             'get_task_comments',
-            'add_task_comment'
+            "add_task_comment",
+            "profile_tool_calls",
+            "search_tasks",
+            "list_filters",
+            "list_filter_tasks",
+            "filter_counts",
+            "export_history",
+            "correlate_message",
+            "correlate_messages",
+            "send_signal",
         ]
         
         for tool_name in expected_tools:
@@ -54,6 +86,519 @@ class TestMCPServer:
             assert callable(tool_func), f"Tool {tool_name} is not callable"
 
 
+class TestToolExecution:
+    """Test cases for running tools through the MCP server."""
+
+    def test_tools_run_concurrently_on_worker_pool(self) -> None:
+        """Test that blocking tools do not serialize on the event loop."""
+        from src.server import mcp
+
+        def slow_stream_tasks(**kwargs: Any) -> List[Any]:
+            time.sleep(0.3)
+            return []
+
+        client = Mock()
+        client.stream_tasks.side_effect = slow_stream_tasks
+
+        async def call_concurrently() -> List[Any]:
+            return await asyncio.gather(
+                *[mcp.call_tool("list_tasks", {}) for _ in range(4)]
+            )
+
+        with patch("src.server.get_client", return_value=client):
+            started = time.monotonic()
+            results = asyncio.run(call_concurrently())
+            elapsed = time.monotonic() - started
+
+        assert len(results) == 4
+        assert client.stream_tasks.call_count == 4
+        assert elapsed < 1.0
+
+    def test_tool_schema_matches_function_signature(self) -> None:
+        """Test that registered tools expose the original parameters."""
+        from src.server import mcp
+
+        tools = {tool.name: tool for tool in asyncio.run(mcp.list_tools())}
+
+        schema = tools["get_task_details"].inputSchema
+        assert schema["required"] == ["task_id"]
+
+
+class TestBatchTools:
+    """Test cases for engine-side batch operation tools."""
+
+    def test_batch_requires_query(self) -> None:
+        """Test that a batch never targets all process instances."""
+        from src.server import batch_delete_process_instances
+
+        client = Mock()
+        with patch("src.server.get_client", return_value=client):
+            result = batch_delete_process_instances()
+
+        assert result.startswith("Error starting delete batch")
+        client.delete_process_instances_async.assert_not_called()
+
+    def test_job_retries_batch_requires_scope(self) -> None:
+        """Test that retrying all failed jobs needs an explicit opt-in."""
+        from src.server import batch_set_job_retries
+
+        client = Mock()
+        client.set_job_retries_async.return_value = {"id": "batch-1"}
+        with patch("src.server.get_client", return_value=client):
+            rejected = batch_set_job_retries(3)
+            client.set_job_retries_async.assert_not_called()
+            batch_set_job_retries(3, all_failed_jobs=True)
+
+        assert rejected.startswith("Error starting job retries batch")
+        client.set_job_retries_async.assert_called_once_with({"noRetriesLeft": True}, 3)
+
+    def test_batch_suspend_sends_query(self) -> None:
+        """Test that the query is passed to the engine instead of ids."""
+        from src.server import batch_suspend_process_instances
+
+        client = Mock()
+        client.suspend_process_instances_async.return_value = {
+            "id": "batch-1",
+            "type": "instance-update-suspension-state",
+            "totalJobs": 100,
+        }
+        with patch("src.server.get_client", return_value=client):
+            result = batch_suspend_process_instances(
+                process_definition_key="invoice", activity_id="approve"
+            )
+
+        client.suspend_process_instances_async.assert_called_once_with(
+            {"processDefinitionKey": "invoice", "activityIdIn": ["approve"]}, True
+        )
+        assert "Batch ID: batch-1" in result
+
+    def test_batch_progress_of_finished_batch(self) -> None:
+        """Test that finished batches are looked up in the history."""
+        from src.server import get_batch_progress
+
+        client = Mock()
+        client.get_batch_statistics.return_value = None
+        client.get_historic_batch.return_value = {
+            "id": "batch-1",
+            "totalJobs": 100,
+            "endTime": "2024-01-01T10:00:00.000+0000",
+        }
+        with patch("src.server.get_client", return_value=client):
+            result = get_batch_progress("batch-1")
+
+        assert "has finished" in result
+        assert "2024-01-01T10:00:00.000+0000" in result
+
+
+class TestFilterTools:
+    """Test cases for saved task filter tools."""
+
+    def test_filter_counts(self) -> None:
+        """Test that every filter is counted and failures are reported inline."""
+        from src.server import filter_counts
+
+        def count(filter_id: str) -> int:
+            if filter_id == "broken":
+                raise RuntimeError("500 Server Error")
+            return {"mine": 3, "group": 12}[filter_id]
+
+        client = Mock()
+        client.get_filters.return_value = [
+            {"id": "mine", "name": "My Tasks"},
+            {"id": "group", "name": "Group Tasks"},
+            {"id": "broken", "name": "Broken"},
+        ]
+        client.get_filter_count.side_effect = count
+        with patch("src.server.get_client", return_value=client):
+            result = filter_counts()
+
+        assert result.splitlines()[2:] == [
+            "My Tasks (mine): 3",
+            "Group Tasks (group): 12",
+            "Broken (broken): Error: 500 Server Error",
+        ]
+
+    def test_filter_counts_keeps_counts_before_deadline(self) -> None:
+        """Test that finished counts are reported when time runs out."""
+        from src.camunda.deadline import DeadlineExceeded
+        from src.server import filter_counts
+
+        def count(filter_id: str) -> int:
+            if filter_id == "group":
+                raise DeadlineExceeded("filter_counts exceeded its deadline of 60s")
+            return 3
+
+        client = Mock()
+        client.get_filters.return_value = [
+            {"id": "mine", "name": "My Tasks"},
+            {"id": "group", "name": "Group Tasks"},
+        ]
+        client.get_filter_count.side_effect = count
+        with patch("src.server.get_client", return_value=client):
+            result = filter_counts()
+
+        lines = result.splitlines()
+        assert lines[0] == "Task counts of 2 filter(s) (1 not counted):"
+        assert lines[2:] == [
+            "My Tasks (mine): 3",
+            "Group Tasks (group): not counted (time budget exhausted)",
+        ]
+
+    def test_list_filter_tasks_hints_next_page(self) -> None:
+        """Test that a full page points to the next one."""
+        from src.server import list_filter_tasks
+
+        client = Mock()
+        client.stream_filter_tasks.return_value = EntityStream(
+            [{"id": f"task-{i}", "name": "Review"} for i in range(2)], Task.from_dict
+        )
+        with patch("src.server.get_client", return_value=client):
+            result = list_filter_tasks("mine", first_result=4, max_results=2)
+
+        client.stream_filter_tasks.assert_called_once_with("mine", 4, 2)
+        assert result.startswith("Found 2 task(s)")
+        assert result.endswith("continue with first_result=6.")
+
+
+class TestDecisionTools:
+    """Test cases for DMN decision tools."""
+
+    def test_evaluate_decision_batch(self) -> None:
+        """Test that every input row is evaluated and tabulated."""
+        from src.server import evaluate_decision
+
+        def evaluate(key: str, variables: Any) -> Any:
+            if variables["amount"] > 1000:
+                return [{"approver": "manager"}, {"approver": "finance"}]
+            if variables["amount"] < 0:
+                return []
+            return [{"approver": "clerk"}]
+
+        client = Mock()
+        client.evaluate_decision.side_effect = evaluate
+        inputs = [{"amount": amount, "category": "travel"} for amount in (50, 5000, -1)]
+        with patch("src.server.get_client", return_value=client):
+            result = evaluate_decision("approver", inputs)
+
+        assert client.evaluate_decision.call_count == 3
+        lines = result.splitlines()
+        assert (
+            lines[0]
+            == "Evaluated approver for 3 input row(s) (1 without match, 0 failed):"
+        )
+        assert lines[2] == "# | amount | category | -> | approver"
+        assert lines[3] == "1 | 50 | travel | -> | clerk"
+        assert lines[4] == "2 | 5000 | travel | -> | manager; finance"
+        assert lines[5] == "3 | -1 | travel | -> | (no rule matched)"
+
+    def test_evaluate_decision_keeps_rows_before_deadline(self) -> None:
+        """Test that rows evaluated in time are tabulated when time runs out."""
+        from src.camunda.deadline import DeadlineExceeded
+        from src.server import evaluate_decision
+
+        def evaluate(key: str, variables: Any) -> Any:
+            if variables["amount"] > 1000:
+                raise DeadlineExceeded(
+                    "evaluate_decision exceeded its deadline of 120s"
+                )
+            return [{"approver": "clerk"}]
+
+        client = Mock()
+        client.evaluate_decision.side_effect = evaluate
+        with patch("src.server.get_client", return_value=client):
+            result = evaluate_decision("approver", [{"amount": 50}, {"amount": 5000}])
+
+        lines = result.splitlines()
+        assert lines[0] == (
+            "Evaluated approver for 2 input row(s) "
+            "(0 without match, 0 failed, 1 not evaluated):"
+        )
+        assert lines[3] == "1 | 50 | -> | clerk"
+        assert lines[4] == "2 | 5000 | -> | not evaluated (time budget exhausted)"
+
+    def test_evaluate_decision_limits_inputs(self) -> None:
+        """Test that oversized batches are refused before any request."""
+        from src.server import evaluate_decision
+
+        client = Mock()
+        with patch("src.server.get_client", return_value=client):
+            result = evaluate_decision("approver", [{"amount": 1}] * 501)
+
+        assert result.startswith("Too many input rows")
+        client.evaluate_decision.assert_not_called()
+
+
+class TestMessageTools:
+    """Test cases for message correlation and signal tools."""
+
+    def test_correlate_messages_reports_each_item(self) -> None:
+        """Test that a failed correlation does not stop the others."""
+        from src.server import correlate_messages
+
+        def correlate(
+            message_name: str, business_key: Any = None, **kwargs: Any
+        ) -> Any:
+            if business_key == "order-2":
+                error = RuntimeError("400 Client Error")
+                error.response = Mock()  # type: ignore[attr-defined]
+                error.response.json.return_value = {  # type: ignore[attr-defined]
+                    "message": "Cannot correlate message: "
+                    "No process definition or execution matches"
+                }
+                raise error
+            return [
+                {
+                    "resultType": "Execution",
+                    "execution": {"processInstanceId": f"pi-{business_key}"},
+                }
+            ]
+
+        client = Mock()
+        client.correlate_message.side_effect = correlate
+        correlations = [
+            {"message_name": "PaymentReceived", "business_key": f"order-{i}"}
+            for i in range(1, 4)
+        ]
+        with patch("src.server.get_client", return_value=client):
+            result = correlate_messages(correlations)
+
+        lines = result.splitlines()
+        assert lines[0] == "Correlated 2 of 3 message(s), 1 failed:"
+        assert (
+            lines[2] == "1. PaymentReceived (order-1): correlated 1 time(s): pi-order-1"
+        )
+        assert lines[3] == (
+            "2. PaymentReceived (order-2): Error: "
+            "Cannot correlate message: No process definition or execution matches"
+        )
+        assert (
+            lines[4] == "3. PaymentReceived (order-3): correlated 1 time(s): pi-order-3"
+        )
+
+    def test_correlate_messages_reports_unsent_items(self) -> None:
+        """Test that messages delivered before the deadline are still reported."""
+        from src.camunda.deadline import DeadlineExceeded
+        from src.server import correlate_messages
+
+        def correlate(
+            message_name: str, business_key: Any = None, **kwargs: Any
+        ) -> Any:
+            if business_key in ("order-3", "order-4"):
+                raise DeadlineExceeded(
+                    "correlate_messages exceeded its deadline of 120s"
+                )
+            return [
+                {
+                    "resultType": "Execution",
+                    "execution": {"processInstanceId": f"pi-{business_key}"},
+                }
+            ]
+
+        client = Mock()
+        client.correlate_message.side_effect = correlate
+        correlations = [
+            {"message_name": "PaymentReceived", "business_key": f"order-{i}"}
+            for i in range(1, 5)
+        ]
+        with patch("src.server.get_client", return_value=client):
+            result = correlate_messages(correlations)
+
+        lines = result.splitlines()
+        assert lines[0] == "Correlated 2 of 4 message(s), 0 failed, 2 not sent:"
+        assert (
+            lines[2] == "1. PaymentReceived (order-1): correlated 1 time(s): pi-order-1"
+        )
+        assert (
+            lines[4] == "3. PaymentReceived (order-3): not sent (time budget exhausted)"
+        )
+        assert (
+            lines[5] == "4. PaymentReceived (order-4): not sent (time budget exhausted)"
+        )
+
+    def test_correlate_messages_limits_items(self) -> None:
+        """Test that oversized batches are refused before any request."""
+        from src.server import correlate_messages
+
+        client = Mock()
+        with patch("src.server.get_client", return_value=client):
+            result = correlate_messages([{"message_name": "Ping"}] * 501)
+
+        assert result.startswith("Too many correlations")
+        client.correlate_message.assert_not_called()
+
+
+class TestTransportSecurity:
+    """Test cases for Host and Origin checks of the HTTP transports."""
+
+    def test_public_bind_keeps_checks(self) -> None:
+        """Test that binding to all interfaces does not turn the checks off."""
+        from src.server import _transport_security
+
+        with patch.dict(os.environ, {"MCP_ALLOWED_HOSTS": "mcp.example.com"}):
+            settings = _transport_security("0.0.0.0")
+
+        assert settings.enable_dns_rebinding_protection
+        assert "mcp.example.com" in settings.allowed_hosts
+        assert "localhost:*" in settings.allowed_hosts
+        assert "https://mcp.example.com" in settings.allowed_origins
+        assert "https://evil.example" not in settings.allowed_origins
+
+    def test_explicit_origins(self) -> None:
+        """Test that configured origins replace the derived ones."""
+        from src.server import _transport_security
+
+        with patch.dict(
+            os.environ,
+            {
+                "MCP_ALLOWED_HOSTS": "mcp.internal:*",
+                "MCP_ALLOWED_ORIGINS": "https://chat.example.com",
+            },
+        ):
+            settings = _transport_security("0.0.0.0")
+
+        assert settings.allowed_origins == ["https://chat.example.com"]
+
+
+class TestToolCache:
+    """Test cases for caching results of read-only tools."""
+
+    def setup_method(self) -> None:
+        from src.server import tool_cache
+
+        tool_cache.invalidate()
+
+    def call(self, name: str, arguments: Any) -> Any:
+        from src.server import mcp
+
+        return asyncio.run(mcp.call_tool(name, arguments))
+
+    def test_repeated_call_is_cached(self) -> None:
+        """Test that equal arguments in any form reuse the result."""
+        client = Mock()
+        client.stream_tasks.return_value = []
+        with patch("src.server.get_client", return_value=client):
+            self.call("list_tasks", {"assignee": "demo"})
+            self.call(
+                "list_tasks", {"assignee": "demo", "process_definition_key": None}
+            )
+            self.call("list_tasks", {"assignee": "other"})
+
+        assert client.stream_tasks.call_count == 2
+
+    def test_fresh_bypasses_cache(self) -> None:
+        """Test that fresh=true always queries Camunda."""
+        client = Mock()
+        client.stream_tasks.return_value = []
+        with patch("src.server.get_client", return_value=client):
+            self.call("list_tasks", {})
+            self.call("list_tasks", {"fresh": True})
+
+        assert client.stream_tasks.call_count == 2
+
+    def test_partial_failure_is_not_cached(self) -> None:
+        """Test that filter counts with a failed filter are queried again."""
+        client = Mock()
+        client.get_filters.return_value = [
+            {"id": "mine", "name": "My Tasks"},
+            {"id": "broken", "name": "Broken"},
+        ]
+
+        def count(filter_id: str) -> int:
+            if filter_id == "broken":
+                raise RuntimeError("500 Server Error")
+            return 3
+
+        client.get_filter_count.side_effect = count
+        with patch("src.server.get_client", return_value=client):
+            self.call("filter_counts", {})
+            self.call("filter_counts", {})
+
+        assert client.get_filter_count.call_count == 4
+
+    def test_write_invalidates_cache(self) -> None:
+        """Test that write tools drop cached results."""
+        client = Mock()
+        client.stream_tasks.return_value = []
+        with patch("src.server.get_client", return_value=client):
+            self.call("list_tasks", {})
+            self.call("complete_task", {"task_id": "task-1"})
+            self.call("list_tasks", {})
+
+        assert client.stream_tasks.call_count == 2
+
+    def test_errors_are_not_cached(self) -> None:
+        """Test that failed calls are retried on the next call."""
+        client = Mock()
+        client.stream_tasks.side_effect = RuntimeError("unavailable")
+        with patch("src.server.get_client", return_value=client):
+            self.call("list_tasks", {})
+            self.call("list_tasks", {})
+
+        assert client.stream_tasks.call_count == 2
+
+    def test_fresh_only_on_cached_tools(self) -> None:
+        """Test that only read-only tools expose the fresh argument."""
+        from src.server import mcp
+
+        tools = {tool.name: tool for tool in asyncio.run(mcp.list_tools())}
+
+        assert "fresh" in tools["list_tasks"].inputSchema["properties"]
+        assert "fresh" not in tools["complete_task"].inputSchema["properties"]
+
+
+class TestListRendering:
+    """Test cases for rendering list tool results."""
+
+    def test_list_tasks_format(self) -> None:
+        """Test that entities are separated and optional lines are kept."""
+        from src.server import list_tasks
+
+        rows = [
+            {"id": "task-1", "name": "Approve", "priority": 50},
+            {"id": "task-2", "name": "Review"},
+        ]
+        client = Mock()
+        client.stream_tasks.return_value = EntityStream(rows, Task.from_dict)
+        with patch("src.server.get_client", return_value=client):
+            result = list_tasks()
+
+        assert result.startswith("Found 2 task(s):\n\nTask ID: task-1\n")
+        assert "Priority: 50\n\n---\n\nTask ID: task-2\n" in result
+        assert result.endswith("Description: No description")
+
+    def test_list_tasks_peak_memory(self) -> None:
+        """Test that rendering 50k tasks holds little more than the output."""
+        from src.server import list_tasks
+
+        rows = [
+            {
+                "id": f"task-{i:06d}",
+                "name": "Review invoice",
+                "assignee": "demo",
+                "created": "2024-01-01T10:00:00.000+0000",
+                "processInstanceId": f"instance-{i:06d}",
+                "description": "Check the amounts",
+                "priority": 50,
+            }
+            for i in range(50_000)
+        ]
+        client = Mock()
+        client.stream_tasks.return_value = EntityStream(rows, Task.from_dict)
+
+        with patch("src.server.get_client", return_value=client):
+            tracemalloc.start()
+            try:
+                result = list_tasks()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        assert result.startswith("Found 50000 task(s)")
+        # The buffer and the returned string; materializing models and line
+        # lists first used to take more than four times the output size
+        assert peak < 2.5 * len(result)
+
+
 class TestIntegration:
     """Integration tests for the complete MCP server setup."""
     
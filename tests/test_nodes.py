@@ -0,0 +1,163 @@
+"""
+Tests for engine node selection, ejection and hedged reads
+"""
+
+import threading
+import time
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.camunda.client import CamundaClient, CamundaConfig
+from src.camunda.deadline import DeadlineExceeded, deadline
+from src.camunda.nodes import MIN_HEDGE_SAMPLES, NodePool
+
+NODE_A = "http://node-a:8080/engine-rest"
+NODE_B = "http://node-b:8080/engine-rest"
+
+
+def ok_response(payload: Any) -> Mock:
+    response = Mock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = payload
+    return response
+
+
+class TestNodePool:
+    """Test cases for the node pool."""
+
+    def test_requires_a_url(self) -> None:
+        """Test that an empty node list is rejected."""
+        with pytest.raises(ValueError):
+            NodePool([])
+
+    def test_prefers_faster_node(self) -> None:
+        """Test that selection is weighted by observed latency."""
+        pool = NodePool([NODE_A, NODE_B])
+        fast, slow = pool.nodes
+        pool.record_success(fast, 0.01)
+        pool.record_success(slow, 1.0)
+
+        picks = [pool.select() for _ in range(500)]
+
+        assert picks.count(fast) > picks.count(slow) * 10
+
+    def test_ejects_failing_node(self) -> None:
+        """Test that a node is skipped after consecutive failures."""
+        pool = NodePool([NODE_A, NODE_B], eject_after=2, eject_seconds=60)
+        failing, healthy = pool.nodes
+        pool.record_failure(failing)
+        pool.record_failure(failing)
+
+        assert not failing.available
+        assert all(pool.select() is healthy for _ in range(50))
+        assert pool.stats()["nodes"][NODE_A]["ejections"] == 1
+
+    def test_success_reinstates_node(self) -> None:
+        """Test that a successful probe brings an ejected node back."""
+        pool = NodePool([NODE_A], eject_after=1, eject_seconds=60)
+        node = pool.nodes[0]
+        pool.record_failure(node)
+
+        assert pool.select() is node  # never fails, even if all are ejected
+        pool.record_success(node, 0.05)
+        assert node.available
+
+    def test_hedge_delay_needs_samples(self) -> None:
+        """Test that the hedge delay is the p95 of recent latencies."""
+        pool = NodePool([NODE_A, NODE_B])
+        assert pool.hedge_delay() is None
+
+        for i in range(100):
+            pool.record_success(pool.nodes[0], (i + 1) / 1000)
+
+        assert pool.hedge_delay() == pytest.approx(0.096)
+
+
+class TestClientNodes:
+    """Test cases for multi-node requests of the client."""
+
+    def test_config_splits_urls(self) -> None:
+        """Test that comma-separated URLs are split into nodes."""
+        config = CamundaConfig(url=f"{NODE_A}/, {NODE_B}")
+
+        assert config.urls == [NODE_A, NODE_B]
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_read_fails_over(self, mock_request: Mock) -> None:
+        """Test that an unreachable node is retried on another one."""
+
+        def request(method: str, url: str, **kwargs: Any) -> Mock:
+            if url.startswith(NODE_A):
+                raise requests.ConnectionError("refused")
+            return ok_response([])
+
+        mock_request.side_effect = request
+        client = CamundaClient(CamundaConfig(url=f"{NODE_A},{NODE_B}"))
+        # Node A looks much faster, so it is picked first
+        client.nodes.record_success(client.nodes.nodes[0], 0.001)
+        client.nodes.record_success(client.nodes.nodes[1], 10.0)
+
+        for _ in range(5):
+            assert client.get_tasks() == []
+        assert client.nodes.nodes[0].failures >= 1
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_deadline_timeouts_do_not_eject(self, mock_request: Mock) -> None:
+        """Test that timeouts cut short by a tool deadline are not node failures."""
+
+        def request(method: str, url: str, **kwargs: Any) -> Mock:
+            time.sleep(kwargs["timeout"])
+            raise requests.ReadTimeout("read timed out")
+
+        mock_request.side_effect = request
+        client = CamundaClient(CamundaConfig(url=NODE_A))
+
+        for _ in range(3):
+            with deadline(0.05, "analyze_bottlenecks"):
+                with pytest.raises(DeadlineExceeded):
+                    client.get_tasks()
+
+        assert client.nodes.nodes[0].failures == 0
+        assert client.nodes.nodes[0].available
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_writes_are_not_retried(self, mock_request: Mock) -> None:
+        """Test that a failed write is not sent to a second node."""
+        mock_request.side_effect = requests.ConnectionError("refused")
+        client = CamundaClient(CamundaConfig(url=f"{NODE_A},{NODE_B}"))
+
+        with pytest.raises(requests.ConnectionError):
+            client.complete_task("task-1")
+        assert mock_request.call_count == 1
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_slow_read_is_hedged(self, mock_request: Mock) -> None:
+        """Test that a slow read is answered by the second node."""
+        release = threading.Event()
+
+        def request(method: str, url: str, **kwargs: Any) -> Mock:
+            if url.startswith(NODE_A):
+                release.wait(5)
+                return ok_response(["slow"])
+            return ok_response(["fast"])
+
+        mock_request.side_effect = request
+        config = CamundaConfig(url=f"{NODE_A},{NODE_B}", hedge_reads=True)
+        client = CamundaClient(config)
+        slow, fast = client.nodes.nodes
+        for _ in range(MIN_HEDGE_SAMPLES):
+            client.nodes.record_success(fast, 0.01)
+
+        with patch.object(client.nodes, "select", side_effect=[slow, fast]):
+            started = time.monotonic()
+            result = client._make_request("GET", "/task")
+            elapsed = time.monotonic() - started
+        release.set()
+
+        assert result == ["fast"]
+        assert elapsed < 1
+        assert client.nodes.hedges_won == 1
+        client.close()
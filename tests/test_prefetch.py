@@ -0,0 +1,85 @@
+"""
+Tests for speculative prefetching
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from src.camunda.models import EntityStream, Task
+from src.camunda.prefetch import Prefetcher
+
+
+def wait_until_idle(prefetcher: Prefetcher, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while prefetcher.stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestPrefetcher:
+    """Test cases for the background prefetcher."""
+
+    def test_disabled_without_workers(self) -> None:
+        """Test that nothing is scheduled when prefetching is off."""
+        prefetcher = Prefetcher(0, under_pressure=lambda: False)
+
+        assert prefetcher.submit("key", Mock()) is False
+
+    def test_runs_jobs_once_per_key(self) -> None:
+        """Test that a pending key is not scheduled twice."""
+        release = threading.Event()
+        job = Mock(side_effect=lambda: release.wait(5))
+        prefetcher = Prefetcher(1, under_pressure=lambda: False)
+
+        assert prefetcher.submit("key", job) is True
+        assert prefetcher.submit("key", job) is False
+        release.set()
+        wait_until_idle(prefetcher)
+
+        assert job.call_count == 1
+        assert prefetcher.stats()["completed"] == 1
+        prefetcher.shutdown()
+
+    def test_cancelled_under_pressure(self) -> None:
+        """Test that queued jobs are dropped while the engine is busy."""
+        job = Mock()
+        prefetcher = Prefetcher(1, under_pressure=lambda: True)
+
+        prefetcher.submit("key", job)
+        wait_until_idle(prefetcher)
+
+        job.assert_not_called()
+        assert prefetcher.stats()["cancelled"] == 1
+        prefetcher.shutdown()
+
+
+class TestTaskPrefetch:
+    """Test cases for prefetching task follow-up calls."""
+
+    def test_list_tasks_warms_details_and_comments(self) -> None:
+        """Test that details of listed tasks are served from the cache."""
+        from src.server import mcp, tool_cache
+
+        tool_cache.invalidate()
+        prefetcher = Prefetcher(2, under_pressure=lambda: False)
+        client = Mock()
+        client.stream_tasks.return_value = EntityStream(
+            [{"id": "task-1", "name": "Approve"}], Task.from_dict
+        )
+        client.get_task.return_value = Task.from_dict({"id": "task-1"})
+        client.get_task_comments.return_value = []
+
+        with patch("src.server.get_client", return_value=client), patch(
+            "src.server.prefetcher", prefetcher
+        ):
+            asyncio.run(mcp.call_tool("list_tasks", {}))
+            wait_until_idle(prefetcher)
+            hits = tool_cache.stats()["prefetch_hits"]
+            asyncio.run(mcp.call_tool("get_task_details", {"task_id": "task-1"}))
+            asyncio.run(mcp.call_tool("get_task_comments", {"task_id": "task-1"}))
+
+        assert client.get_task.call_count == 1
+        assert client.get_task_comments.call_count == 1
+        assert tool_cache.stats()["prefetch_hits"] == hits + 2
+        prefetcher.shutdown()
@@ -0,0 +1,106 @@
+"""
+Tests for on-demand profiling of tool calls
+"""
+
+import asyncio
+import json
+import os
+import time
+import tracemalloc
+from unittest.mock import Mock, patch
+
+from src.camunda.profiling import ToolProfiler
+
+
+class TestToolProfiler:
+    """Test cases for the tool profiler."""
+
+    def test_disabled_by_default(self, tmp_path: str) -> None:
+        """Test that calls are not profiled unless enabled."""
+        profiler = ToolProfiler(str(tmp_path))
+
+        with profiler.profile("list_tasks", {}):
+            pass
+
+        assert profiler.slowest() == []
+        assert os.listdir(tmp_path) == []
+
+    def test_armed_calls_are_profiled_once(self, tmp_path: str) -> None:
+        """Test that arming profiles exactly the next calls."""
+        profiler = ToolProfiler(str(tmp_path))
+        profiler.arm("list_tasks")
+
+        with profiler.profile("list_tasks", {"assignee": "demo"}):
+            data = [bytes(1024) for _ in range(100)]
+        with profiler.profile("list_tasks", {"assignee": "demo"}):
+            pass
+
+        records = profiler.slowest()
+        assert len(records) == 1
+        assert records[0]["tool"] == "list_tasks"
+        assert records[0]["memory_peak_kb"] >= 100
+        assert os.path.exists(records[0]["path"])
+        assert os.path.exists(records[0]["path"].replace(".prof", ".mem.txt"))
+        assert "demo" not in records[0]["path"]
+        del data
+
+    def test_slowest_first_and_rotation(self, tmp_path: str) -> None:
+        """Test that only the newest profiles are kept on disk."""
+        profiler = ToolProfiler(str(tmp_path), profile_all=True, keep=2)
+
+        for delay in (0.03, 0.01, 0.02):
+            with profiler.profile("get_task_details", {"task_id": str(delay)}):
+                time.sleep(delay)
+
+        durations = [record["duration_ms"] for record in profiler.slowest()]
+        assert durations == sorted(durations, reverse=True)
+        assert len([n for n in os.listdir(tmp_path) if n.endswith(".prof")]) == 2
+
+    def test_overlapping_calls_are_not_profiled(self, tmp_path: str) -> None:
+        """Test that a call overlapping a profiled call runs unprofiled."""
+        profiler = ToolProfiler(str(tmp_path))
+        profiler.arm("list_tasks", calls=2)
+
+        with profiler.profile("list_tasks", {}):
+            with profiler.profile("list_tasks", {}):
+                pass
+        assert len(profiler.slowest()) == 1
+        assert profiler.status()["armed"] == {"list_tasks": 1}
+        assert not tracemalloc.is_tracing()
+
+    def test_from_environment(self) -> None:
+        """Test that tools to profile are read from MCP_PROFILE."""
+        with patch.dict(os.environ, {"MCP_PROFILE": "list_tasks, get_task_details"}):
+            profiler = ToolProfiler.from_environment()
+
+        assert profiler.status()["tools"] == ["get_task_details", "list_tasks"]
+
+
+class TestProfileTool:
+    """Test cases for triggering profiling through the MCP server."""
+
+    def test_profile_next_call(self, tmp_path: str) -> None:
+        """Test that the tool arms profiling and the resource lists the call."""
+        from src.server import mcp, profiles, tool_cache
+
+        tool_cache.invalidate()
+        client = Mock()
+        client.stream_tasks.return_value = []
+        profiler = ToolProfiler(str(tmp_path))
+
+        with patch("src.server.get_client", return_value=client), patch(
+            "src.server.profiler", profiler
+        ):
+            asyncio.run(
+                mcp.call_tool("profile_tool_calls", {"tool_name": "list_tasks"})
+            )
+            asyncio.run(mcp.call_tool("list_tasks", {}))
+            summary = json.loads(profiles())
+
+        assert [call["tool"] for call in summary["slowest_calls"]] == ["list_tasks"]
+
+    def test_unknown_tool(self) -> None:
+        """Test that only registered tools can be profiled."""
+        from src.server import profile_tool_calls
+
+        assert profile_tool_calls("no_such_tool").startswith("Error")
@@ -0,0 +1,142 @@
+"""
+Tests for client-side rate limiting and admission
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.camunda.client import CamundaClient, CamundaConfig
+from src.camunda.ratelimit import (
+    CamundaBusyError,
+    EndpointLimit,
+    EndpointLimiter,
+    RequestAdmission,
+    TokenBucket,
+)
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_then_wait(self) -> None:
+        """Test that the burst is free and later tokens are spaced by rate."""
+        bucket = TokenBucket(rate=10, burst=2)
+
+        assert bucket.reserve(max_wait=1) == 0
+        assert bucket.reserve(max_wait=1) == 0
+        wait = bucket.reserve(max_wait=1)
+        assert wait is not None
+        assert wait == pytest.approx(0.1, abs=0.02)
+
+    def test_reservation_rejected_beyond_max_wait(self) -> None:
+        """Test that no token is taken when the wait is too long."""
+        bucket = TokenBucket(rate=1, burst=1)
+        bucket.reserve(max_wait=0)
+
+        assert bucket.reserve(max_wait=0.1) is None
+        assert bucket.available < 1
+
+
+class TestEndpointLimiter:
+    """Test cases for EndpointLimiter."""
+
+    def test_in_flight_limit_rejects_when_full(self) -> None:
+        """Test that a request is rejected when no slot frees up in time."""
+        limiter = EndpointLimiter("query", EndpointLimit(max_in_flight=1))
+        holding = threading.Event()
+        release = threading.Event()
+
+        def hold_slot() -> None:
+            with limiter.admit(max_wait=1):
+                holding.set()
+                release.wait()
+
+        worker = threading.Thread(target=hold_slot)
+        worker.start()
+        holding.wait()
+        try:
+            with pytest.raises(CamundaBusyError):
+                with limiter.admit(max_wait=0.05):
+                    pass
+        finally:
+            release.set()
+            worker.join()
+
+        assert limiter.stats()["rejected"] == 1
+        assert limiter.stats()["in_flight"] == 0
+
+    def test_rejected_request_returns_its_token(self) -> None:
+        """Test that a request rejected for lack of a slot does not use up the rate."""
+        limiter = EndpointLimiter(
+            "query", EndpointLimit(rate=1, burst=2, max_in_flight=1)
+        )
+        holding = threading.Event()
+        release = threading.Event()
+
+        def hold_slot() -> None:
+            with limiter.admit(max_wait=1):
+                holding.set()
+                release.wait()
+
+        worker = threading.Thread(target=hold_slot)
+        worker.start()
+        holding.wait()
+        try:
+            with pytest.raises(CamundaBusyError):
+                with limiter.admit(max_wait=0.05):
+                    pass
+        finally:
+            release.set()
+            worker.join()
+
+        assert limiter.bucket is not None
+        assert limiter.bucket.available >= 1
+
+    def test_rate_limit_queues_requests(self) -> None:
+        """Test that requests within the wait budget are delayed, not rejected."""
+        limiter = EndpointLimiter("write", EndpointLimit(rate=20, burst=1))
+
+        started = time.monotonic()
+        for _ in range(3):
+            with limiter.admit(max_wait=1):
+                pass
+
+        assert time.monotonic() - started >= 0.09
+        assert limiter.stats()["admitted"] == 3
+
+
+class TestRequestAdmission:
+    """Test cases for RequestAdmission."""
+
+    def test_classify(self) -> None:
+        """Test endpoint classification."""
+        assert RequestAdmission.classify("GET", "/task") == "query"
+        assert RequestAdmission.classify("POST", "/task/1/complete") == "write"
+        assert RequestAdmission.classify("GET", "/history/task") == "history"
+        assert (
+            RequestAdmission.classify("POST", "/decision-definition/key/d/evaluate")
+            == "query"
+        )
+
+    @patch("src.camunda.client.requests.Session.request")
+    def test_client_rejects_busy_requests(self, mock_request: Mock) -> None:
+        """Test that a rejected request never reaches the engine."""
+        config = CamundaConfig(
+            url="http://localhost:8080/engine-rest",
+            endpoint_limits={"query": EndpointLimit(rate=0.1, burst=1)},
+            max_queue_wait=0.1,
+        )
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = []
+        mock_request.return_value = mock_response
+
+        client = CamundaClient(config)
+        client.get_tasks()
+        with pytest.raises(CamundaBusyError):
+            client.get_tasks()
+
+        mock_request.assert_called_once()
@@ -0,0 +1,238 @@
+"""
+Tests for the task search index
+"""
+
+from typing import Any
+from unittest.mock import Mock, patch
+
+from src.camunda.deadline import DeadlineExceeded
+from src.camunda.models import Comment, ProcessInstance, Task
+from src.camunda.search import TaskSearchIndex, tokenize
+
+
+def make_task(task_id: str, name: str, description: str = "", **data: str) -> Task:
+    return Task.from_dict(
+        {"id": task_id, "name": name, "description": description, **data}
+    )
+
+
+class TestTaskSearchIndex:
+    """Test cases for indexing and ranking tasks."""
+
+    def test_tokenize(self) -> None:
+        """Test that text is split into lowercase words."""
+        assert tokenize("Invoice #4711, ACME-Corp") == [
+            "invoice",
+            "4711",
+            "acme",
+            "corp",
+        ]
+        assert tokenize(None) == []
+
+    def test_all_words_must_match(self) -> None:
+        """Test that results contain every query word."""
+        index = TaskSearchIndex()
+        index.add_task(make_task("task-1", "Approve invoice", "Invoice 4711"))
+        index.add_task(make_task("task-2", "Approve invoice", "Invoice 4712"))
+
+        results = index.search("invoice 4711")
+
+        assert [task.id for task, _ in results] == ["task-1"]
+        assert index.search("invoice 9999") == []
+
+    def test_name_ranks_above_description(self) -> None:
+        """Test that a match in the name counts more than in the prose."""
+        index = TaskSearchIndex()
+        index.add_task(make_task("task-1", "Review", "Check the invoice of ACME"))
+        index.add_task(make_task("task-2", "Approve invoice", "Check the amounts"))
+        index.add_task(make_task("task-3", "Call customer"))
+
+        results = index.search("invoice")
+
+        assert [task.id for task, _ in results] == ["task-2", "task-1"]
+
+    def test_comments_and_removal(self) -> None:
+        """Test that comments are searchable and removed tasks are not."""
+        index = TaskSearchIndex()
+        index.add_task(make_task("task-1", "Review"))
+        index.add_comment("task-1", "Customer disputes the amount")
+        index.add_comment("unknown", "Customer")
+
+        assert [task.id for task, _ in index.search("disputes")] == ["task-1"]
+
+        index.remove_task("task-1")
+
+        assert index.search("disputes") == []
+        assert len(index) == 0
+
+    def test_rebuild(self) -> None:
+        """Test that a rebuild indexes business keys and comments."""
+        client = Mock()
+        client.get_tasks.return_value = [
+            make_task("task-1", "Approve", processInstanceId="pi-1"),
+            make_task("task-2", "Approve", processInstanceId="pi-2"),
+        ]
+        client.get_process_instances.return_value = [
+            ProcessInstance.from_dict(
+                {"id": "pi-1", "definitionId": "invoice:1", "businessKey": "INV-4711"}
+            )
+        ]
+        client.get_task_comments.side_effect = lambda task_id: (
+            [Comment.from_dict({"id": "c-1", "message": "urgent please"})]
+            if task_id == "task-2"
+            else []
+        )
+
+        index = TaskSearchIndex()
+        index.rebuild(client, workers=2)
+
+        assert [task.id for task, _ in index.search("inv 4711")] == ["task-1"]
+        assert [task.id for task, _ in index.search("urgent")] == ["task-2"]
+        assert index.age is not None
+        client.get_process_instances.assert_called_once_with(
+            processInstanceIds="pi-1,pi-2"
+        )
+
+    def test_rebuild_pages_tasks(self) -> None:
+        """Test that open tasks are fetched in stable pages."""
+        tasks = [make_task(f"task-{i}", "Approve") for i in range(3)]
+        client = Mock()
+        client.get_tasks.side_effect = lambda firstResult, maxResults, **kwargs: (
+            tasks[firstResult : firstResult + maxResults]
+        )
+        client.get_process_instances.return_value = []
+        client.get_task_comments.return_value = []
+
+        with patch("src.camunda.search.TASK_PAGE_SIZE", 2):
+            index = TaskSearchIndex()
+            index.rebuild(client, workers=2)
+
+        assert len(index) == 3
+        assert [call.kwargs["firstResult"] for call in client.get_tasks.mock_calls] == [
+            0,
+            2,
+        ]
+        assert client.get_tasks.call_args.kwargs["sortBy"] == "id"
+
+    def test_rebuild_keeps_partial_result_on_deadline(self) -> None:
+        """Test that tasks are indexed without comments once time runs out."""
+        client = Mock()
+        client.get_tasks.return_value = [
+            make_task("task-1", "Approve invoice"),
+            make_task("task-2", "Approve invoice"),
+        ]
+        client.get_process_instances.return_value = []
+
+        def comments(task_id: str) -> Any:
+            if task_id == "task-2":
+                raise DeadlineExceeded("search_tasks exceeded its deadline")
+            return [Comment.from_dict({"id": "c-1", "message": "urgent please"})]
+
+        client.get_task_comments.side_effect = comments
+
+        index = TaskSearchIndex()
+        index.rebuild(client, workers=1)
+
+        assert [task.id for task, _ in index.search("urgent")] == ["task-1"]
+        assert len(index.search("approve")) == 2
+        assert index.comments_missing == 1
+        assert index.age is not None
+
+    def test_rebuild_keeps_fetched_tasks_on_deadline(self) -> None:
+        """Test that running out of time while paging keeps the fetched tasks."""
+        client = Mock()
+
+        def get_tasks(firstResult: int, **kwargs: Any) -> Any:
+            if firstResult:
+                raise DeadlineExceeded("search_tasks exceeded its deadline")
+            return [
+                make_task("task-1", "Approve invoice", processInstanceId="pi-1"),
+                make_task("task-2", "Approve order", processInstanceId="pi-2"),
+            ]
+
+        client.get_tasks.side_effect = get_tasks
+        client.get_process_instances.side_effect = DeadlineExceeded("expired")
+        client.get_task_comments.side_effect = DeadlineExceeded("expired")
+
+        with patch("src.camunda.search.TASK_PAGE_SIZE", 2):
+            index = TaskSearchIndex()
+            index.rebuild(client, workers=2)
+
+        assert [task.id for task, _ in index.search("invoice")] == ["task-1"]
+        assert index.partial
+        assert index.comments_missing == 2
+        assert index.age is not None
+
+
+class TestSearchTasksTool:
+    """Test cases for the search_tasks tool."""
+
+    def test_search_uses_index_and_follows_writes(self) -> None:
+        """Test that searches need no requests and writes update the index."""
+        from src import server
+
+        client = Mock()
+        client.get_tasks.return_value = [make_task("task-1", "Approve invoice 4711")]
+        client.get_process_instances.return_value = []
+        client.get_task_comments.return_value = []
+        client.create_task.return_value = make_task("task-2", "Invoice 4711 query")
+
+        with patch("src.server.get_client", return_value=client), patch(
+            "src.server.task_search", TaskSearchIndex()
+        ):
+            first = server.search_tasks("invoice 4711")
+            server.create_task("Invoice 4711 query")
+            server.add_task_comment("task-1", "Approved by finance")
+            server.complete_task("task-2")
+            second = server.search_tasks("finance")
+
+        assert first.startswith("Found 1 matching task(s)")
+        assert "Task ID: task-1" in second
+        assert "Score:" in second
+        assert client.get_tasks.call_count == 1
+
+    def test_partial_index_is_rebuilt_by_next_search(self) -> None:
+        """Test that an incomplete index is noted and not kept for the TTL."""
+        from src import server
+
+        client = Mock()
+        client.get_tasks.side_effect = [
+            DeadlineExceeded("search_tasks exceeded its deadline"),
+            [make_task("task-1", "Approve invoice")],
+        ]
+        client.get_process_instances.return_value = []
+        client.get_task_comments.return_value = []
+
+        with patch("src.server.get_client", return_value=client), patch(
+            "src.server.task_search", TaskSearchIndex()
+        ):
+            first = server.search_tasks("invoice")
+            second = server.search_tasks("invoice")
+
+        assert "only 0 open task(s) are indexed" in first
+        assert "Task ID: task-1" in second
+        assert "are indexed" not in second
+
+    def test_concurrent_search_serves_stale_index(self) -> None:
+        """Test that a search does not wait for another search's rebuild."""
+        from src import server
+
+        index = TaskSearchIndex()
+        index.add_task(make_task("task-1", "Approve invoice"))
+        index.built_at = 0.0
+        client = Mock()
+
+        with patch("src.server.get_client", return_value=client), patch(
+            "src.server.task_search", index
+        ):
+            with server._task_search_lock:
+                result = server.search_tasks("invoice")
+            assert "Task ID: task-1" in result
+            assert "being rebuilt" in result
+            client.get_tasks.assert_not_called()
+
+            # Without an index, the search waits at most for its time budget
+            with patch("src.server.task_search", TaskSearchIndex()):
+                with server._task_search_lock, server.deadline(0.05, "search"):
+                    result = server.search_tasks("invoice")
+            assert "still being built" in result
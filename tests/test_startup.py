@@ -0,0 +1,62 @@
+"""
+Startup performance tests for the MCP server module
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget for ``import src.server`` in milliseconds; most of it is the MCP SDK
+STARTUP_BUDGET_MS = int(os.getenv("STARTUP_BUDGET_MS", "3000"))
+
+
+def measure_import_times(module: str) -> Dict[str, int]:
+    """Import a module in a fresh interpreter and return cumulative times (µs)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.slow
+class TestServerStartup:
+    """Test cases for server import cost."""
+
+    def test_import_within_budget(self) -> None:
+        """Test that importing the server stays within the startup budget."""
+        times = measure_import_times("src.server")
+
+        assert "src.server" in times
+        assert times["src.server"] / 1000 < STARTUP_BUDGET_MS
+
+    def test_import_does_not_create_client(self) -> None:
+        """Test that importing the server does not load the HTTP client."""
+        times = measure_import_times("src.server")
+
+        assert "src.camunda.client" not in times
+        assert "requests" not in times
+
+    def test_client_created_lazily(self) -> None:
+        """Test that the client is created on first use and then reused."""
+        import src.server as server
+
+        client = server.get_client()
+
+        assert server.get_client() is client
+        assert server.camunda_client is client